@@ -79,7 +79,8 @@ CREATE TABLE Skills (
 
 CREATE TABLE Applications (
     application_id INT AUTO_INCREMENT PRIMARY KEY,
-    status ENUM('Pending', 'Accepted', 'Rejected', 'Withdrawn') DEFAULT 'Pending',
+    -- Expired: left Pending past PENDING_EXPIRY_DAYS (set by the jobs worker, jobs.py)
+    status ENUM('Pending', 'Accepted', 'Rejected', 'Withdrawn', 'Expired') DEFAULT 'Pending',
     cover_letter TEXT,
     student_id INT NOT NULL,
     project_id INT NOT NULL,
@@ -131,23 +132,92 @@ CREATE TABLE Student_Achievements (
     project_id INT NOT NULL,
     title VARCHAR(200) NOT NULL,
     awarded_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- One achievement per student and project, so re-running the award job adds nothing
+    UNIQUE KEY uq_achievement (student_id, project_id),
     CONSTRAINT fk_ach_student FOREIGN KEY (student_id)
         REFERENCES Students(student_id) ON DELETE CASCADE,
     CONSTRAINT fk_ach_project FOREIGN KEY (project_id)
         REFERENCES Research_Projects(project_id) ON DELETE CASCADE
 );
 
--- NEW: table to store application status change logs
+-- NEW: append-only log of application status changes (written by
+-- trg_log_application_status_change). Partitioned by changed_at month so
+-- old months can be archived and dropped whole (see log_retention.py);
+-- monthly partitions are added by ensure_log_partitions(). Partitioned
+-- InnoDB tables cannot have foreign keys, so entries outlive a deleted
+-- application, which is what an audit trail wants anyway.
 CREATE TABLE IF NOT EXISTS Application_Logs (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id BIGINT AUTO_INCREMENT,
     application_id INT NOT NULL,
     student_id INT,
     project_id INT,
-    old_status ENUM('Pending','Accepted','Rejected','Withdrawn'),
-    new_status ENUM('Pending','Accepted','Rejected','Withdrawn'),
-    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    CONSTRAINT fk_log_application FOREIGN KEY (application_id)
-        REFERENCES Applications(application_id) ON DELETE CASCADE
+    old_status ENUM('Pending','Accepted','Rejected','Withdrawn','Expired'),
+    new_status ENUM('Pending','Accepted','Rejected','Withdrawn','Expired'),
+    changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, changed_at)
+)
+PARTITION BY RANGE COLUMNS (changed_at) (
+    PARTITION pmax VALUES LESS THAN (MAXVALUE)
+);
+
+-- NEW: relative weight of each skill category in match scores (missing = 1.00)
+CREATE TABLE Skill_Category_Weights (
+    category VARCHAR(50) PRIMARY KEY,
+    weight DECIMAL(4,2) NOT NULL DEFAULT 1.00 CHECK (weight >= 0)
+);
+
+-- NEW: summary of the admin headline counts, kept in sync by triggers. The
+-- counts are spread over 16 slot rows: each trigger adjusts the slot picked
+-- by CONNECTION_ID() % 16, so concurrent signups and applications lock
+-- different rows instead of queueing on one. Readers SUM the slots; a slot
+-- may go negative, only the sum is meaningful.
+CREATE TABLE Platform_Stats (
+    slot TINYINT PRIMARY KEY,
+    total_students INT NOT NULL DEFAULT 0,
+    total_faculty INT NOT NULL DEFAULT 0,
+    total_projects INT NOT NULL DEFAULT 0,
+    pending_applications INT NOT NULL DEFAULT 0,
+    CONSTRAINT chk_platform_stats_slot CHECK (slot BETWEEN 0 AND 15)
+);
+
+INSERT INTO Platform_Stats (slot) VALUES (0), (1), (2), (3), (4), (5), (6), (7),
+    (8), (9), (10), (11), (12), (13), (14), (15);
+
+-- NEW: per-project application and membership counts, kept in sync by the
+-- trg_project_stats_* triggers so listings read them with a PK join
+CREATE TABLE Project_Stats (
+    project_id INT PRIMARY KEY,
+    applicant_count INT NOT NULL DEFAULT 0,
+    pending_count INT NOT NULL DEFAULT 0,
+    accepted_count INT NOT NULL DEFAULT 0,
+    member_count INT NOT NULL DEFAULT 0,
+    CONSTRAINT fk_project_stats_project FOREIGN KEY (project_id)
+        REFERENCES Research_Projects(project_id) ON DELETE CASCADE
+);
+
+-- NEW: one row per login email across Students, Faculty and Admin, kept in
+-- sync by the trg_accounts_* triggers. The primary key makes an email unique
+-- across all three roles, so login resolves identity and role with one
+-- indexed lookup and a duplicate signup fails its single INSERT.
+CREATE TABLE Accounts (
+    email VARCHAR(100) PRIMARY KEY,
+    role ENUM('student', 'faculty', 'admin') NOT NULL,
+    user_id INT NOT NULL,
+    UNIQUE KEY uq_accounts_user (role, user_id)
+);
+
+-- NEW: one row per background job run (see jobs.py): rows changed, chunks
+-- committed and duration, for the admin System Metrics panel. Dry runs are
+-- not recorded; rows older than JOB_RUNS_KEEP_DAYS are pruned by the worker.
+CREATE TABLE Job_Runs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    job VARCHAR(50) NOT NULL,
+    started_at DATETIME NOT NULL,
+    seconds DECIMAL(10, 3) NOT NULL,
+    rows_changed INT NOT NULL DEFAULT 0,
+    chunks INT NOT NULL DEFAULT 0,
+    error VARCHAR(500),
+    INDEX idx_job_runs_job (job, started_at)
 );
 
 -- -----------------------------
@@ -155,10 +225,31 @@ CREATE TABLE IF NOT EXISTS Application_Logs (
 -- -----------------------------
 CREATE INDEX idx_students_email ON Students(email);
 CREATE INDEX idx_faculty_email ON Faculty(email);
-CREATE INDEX idx_projects_faculty ON Research_Projects(faculty_id);
-CREATE INDEX idx_projects_status ON Research_Projects(status);
+-- Keyset pagination: (filter column, created_at, primary key) serves both the
+-- equality filter and the "created_at/id before the last row seen" seek predicate
+CREATE INDEX idx_students_created ON Students(created_at, student_id);
+CREATE INDEX idx_students_major_created ON Students(major, created_at, student_id);
+CREATE INDEX idx_faculty_created ON Faculty(created_at, faculty_id);
+CREATE INDEX idx_faculty_department_created ON Faculty(department, created_at, faculty_id);
+CREATE INDEX idx_projects_created ON Research_Projects(created_at, project_id);
+CREATE INDEX idx_projects_faculty ON Research_Projects(faculty_id, created_at, project_id);
+CREATE INDEX idx_projects_status ON Research_Projects(status, created_at, project_id);
+-- Project search: relevance over titles (boosted), title+description and faculty research areas
+CREATE FULLTEXT INDEX ft_projects_title ON Research_Projects(title);
+CREATE FULLTEXT INDEX ft_projects_title_description ON Research_Projects(title, description);
+CREATE FULLTEXT INDEX ft_faculty_research_areas ON Faculty(research_areas);
+CREATE INDEX idx_student_skills_skill ON Student_Skills(skill_id, student_id);
 CREATE INDEX idx_applications_student ON Applications(student_id);
 CREATE INDEX idx_applications_project ON Applications(project_id);
+-- Pending-expiry job: oldest Pending applications first, in id order
+CREATE INDEX idx_applications_status_applied ON Applications(status, applied_at, application_id);
+-- Audit history: per-student / per-project timelines newest first, covering
+-- every column the history view reads; (changed_at, id) serves unfiltered
+-- date-range scans, which partition pruning already narrows to a few months
+CREATE INDEX idx_logs_student ON Application_Logs(student_id, changed_at, id, application_id, project_id, old_status, new_status);
+CREATE INDEX idx_logs_project ON Application_Logs(project_id, changed_at, id, application_id, student_id, old_status, new_status);
+CREATE INDEX idx_logs_application ON Application_Logs(application_id, changed_at);
+CREATE INDEX idx_logs_changed ON Application_Logs(changed_at, id);
 
 -- -----------------------------
 -- SAMPLE DATA (DML)
@@ -172,41 +263,236 @@ CREATE INDEX idx_applications_project ON Applications(project_id);
 -- -----------------------------
 DELIMITER $$
 
+-- Ranks students by (category-weighted) overlap with the project's skills.
+-- One grouped join driven from the project's few skills via idx_student_skills_skill,
+-- so only students sharing at least one skill are ever touched.
+-- p_limit = NULL returns every matching student.
+CREATE PROCEDURE RankStudentsForProject(IN p_project_id INT, IN p_limit INT)
+BEGIN
+    DECLARE v_limit BIGINT UNSIGNED DEFAULT 18446744073709551615;
+    IF p_limit IS NOT NULL THEN
+        SET v_limit = p_limit;
+    END IF;
+
+    SELECT s.student_id, s.first_name, s.last_name, s.major, s.gpa,
+           COUNT(*) AS match_count,
+           SUM(COALESCE(w.weight, 1.00)) AS match_score
+    FROM Project_Skills ps
+    JOIN Skills sk ON sk.skill_id = ps.skill_id
+    LEFT JOIN Skill_Category_Weights w ON w.category = sk.category
+    JOIN Student_Skills ss ON ss.skill_id = ps.skill_id
+    JOIN Students s ON s.student_id = ss.student_id
+    WHERE ps.project_id = p_project_id
+    GROUP BY s.student_id
+    ORDER BY match_score DESC, match_count DESC, s.student_id
+    LIMIT v_limit;
+END$$
+
+-- Batch mode: top-K students for every recruiting project in a single pass.
+CREATE PROCEDURE RankStudentsForRecruitingProjects(IN p_top_k INT)
+BEGIN
+    WITH scores AS (
+        SELECT ps.project_id, ss.student_id,
+               COUNT(*) AS match_count,
+               SUM(COALESCE(w.weight, 1.00)) AS match_score
+        FROM Research_Projects p
+        JOIN Project_Skills ps ON ps.project_id = p.project_id
+        JOIN Skills sk ON sk.skill_id = ps.skill_id
+        LEFT JOIN Skill_Category_Weights w ON w.category = sk.category
+        JOIN Student_Skills ss ON ss.skill_id = ps.skill_id
+        WHERE p.status = 'Recruiting'
+        GROUP BY ps.project_id, ss.student_id
+    ), ranked AS (
+        SELECT scores.*,
+               ROW_NUMBER() OVER (PARTITION BY project_id
+                                  ORDER BY match_score DESC, match_count DESC, student_id) AS match_rank
+        FROM scores
+    )
+    SELECT r.project_id, r.student_id, s.first_name, s.last_name, s.major, s.gpa,
+           r.match_count, r.match_score, r.match_rank
+    FROM ranked r
+    JOIN Students s ON s.student_id = r.student_id
+    WHERE r.match_rank <= p_top_k
+    ORDER BY r.project_id, r.match_rank;
+END$$
+
+-- Kept for existing callers: full ranking (same leading columns as before).
 CREATE PROCEDURE MatchStudentsToProject(IN p_project_id INT)
 BEGIN
-    SELECT s.student_id, s.first_name, s.last_name,
-           (
-              SELECT COUNT(*) 
-              FROM Student_Skills ss 
-              JOIN Project_Skills ps ON ss.skill_id = ps.skill_id
-              WHERE ss.student_id = s.student_id AND ps.project_id = p_project_id
-           ) AS match_score
-    FROM Students s
-    WHERE (
-        SELECT COUNT(*) 
-        FROM Student_Skills ss 
-        JOIN Project_Skills ps ON ss.skill_id = ps.skill_id
-        WHERE ss.student_id = s.student_id AND ps.project_id = p_project_id
-    ) > 0
-    ORDER BY match_score DESC;
+    CALL RankStudentsForProject(p_project_id, NULL);
 END$$
 
-CREATE PROCEDURE accept_application(IN p_application_id INT)
+-- Review results are collected in a session temporary table and returned as the
+-- procedure's result set: one row per requested application id.
+--   outcome = accepted | already_accepted | withdrawn | full | rejected | not_pending | not_found
+CREATE PROCEDURE reset_review_results()
 BEGIN
+    DROP TEMPORARY TABLE IF EXISTS review_results;
+    CREATE TEMPORARY TABLE review_results (
+        seq INT AUTO_INCREMENT PRIMARY KEY,
+        application_id INT,
+        project_id INT,
+        outcome VARCHAR(20),
+        member_count INT,
+        max_students INT,
+        project_status VARCHAR(20)
+    );
+END$$
+
+-- Accepts a batch of applications (JSON array of ids) inside the caller's
+-- transaction, never filling a project beyond max_students. Each project row is
+-- locked FOR UPDATE before its member count is read, so concurrent acceptors
+-- serialize per project; applications are processed in project_id order, so
+-- batches lock projects in the same order and cannot deadlock. A project that
+-- becomes full while Recruiting is switched to In Progress.
+CREATE PROCEDURE accept_applications_in_tx(IN p_application_ids JSON)
+BEGIN
+    DECLARE v_done BOOLEAN DEFAULT FALSE;
+    DECLARE v_application_id INT;
     DECLARE v_project_id INT;
     DECLARE v_student_id INT;
+    DECLARE v_app_status VARCHAR(20);
+    DECLARE v_project_status VARCHAR(20);
+    DECLARE v_max INT;
+    DECLARE v_members INT;
+    DECLARE v_outcome VARCHAR(20);
+    DECLARE app_cursor CURSOR FOR
+        SELECT j.application_id
+        FROM JSON_TABLE(p_application_ids, '$[*]' COLUMNS (application_id INT PATH '$')) j
+        LEFT JOIN Applications a ON a.application_id = j.application_id
+        ORDER BY a.project_id, a.applied_at, j.application_id;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = TRUE;
+
+    OPEN app_cursor;
+    accept_loop: LOOP
+        FETCH app_cursor INTO v_application_id;
+        IF v_done THEN
+            LEAVE accept_loop;
+        END IF;
+
+        SET v_project_id = NULL, v_max = NULL, v_members = NULL, v_project_status = NULL;
+        SELECT project_id INTO v_project_id FROM Applications WHERE application_id = v_application_id;
+
+        IF v_project_id IS NULL THEN
+            SET v_done = FALSE;  -- the empty SELECT ... INTO tripped the NOT FOUND handler
+            SET v_outcome = 'not_found';
+        ELSE
+            -- Lock the project first, then read current (not snapshot) state under the lock
+            SELECT max_students, status INTO v_max, v_project_status
+            FROM Research_Projects WHERE project_id = v_project_id FOR UPDATE;
+            SELECT student_id, status INTO v_student_id, v_app_status
+            FROM Applications WHERE application_id = v_application_id FOR UPDATE;
+            SELECT COUNT(*) INTO v_members
+            FROM Project_Members WHERE project_id = v_project_id FOR SHARE;
+
+            IF v_app_status = 'Accepted' THEN
+                SET v_outcome = 'already_accepted';
+            ELSEIF v_app_status = 'Withdrawn' THEN
+                SET v_outcome = 'withdrawn';
+            ELSEIF v_app_status <> 'Pending' THEN
+                SET v_outcome = 'not_pending';  -- Rejected or Expired: a decision already made
+            ELSEIF v_members >= v_max THEN
+                SET v_outcome = 'full';
+            ELSE
+                UPDATE Applications
+                SET status = 'Accepted', reviewed_at = CURRENT_TIMESTAMP
+                WHERE application_id = v_application_id;
+
+                INSERT IGNORE INTO Project_Members (project_id, student_id)
+                VALUES (v_project_id, v_student_id);
+                SET v_members = v_members + ROW_COUNT();
+                SET v_outcome = 'accepted';
+
+                IF v_members >= v_max AND v_project_status = 'Recruiting' THEN
+                    UPDATE Research_Projects SET status = 'In Progress' WHERE project_id = v_project_id;
+                    SET v_project_status = 'In Progress';
+                END IF;
+            END IF;
+        END IF;
+
+        INSERT INTO review_results (application_id, project_id, outcome, member_count, max_students, project_status)
+        VALUES (v_application_id, v_project_id, v_outcome, v_members, v_max, v_project_status);
+    END LOOP;
+    CLOSE app_cursor;
+END$$
 
-    SELECT project_id, student_id 
-    INTO v_project_id, v_student_id 
-    FROM Applications 
-    WHERE application_id = p_application_id;
+-- Capacity-aware acceptance of a batch in its own transaction.
+CREATE PROCEDURE accept_applications(IN p_application_ids JSON)
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    CALL reset_review_results();
+    START TRANSACTION;
+    CALL accept_applications_in_tx(p_application_ids);
+    COMMIT;
+
+    SELECT application_id, project_id, outcome, member_count, max_students, project_status
+    FROM review_results ORDER BY seq;
+    DROP TEMPORARY TABLE review_results;
+END$$
 
-    UPDATE Applications 
-    SET status = 'Accepted' 
-    WHERE application_id = p_application_id;
+-- Bulk review for one faculty member: rejects and accepts in a single transaction.
+-- Ids outside p_faculty_id's projects are reported as not_found, with no project
+-- details, and left untouched.
+-- Rejections are one set-based UPDATE of the Pending applications (others are
+-- not_pending); the row trigger still logs every status change.
+CREATE PROCEDURE review_applications(IN p_faculty_id INT, IN p_accept_ids JSON, IN p_reject_ids JSON)
+BEGIN
+    DECLARE v_accept JSON;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    CALL reset_review_results();
+    START TRANSACTION;
+
+    -- Rejections: record outcomes (INSERT ... SELECT share-locks the source rows), then one UPDATE.
+    -- p.project_id is NULL for not_found, so another faculty member's project id never leaks.
+    INSERT INTO review_results (application_id, project_id, outcome)
+    SELECT j.application_id, p.project_id,
+           CASE WHEN p.project_id IS NULL THEN 'not_found'
+                WHEN a.status = 'Pending' THEN 'rejected'
+                ELSE 'not_pending' END
+    FROM JSON_TABLE(p_reject_ids, '$[*]' COLUMNS (application_id INT PATH '$')) j
+    LEFT JOIN Applications a ON a.application_id = j.application_id
+    LEFT JOIN Research_Projects p ON p.project_id = a.project_id AND p.faculty_id = p_faculty_id
+    ORDER BY j.application_id;
+
+    UPDATE Applications a
+    JOIN review_results r ON r.application_id = a.application_id AND r.outcome = 'rejected'
+    SET a.status = 'Rejected', a.reviewed_at = CURRENT_TIMESTAMP;
+
+    -- Acceptances: only this faculty member's applications reach the capacity check
+    INSERT INTO review_results (application_id, outcome)
+    SELECT j.application_id, 'not_found'
+    FROM JSON_TABLE(p_accept_ids, '$[*]' COLUMNS (application_id INT PATH '$')) j
+    LEFT JOIN Applications a ON a.application_id = j.application_id
+    LEFT JOIN Research_Projects p ON p.project_id = a.project_id AND p.faculty_id = p_faculty_id
+    WHERE p.project_id IS NULL;
+
+    SELECT COALESCE(JSON_ARRAYAGG(a.application_id), JSON_ARRAY()) INTO v_accept
+    FROM JSON_TABLE(p_accept_ids, '$[*]' COLUMNS (application_id INT PATH '$')) j
+    JOIN Applications a ON a.application_id = j.application_id
+    JOIN Research_Projects p ON p.project_id = a.project_id AND p.faculty_id = p_faculty_id;
+    CALL accept_applications_in_tx(v_accept);
+
+    COMMIT;
+
+    SELECT application_id, project_id, outcome, member_count, max_students, project_status
+    FROM review_results ORDER BY seq;
+    DROP TEMPORARY TABLE review_results;
+END$$
 
-    INSERT IGNORE INTO Project_Members (project_id, student_id)
-    VALUES (v_project_id, v_student_id);
+-- Single application; same locking, capacity check and result row as the batch form.
+CREATE PROCEDURE accept_application(IN p_application_id INT)
+BEGIN
+    CALL accept_applications(JSON_ARRAY(p_application_id));
 END$$
 
 -- NEW: procedure to withdraw an application and remove project membership if present
@@ -229,24 +515,127 @@ BEGIN
     WHERE project_id = v_project_id AND student_id = v_student_id;
 END$$
 
+-- NEW: recompute Platform_Stats from the base tables (repair / after bulk loads):
+-- slot 0 gets the live counts, every other slot is reset to zero
+CREATE PROCEDURE refresh_platform_stats()
+BEGIN
+    UPDATE Platform_Stats
+    SET total_students = IF(slot = 0, (SELECT COUNT(*) FROM Students), 0),
+        total_faculty = IF(slot = 0, (SELECT COUNT(*) FROM Faculty), 0),
+        total_projects = IF(slot = 0, (SELECT COUNT(*) FROM Research_Projects), 0),
+        pending_applications = IF(slot = 0, (SELECT COUNT(*) FROM Applications WHERE status = 'Pending'), 0);
+END$$
+
+-- NEW: recompute Project_Stats from the base tables (repair / after bulk loads)
+CREATE PROCEDURE refresh_project_stats()
+BEGIN
+    INSERT INTO Project_Stats (project_id, applicant_count, pending_count, accepted_count, member_count)
+    SELECT * FROM (
+        SELECT p.project_id,
+               COALESCE(a.applicants, 0) AS applicants,
+               COALESCE(a.pending, 0) AS pending,
+               COALESCE(a.accepted, 0) AS accepted,
+               COALESCE(m.members, 0) AS members
+        FROM Research_Projects p
+        LEFT JOIN (
+            SELECT project_id, COUNT(*) AS applicants,
+                   SUM(status = 'Pending') AS pending, SUM(status = 'Accepted') AS accepted
+            FROM Applications GROUP BY project_id
+        ) a ON a.project_id = p.project_id
+        LEFT JOIN (
+            SELECT project_id, COUNT(*) AS members FROM Project_Members GROUP BY project_id
+        ) m ON m.project_id = p.project_id
+    ) AS fresh
+    ON DUPLICATE KEY UPDATE
+        applicant_count = fresh.applicants,
+        pending_count = fresh.pending,
+        accepted_count = fresh.accepted,
+        member_count = fresh.members;
+END$$
+
+-- NEW: Project_Stats rows that disagree with a live recount (expect none)
+CREATE PROCEDURE verify_project_stats()
+BEGIN
+    SELECT p.project_id,
+           ps.applicant_count, (SELECT COUNT(*) FROM Applications WHERE project_id = p.project_id) AS live_applicants,
+           ps.pending_count, (SELECT COUNT(*) FROM Applications WHERE project_id = p.project_id AND status = 'Pending') AS live_pending,
+           ps.accepted_count, (SELECT COUNT(*) FROM Applications WHERE project_id = p.project_id AND status = 'Accepted') AS live_accepted,
+           ps.member_count, (SELECT COUNT(*) FROM Project_Members WHERE project_id = p.project_id) AS live_members
+    FROM Research_Projects p
+    LEFT JOIN Project_Stats ps ON ps.project_id = p.project_id
+    HAVING ps.applicant_count IS NULL
+        OR ps.applicant_count <> live_applicants OR ps.pending_count <> live_pending
+        OR ps.accepted_count <> live_accepted OR ps.member_count <> live_members;
+END$$
+
+-- NEW: rebuild Accounts from the three user tables (e.g. after a bulk load with
+-- triggers disabled). An email used by more than one role keeps the first of
+-- admin, faculty, student; verify_accounts() lists the losers.
+CREATE PROCEDURE refresh_accounts()
+BEGIN
+    DELETE FROM Accounts;
+    INSERT IGNORE INTO Accounts (email, role, user_id) SELECT email, 'admin', admin_id FROM Admin;
+    INSERT IGNORE INTO Accounts (email, role, user_id) SELECT email, 'faculty', faculty_id FROM Faculty;
+    INSERT IGNORE INTO Accounts (email, role, user_id) SELECT email, 'student', student_id FROM Students;
+END$$
+
+-- NEW: user rows whose Accounts entry is missing or points elsewhere (expect none)
+CREATE PROCEDURE verify_accounts()
+BEGIN
+    SELECT u.email, u.role, u.user_id, a.role AS account_role, a.user_id AS account_user_id
+    FROM (
+        SELECT email, 'admin' AS role, admin_id AS user_id FROM Admin
+        UNION ALL SELECT email, 'faculty', faculty_id FROM Faculty
+        UNION ALL SELECT email, 'student', student_id FROM Students
+    ) u
+    LEFT JOIN Accounts a ON a.email = u.email
+    WHERE a.email IS NULL OR a.role <> u.role OR a.user_id <> u.user_id;
+END$$
+
+-- NEW: make sure Application_Logs has a partition for every month up to
+-- p_months_ahead months from now. New months are split off the (empty)
+-- catch-all pmax partition, so this is cheap and safe to call repeatedly.
+CREATE PROCEDURE ensure_log_partitions(IN p_months_ahead INT)
+BEGIN
+    DECLARE v_bound DATE;
+    DECLARE v_stop DATE DEFAULT DATE_ADD(DATE_FORMAT(CURDATE(), '%Y-%m-01'), INTERVAL p_months_ahead + 1 MONTH);
+
+    -- exclusive upper bound of the newest monthly partition, if any
+    SELECT MAX(CAST(TRIM(BOTH '\'' FROM PARTITION_DESCRIPTION) AS DATE)) INTO v_bound
+    FROM INFORMATION_SCHEMA.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Application_Logs'
+      AND PARTITION_DESCRIPTION <> 'MAXVALUE';
+
+    -- the first monthly partition also takes every older row
+    SET v_bound = IF(v_bound IS NULL,
+                     DATE_ADD(DATE_FORMAT(CURDATE(), '%Y-%m-01'), INTERVAL 1 MONTH),
+                     DATE_ADD(v_bound, INTERVAL 1 MONTH));
+
+    WHILE v_bound <= v_stop DO
+        SET @ddl = CONCAT(
+            'ALTER TABLE Application_Logs REORGANIZE PARTITION pmax INTO (',
+            'PARTITION p', DATE_FORMAT(DATE_SUB(v_bound, INTERVAL 1 MONTH), '%Y%m'),
+            ' VALUES LESS THAN (\'', v_bound, '\'), ',
+            'PARTITION pmax VALUES LESS THAN (MAXVALUE))');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+        SET v_bound = DATE_ADD(v_bound, INTERVAL 1 MONTH);
+    END WHILE;
+END$$
+
 DELIMITER ;
 
+CALL ensure_log_partitions(3);
+
 -- -----------------------------
 -- TRIGGERS
 -- -----------------------------
 DELIMITER $$
 
-CREATE TRIGGER trg_award_on_complete
-AFTER UPDATE ON Research_Projects
-FOR EACH ROW
-BEGIN
-    IF NEW.status = 'Completed' AND OLD.status <> 'Completed' THEN
-        INSERT IGNORE INTO Student_Achievements (student_id, project_id, title, awarded_on)
-        SELECT a.student_id, NEW.project_id, CONCAT('Completed: ', NEW.title), NOW()
-        FROM Applications a
-        WHERE a.project_id = NEW.project_id AND a.status = 'Accepted';
-    END IF;
-END$$
+-- Achievements for completed projects are no longer awarded by a trigger inside
+-- the faculty member's "Update" request: the award_achievements job in jobs.py
+-- inserts them in set-based chunks (uq_achievement keeps it idempotent).
 
 -- NEW: trigger to log status changes on Applications
 CREATE TRIGGER trg_log_application_status_change
@@ -259,6 +648,262 @@ BEGIN
     END IF;
 END$$
 
+-- NEW: triggers keeping Platform_Stats incrementally up to date, each in its
+-- connection's slot (CONNECTION_ID() % 16, see the table definition).
+-- FK cascades do not fire triggers on the child table, so the parent
+-- BEFORE DELETE triggers subtract the rows the cascade is about to remove.
+CREATE TRIGGER trg_stats_student_insert
+AFTER INSERT ON Students
+FOR EACH ROW
+BEGIN
+    UPDATE Platform_Stats SET total_students = total_students + 1 WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+CREATE TRIGGER trg_stats_student_delete
+BEFORE DELETE ON Students
+FOR EACH ROW
+BEGIN
+    UPDATE Platform_Stats
+    SET total_students = total_students - 1,
+        pending_applications = pending_applications - (
+            SELECT COUNT(*) FROM Applications
+            WHERE student_id = OLD.student_id AND status = 'Pending')
+    WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+CREATE TRIGGER trg_stats_faculty_insert
+AFTER INSERT ON Faculty
+FOR EACH ROW
+BEGIN
+    UPDATE Platform_Stats SET total_faculty = total_faculty + 1 WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+CREATE TRIGGER trg_stats_faculty_delete
+BEFORE DELETE ON Faculty
+FOR EACH ROW
+BEGIN
+    UPDATE Platform_Stats
+    SET total_faculty = total_faculty - 1,
+        total_projects = total_projects - (
+            SELECT COUNT(*) FROM Research_Projects WHERE faculty_id = OLD.faculty_id),
+        pending_applications = pending_applications - (
+            SELECT COUNT(*) FROM Applications a
+            JOIN Research_Projects p ON a.project_id = p.project_id
+            WHERE p.faculty_id = OLD.faculty_id AND a.status = 'Pending')
+    WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+CREATE TRIGGER trg_stats_project_insert
+AFTER INSERT ON Research_Projects
+FOR EACH ROW
+BEGIN
+    UPDATE Platform_Stats SET total_projects = total_projects + 1 WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+CREATE TRIGGER trg_stats_project_delete
+BEFORE DELETE ON Research_Projects
+FOR EACH ROW
+BEGIN
+    UPDATE Platform_Stats
+    SET total_projects = total_projects - 1,
+        pending_applications = pending_applications - (
+            SELECT COUNT(*) FROM Applications
+            WHERE project_id = OLD.project_id AND status = 'Pending')
+    WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+CREATE TRIGGER trg_stats_application_insert
+AFTER INSERT ON Applications
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'Pending' THEN
+        UPDATE Platform_Stats SET pending_applications = pending_applications + 1 WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_stats_application_status_change
+AFTER UPDATE ON Applications
+FOR EACH ROW
+FOLLOWS trg_log_application_status_change
+BEGIN
+    IF OLD.status <> NEW.status AND 'Pending' IN (OLD.status, NEW.status) THEN
+        UPDATE Platform_Stats
+        SET pending_applications = pending_applications
+            + (NEW.status = 'Pending') - (OLD.status = 'Pending')
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_stats_application_delete
+AFTER DELETE ON Applications
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'Pending' THEN
+        UPDATE Platform_Stats SET pending_applications = pending_applications - 1 WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+-- NEW: triggers keeping Project_Stats exactly in sync. As above, cascades
+-- from a deleted student are subtracted in a BEFORE DELETE trigger; a
+-- deleted project takes its Project_Stats row with it.
+CREATE TRIGGER trg_project_stats_project_insert
+AFTER INSERT ON Research_Projects
+FOR EACH ROW
+BEGIN
+    INSERT INTO Project_Stats (project_id) VALUES (NEW.project_id);
+END$$
+
+CREATE TRIGGER trg_project_stats_application_insert
+AFTER INSERT ON Applications
+FOR EACH ROW
+BEGIN
+    UPDATE Project_Stats
+    SET applicant_count = applicant_count + 1,
+        pending_count = pending_count + (NEW.status = 'Pending'),
+        accepted_count = accepted_count + (NEW.status = 'Accepted')
+    WHERE project_id = NEW.project_id;
+END$$
+
+CREATE TRIGGER trg_project_stats_application_update
+AFTER UPDATE ON Applications
+FOR EACH ROW
+FOLLOWS trg_stats_application_status_change
+BEGIN
+    IF OLD.project_id <> NEW.project_id THEN
+        UPDATE Project_Stats
+        SET applicant_count = applicant_count - 1,
+            pending_count = pending_count - (OLD.status = 'Pending'),
+            accepted_count = accepted_count - (OLD.status = 'Accepted')
+        WHERE project_id = OLD.project_id;
+        UPDATE Project_Stats
+        SET applicant_count = applicant_count + 1,
+            pending_count = pending_count + (NEW.status = 'Pending'),
+            accepted_count = accepted_count + (NEW.status = 'Accepted')
+        WHERE project_id = NEW.project_id;
+    ELSEIF OLD.status <> NEW.status THEN
+        UPDATE Project_Stats
+        SET pending_count = pending_count + (NEW.status = 'Pending') - (OLD.status = 'Pending'),
+            accepted_count = accepted_count + (NEW.status = 'Accepted') - (OLD.status = 'Accepted')
+        WHERE project_id = NEW.project_id;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_project_stats_application_delete
+AFTER DELETE ON Applications
+FOR EACH ROW
+BEGIN
+    UPDATE Project_Stats
+    SET applicant_count = applicant_count - 1,
+        pending_count = pending_count - (OLD.status = 'Pending'),
+        accepted_count = accepted_count - (OLD.status = 'Accepted')
+    WHERE project_id = OLD.project_id;
+END$$
+
+CREATE TRIGGER trg_project_stats_member_insert
+AFTER INSERT ON Project_Members
+FOR EACH ROW
+BEGIN
+    UPDATE Project_Stats SET member_count = member_count + 1 WHERE project_id = NEW.project_id;
+END$$
+
+CREATE TRIGGER trg_project_stats_member_delete
+AFTER DELETE ON Project_Members
+FOR EACH ROW
+BEGIN
+    UPDATE Project_Stats SET member_count = member_count - 1 WHERE project_id = OLD.project_id;
+END$$
+
+CREATE TRIGGER trg_project_stats_student_delete
+BEFORE DELETE ON Students
+FOR EACH ROW
+FOLLOWS trg_stats_student_delete
+BEGIN
+    UPDATE Project_Stats ps
+    JOIN (
+        SELECT project_id, COUNT(*) AS applicants,
+               SUM(status = 'Pending') AS pending, SUM(status = 'Accepted') AS accepted
+        FROM Applications WHERE student_id = OLD.student_id GROUP BY project_id
+    ) a ON a.project_id = ps.project_id
+    SET ps.applicant_count = ps.applicant_count - a.applicants,
+        ps.pending_count = ps.pending_count - a.pending,
+        ps.accepted_count = ps.accepted_count - a.accepted;
+    UPDATE Project_Stats ps
+    JOIN Project_Members m ON m.project_id = ps.project_id AND m.student_id = OLD.student_id
+    SET ps.member_count = ps.member_count - 1;
+END$$
+
+-- NEW: triggers keeping Accounts in step with the user tables. An email already
+-- taken by any role makes the Accounts INSERT, and with it the whole user
+-- INSERT, fail with a duplicate-key error.
+CREATE TRIGGER trg_accounts_student_insert
+AFTER INSERT ON Students
+FOR EACH ROW
+BEGIN
+    INSERT INTO Accounts (email, role, user_id) VALUES (NEW.email, 'student', NEW.student_id);
+END$$
+
+CREATE TRIGGER trg_accounts_student_update
+AFTER UPDATE ON Students
+FOR EACH ROW
+BEGIN
+    IF NEW.email <> OLD.email THEN
+        UPDATE Accounts SET email = NEW.email WHERE role = 'student' AND user_id = OLD.student_id;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_accounts_student_delete
+AFTER DELETE ON Students
+FOR EACH ROW
+BEGIN
+    DELETE FROM Accounts WHERE role = 'student' AND user_id = OLD.student_id;
+END$$
+
+CREATE TRIGGER trg_accounts_faculty_insert
+AFTER INSERT ON Faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO Accounts (email, role, user_id) VALUES (NEW.email, 'faculty', NEW.faculty_id);
+END$$
+
+CREATE TRIGGER trg_accounts_faculty_update
+AFTER UPDATE ON Faculty
+FOR EACH ROW
+BEGIN
+    IF NEW.email <> OLD.email THEN
+        UPDATE Accounts SET email = NEW.email WHERE role = 'faculty' AND user_id = OLD.faculty_id;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_accounts_faculty_delete
+AFTER DELETE ON Faculty
+FOR EACH ROW
+BEGIN
+    DELETE FROM Accounts WHERE role = 'faculty' AND user_id = OLD.faculty_id;
+END$$
+
+CREATE TRIGGER trg_accounts_admin_insert
+AFTER INSERT ON Admin
+FOR EACH ROW
+BEGIN
+    INSERT INTO Accounts (email, role, user_id) VALUES (NEW.email, 'admin', NEW.admin_id);
+END$$
+
+CREATE TRIGGER trg_accounts_admin_update
+AFTER UPDATE ON Admin
+FOR EACH ROW
+BEGIN
+    IF NEW.email <> OLD.email THEN
+        UPDATE Accounts SET email = NEW.email WHERE role = 'admin' AND user_id = OLD.admin_id;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_accounts_admin_delete
+AFTER DELETE ON Admin
+FOR EACH ROW
+BEGIN
+    DELETE FROM Accounts WHERE role = 'admin' AND user_id = OLD.admin_id;
+END$$
+
 DELIMITER ;
 
 -- ========================================================
@@ -1,9 +1,15 @@
 import streamlit as st
+import jobs
+import sessions
+from auth import AuthBusy
 from utils import verify_user, hash_password
-from db import get_connection
+from repos import FacultyRepo, StudentRepo
+from profiling import begin_run
 
 # Streamlit Page Config
 st.set_page_config(page_title="Research Connect", page_icon="🧠", layout="wide")
+begin_run("app")
+jobs.start_in_app()  # only with JOBS_IN_APP=1; otherwise `python -m jobs` runs them
 
 # --- Header ---
 st.markdown(
@@ -19,7 +25,7 @@ tab1, tab2 = st.tabs(["🔑 Login", "📝 Sign Up"])
 # 🔐 LOGIN TAB
 # ======================================================
 with tab1:
-    role = st.selectbox("Select Role", ["Student", "Faculty", "Admin"], key="login_role")
+    # The email identifies the account and its role, so there is no role picker
     email = st.text_input("Email", placeholder="you@university.edu", key="login_email")
     password = st.text_input("Password", type="password", key="login_password")
 
@@ -28,20 +34,11 @@ with tab1:
             st.warning("⚠️ Please enter both email and password.")
         else:
             try:
-                user = verify_user(email, password, role)
+                user = verify_user(email, password)
                 if user:
-                    # Store user info in session state
-                    st.session_state['user'] = user
-                    st.session_state['role'] = role.lower()  # Ensure lowercase
-                    
-                    # Store user_id based on role
-                    if role.lower() == "student":
-                        st.session_state['user_id'] = user['student_id']
-                    elif role.lower() == "faculty":
-                        st.session_state['user_id'] = user['faculty_id']
-                    elif role.lower() == "admin":
-                        st.session_state['user_id'] = user['admin_id']
-                    
+                    # Only id, role and name go into the server-side session
+                    sessions.login(user["user_id"], user["role"], f"{user['first_name']} {user['last_name']}")
+
                     st.success(f"✅ Welcome {user['first_name']} {user['last_name']}!")
                     st.info("🔄 Redirecting to dashboard...")
                     
@@ -49,6 +46,8 @@ with tab1:
                     st.rerun()
                 else:
                     st.error("❌ Invalid credentials or account not found.")
+            except AuthBusy as e:
+                st.warning(f"⏳ {e}")
             except Exception as e:
                 st.error(f"⚠️ Error during login: {e}")
 
@@ -68,25 +67,13 @@ with tab2:
             st.warning("⚠️ Please fill in all fields before signing up.")
         else:
             try:
-                conn = get_connection()
-                cursor = conn.cursor()
+                repo = StudentRepo() if role == "Student" else FacultyRepo()
 
-                table = "Students" if role == "Student" else "Faculty"
-
-                # ✅ Check if email already exists
-                cursor.execute(f"SELECT email FROM {table} WHERE email=%s", (email,))
-                existing = cursor.fetchone()
-                if existing:
+                # ✅ Hash password securely; the insert fails if any account already uses the email
+                hashed_pw = hash_password(password)
+                if not repo.register(first, last, email, hashed_pw):
                     st.error("🚫 This email is already registered.")
                 else:
-                    # ✅ Hash password securely
-                    hashed_pw = hash_password(password)
-
-                    # ✅ Insert into DB
-                    query = f"INSERT INTO {table} (first_name, last_name, email, password) VALUES (%s,%s,%s,%s)"
-                    cursor.execute(query, (first, last, email, hashed_pw))
-                    conn.commit()
-
                     st.success(f"✅ {role} account created successfully! You can now log in.")
                     st.info("🔑 Please use your new credentials to log in on the Login tab.")
                     
@@ -98,20 +85,19 @@ with tab2:
 
             except Exception as e:
                 st.error(f"❌ Database error: {e}")
-            finally:
-                conn.close()
 
 
 # ======================================================
 # 🔀 AUTO-REDIRECT AFTER LOGIN
 # ======================================================
 # Check if user is logged in and redirect to appropriate dashboard
-if 'user' in st.session_state and st.session_state.get('user') is not None:
-    role = st.session_state.get('role', '').lower()
-    
-    if role == "student":
+session = sessions.current()
+if session is not None:
+    if session.role == "student":
         st.switch_page("pages/Student_Dashboard.py")
-    elif role == "faculty":
+    elif session.role == "faculty":
         st.switch_page("pages/Faculty_Dashboard.py")
-    elif role == "admin":
-        st.switch_page("pages/Admin_Dashboard.py")
\ No newline at end of file
+    elif session.role == "admin":
+        st.switch_page("pages/Admin_Dashboard.py")
+else:
+    sessions.sync_cookie()  # clears the cookie after a logout
@@ -0,0 +1,165 @@
+"""Password hashing and login verification off the Streamlit script thread.
+
+bcrypt releases the GIL, so running it on a small worker pool lets many
+sessions verify passwords in parallel while the pool size caps CPU use.
+``AUTH_MAX_PENDING`` bounds how many hashes may be queued; beyond that,
+callers wait up to ``AUTH_QUEUE_TIMEOUT`` seconds and then get ``AuthBusy``
+instead of piling up behind the pool.
+"""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from config import AUTH_MAX_PENDING, AUTH_QUEUE_TIMEOUT, AUTH_WORKERS, BCRYPT_ROUNDS
+from db import get_connection
+
+# role -> (table, primary key column)
+ROLE_TABLES = {
+    "student": ("Students", "student_id"),
+    "faculty": ("Faculty", "faculty_id"),
+    "admin": ("Admin", "admin_id"),
+}
+
+
+class AuthBusy(Exception):
+    """Raised when the hashing pool is saturated and a request cannot be queued in time."""
+
+
+_executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+_slots = threading.BoundedSemaphore(AUTH_MAX_PENDING)
+_dummy_hash = None
+_dummy_lock = threading.Lock()
+
+
+def _submit(fn, *args):
+    if not _slots.acquire(timeout=AUTH_QUEUE_TIMEOUT):
+        raise AuthBusy("Login service is busy, please try again in a moment.")
+    try:
+        future = _executor.submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def _hash(password, rounds=BCRYPT_ROUNDS):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _rounds(stored_hash):
+    # "$2b$12$<salt+hash>" -> 12
+    try:
+        return int(stored_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def needs_rehash(stored_hash):
+    """True when a stored hash was made with a different cost factor than configured."""
+    return _rounds(stored_hash) != BCRYPT_ROUNDS
+
+
+def _dummy():
+    global _dummy_hash
+    with _dummy_lock:
+        if _dummy_hash is None:
+            _dummy_hash = _hash(b"timing-equalizer")
+        return _dummy_hash
+
+
+def _verify(password, stored):
+    if stored is None:
+        # Unknown account: spend the same bcrypt time so response timing
+        # does not reveal which emails are registered.
+        bcrypt.checkpw(password, _dummy())
+        return False
+    try:
+        return bcrypt.checkpw(password, stored)
+    except ValueError:  # malformed / legacy non-bcrypt value
+        return False
+
+
+def _rehash(table, id_col, user_id, password, old_hash):
+    new_hash = _hash(password).decode()
+    conn = get_connection()
+    if conn is None:
+        return
+    try:
+        cursor = conn.cursor()
+        # Only replace the hash we verified, in case the password changed meanwhile
+        cursor.execute(
+            f"UPDATE {table} SET password=%s WHERE {id_col}=%s AND password=%s",
+            (new_hash, user_id, old_hash),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def hash_password(password):
+    """bcrypt hash at the configured cost, computed on the worker pool."""
+    return _submit(_hash, password.encode()).result().decode()
+
+
+def hash_passwords(passwords, rounds=BCRYPT_ROUNDS):
+    """Hash many passwords on the worker pool; returns the hashes in input order.
+
+    At most ``AUTH_WORKERS`` hashes are queued at a time, so a bulk import
+    keeps every worker busy while logins still find free queue slots. Hashes
+    made at a lower ``rounds`` than configured are upgraded on first login.
+    """
+    hashes, in_flight = [], deque()
+    for password in passwords:
+        if len(in_flight) >= AUTH_WORKERS:
+            hashes.append(in_flight.popleft().result().decode())
+        in_flight.append(_submit(_hash, password.encode(), rounds))
+    hashes.extend(future.result().decode() for future in in_flight)
+    return hashes
+
+
+# One primary-key lookup on Accounts, then one on the owning table
+_LOGIN_SQL = """
+    SELECT a.role, a.user_id,
+           COALESCE(s.first_name, f.first_name, ad.first_name) AS first_name,
+           COALESCE(s.last_name, f.last_name, ad.last_name) AS last_name,
+           COALESCE(s.password, f.password, ad.password) AS password
+    FROM Accounts a
+    LEFT JOIN Students s ON a.role = 'student' AND s.student_id = a.user_id
+    LEFT JOIN Faculty f ON a.role = 'faculty' AND f.faculty_id = a.user_id
+    LEFT JOIN Admin ad ON a.role = 'admin' AND ad.admin_id = a.user_id
+    WHERE a.email = %s
+"""
+
+
+def authenticate(email, password):
+    """Return ``{role, user_id, first_name, last_name}`` for valid credentials, else None.
+
+    The email alone decides the role: ``Accounts`` maps every login email to
+    one Students, Faculty or Admin row. The pooled connection is released
+    before hashing starts, so a slow bcrypt check never holds a database
+    connection.
+    """
+    conn = get_connection()
+    if conn is None:
+        return None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(_LOGIN_SQL, (email,))
+        user = cursor.fetchone()
+    finally:
+        conn.close()
+
+    stored = user.pop("password") if user else None
+    if not _submit(_verify, password.encode(), stored.encode() if stored else None).result():
+        return None
+
+    if needs_rehash(stored):
+        table, id_col = ROLE_TABLES[user["role"]]
+        try:
+            _submit(_rehash, table, id_col, user["user_id"], password.encode(), stored)
+        except AuthBusy:
+            pass  # try again on the next login
+    return user
@@ -0,0 +1,130 @@
+"""Parallel acceptors racing on the same applications: over-fills and throughput.
+
+Seeds ``--projects`` projects of ``--capacity`` seats, each with one Pending
+application from every one of ``--applicants`` students. Every thread then
+tries to accept *all* applications in its own random order, ``--batch`` per
+call, so each project sees heavy contention. ``accept_applications`` commits
+its own transaction, so the seed rows are committed and deleted at the end.
+
+    python -m benchmarks.accept_concurrency --threads 16 --batch 1
+    python -m benchmarks.accept_concurrency --threads 16 --batch 25
+"""
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import print_table
+from db import ConnectionPool
+from repos import ApplicationRepo
+
+DOMAIN = "bench-accept.edu"
+TITLE = "Bench capacity project"
+
+
+def seed(cursor, conn, projects, applicants, capacity):
+    cursor.execute("SELECT faculty_id FROM Faculty LIMIT 1")
+    faculty_id = cursor.fetchone()[0]
+    cursor.execute(
+        "INSERT INTO Research_Projects (title, description, status, max_students, faculty_id) VALUES "
+        + ", ".join(["(%s, 'Concurrency benchmark', 'Recruiting', %s, %s)"] * projects),
+        [v for i in range(projects) for v in (f"{TITLE} {i}", capacity, faculty_id)],
+    )
+    cursor.execute(
+        "INSERT INTO Students (first_name, last_name, email, password) VALUES "
+        + ", ".join(["('Bench', 'Acceptor', %s, 'x')"] * applicants),
+        [f"a{i}@{DOMAIN}" for i in range(applicants)],
+    )
+    cursor.execute(f"""
+        INSERT INTO Applications (status, student_id, project_id)
+        SELECT 'Pending', s.student_id, p.project_id
+        FROM Students s CROSS JOIN Research_Projects p
+        WHERE s.email LIKE '%@{DOMAIN}' AND p.title LIKE '{TITLE} %'
+    """)
+    conn.commit()
+    cursor.execute(f"""
+        SELECT a.application_id FROM Applications a
+        JOIN Research_Projects p ON p.project_id = a.project_id
+        WHERE p.title LIKE '{TITLE} %'
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def cleanup(cursor, conn):
+    cursor.execute("""
+        DELETE l FROM Application_Logs l JOIN Research_Projects p ON p.project_id = l.project_id
+        WHERE p.title LIKE %s
+    """, (f"{TITLE} %",))
+    cursor.execute("DELETE FROM Students WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    cursor.execute("DELETE FROM Research_Projects WHERE title LIKE %s", (f"{TITLE} %",))
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--applicants", type=int, default=30)
+    parser.add_argument("--capacity", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=1, help="applications per accept_applications call")
+    args = parser.parse_args()
+
+    pool = ConnectionPool(size=args.threads + 1)
+    repo = ApplicationRepo(pool)
+    conn = pool.acquire()
+    cursor = conn.cursor()
+    outcomes = Counter()
+    errors = []
+    lock = threading.Lock()
+    try:
+        application_ids = seed(cursor, conn, args.projects, args.applicants, args.capacity)
+
+        def worker(seed_value):
+            ids = application_ids[:]
+            random.Random(seed_value).shuffle(ids)
+            local = Counter()
+            try:
+                for start in range(0, len(ids), args.batch):
+                    for result in repo.accept_many(ids[start:start + args.batch]):
+                        local[result.outcome] += 1
+            except Exception as e:  # deadlocks or lock timeouts would show up here
+                errors.append(e)
+            with lock:
+                outcomes.update(local)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        cursor.execute(f"""
+            SELECT p.project_id, p.max_students, p.status, COUNT(m.student_id) AS members
+            FROM Research_Projects p
+            LEFT JOIN Project_Members m ON m.project_id = p.project_id
+            WHERE p.title LIKE '{TITLE} %'
+            GROUP BY p.project_id
+        """)
+        projects = cursor.fetchall()
+    finally:
+        cleanup(cursor, conn)
+        conn.close()
+        pool.close_all()
+
+    attempts = sum(outcomes.values())
+    overfilled = [p for p in projects if p[3] > p[1]]
+    still_recruiting_full = [p for p in projects if p[3] >= p[1] and p[2] == "Recruiting"]
+    print_table(("outcome", "count"), sorted(outcomes.items()))
+    print()
+    print(f"attempts: {attempts} in {elapsed:.2f}s ({attempts / elapsed:,.0f} applications/s, "
+          f"{attempts / args.batch / elapsed:,.0f} calls/s)")
+    print(f"accepted: {outcomes['accepted']} (expected {args.projects * min(args.capacity, args.applicants)})")
+    print(f"over-filled projects: {len(overfilled)}, full but still Recruiting: {len(still_recruiting_full)}")
+    print(f"errors: {len(errors)}" + (f" (first: {errors[0]})" if errors else ""))
+
+
+if __name__ == "__main__":
+    main()
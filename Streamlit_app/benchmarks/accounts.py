@@ -0,0 +1,215 @@
+"""Account lookup and signup under concurrent load: per-role tables vs the ``Accounts`` index.
+
+Seeds ``--users`` accounts split across Students, Faculty and Admin
+(committed, removed again at the end). Then ``--concurrency`` threads run:
+
+* login lookups, without bcrypt so only the database part is timed. The
+  lookups are ``role picked`` (the old form: ``SELECT *`` on the table of the
+  chosen role), ``probe tables`` (what finding the role from the email alone
+  would cost without ``Accounts``: up to three SELECTs) and ``accounts`` (the
+  one indexed query ``auth.authenticate`` runs now). A quarter of the emails
+  are unknown;
+* full logins through ``auth.authenticate``, bcrypt included, for the
+  end-to-end latency;
+* signups: ``--signups`` registrations where every email is submitted twice
+  at the same time (a double-clicked button, or two people racing). The
+  emails are split between student and faculty so that half of the pairs
+  cross roles. ``check+insert`` is the old SELECT-then-INSERT; ``insert`` is
+  ``register`` now, a single INSERT that lets the unique keys reject the
+  duplicate. ``errors`` counts duplicates that got past the old check and
+  escaped as exceptions, which the user saw as a database error. ``both
+  roles`` counts emails registered as student and faculty; the Accounts
+  triggers keep it at zero on either path.
+
+    python -m benchmarks.accounts --users 3000 --concurrency 16
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from mysql.connector import IntegrityError
+
+import auth
+from benchmarks.common import print_table
+from config import BCRYPT_ROUNDS
+from db import get_connection
+from repos import FacultyRepo, StudentRepo
+
+DOMAIN = "bench-accounts.edu"
+PASSWORD = "bench-password"
+TABLES = [("student", "Students"), ("faculty", "Faculty"), ("admin", "Admin")]
+
+
+def seed(users, hashed):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        emails = []
+        for offset, (role, table) in enumerate(TABLES):
+            batch = [(role, f"{role}{i}@{DOMAIN}") for i in range(offset, users, len(TABLES))]
+            cursor.executemany(
+                f"INSERT INTO {table} (first_name, last_name, email, password) VALUES ('Bench', 'Accounts', %s, %s)",
+                [(email, hashed) for _, email in batch],
+            )
+            emails.extend(batch)
+        conn.commit()
+        return emails
+    finally:
+        conn.close()
+
+
+def cleanup():
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        for _, table in TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE email LIKE %s", (f"%@{DOMAIN}",))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _query(sql, params):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+
+def role_picked(email, role):
+    table, _ = auth.ROLE_TABLES[role]
+    return _query(f"SELECT * FROM {table} WHERE email=%s", (email,))
+
+
+def probe_tables(email, role):
+    for table, _ in auth.ROLE_TABLES.values():
+        row = _query(f"SELECT * FROM {table} WHERE email=%s", (email,))
+        if row:
+            return row
+    return None
+
+
+def accounts(email, role):
+    return _query(auth._LOGIN_SQL, (email,))
+
+
+def full_login(email, role):
+    return auth.authenticate(email, PASSWORD)
+
+
+def check_then_insert(table, email, hashed):
+    """The old signup: SELECT for the email, INSERT if it was free."""
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT 1 FROM {table} WHERE email = %s", (email,))
+        if cursor.fetchone():
+            conn.rollback()
+            return False
+        cursor.execute(
+            f"INSERT INTO {table} (first_name, last_name, email, password) VALUES ('Bench', 'Signup', %s, %s)",
+            (email, hashed),
+        )
+        conn.commit()
+        return True
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def single_insert(table, email, hashed):
+    repo = StudentRepo() if table == "Students" else FacultyRepo()
+    return repo.register("Bench", "Signup", email, hashed)
+
+
+def run(fn, jobs, concurrency):
+    """``(per second, p50 ms, p99 ms, outcomes)`` for ``fn(*job)`` over ``jobs``."""
+    latencies, outcomes = [], []
+
+    def attempt(job):
+        start = time.perf_counter()
+        try:
+            outcomes.append(fn(*job))
+        except IntegrityError:
+            outcomes.append("error")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(attempt, jobs))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+    return len(jobs) / elapsed, pct(50), pct(99), outcomes
+
+
+def registered_twice(prefix):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM Students s JOIN Faculty f ON f.email = s.email WHERE s.email LIKE %s
+        """, (f"{prefix}%@{DOMAIN}",))
+        return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--logins", type=int, default=200, help="full logins (bcrypt included)")
+    parser.add_argument("--signups", type=int, default=500, help="distinct emails, each submitted twice")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+    lookup_rows, signup_rows = [], []
+    try:
+        known = seed(args.users, hashed)
+        # 3 in 4 lookups hit a real account, the rest an unknown email
+        jobs = [tuple(reversed(rng.choice(known))) if rng.random() < 0.75
+                else (f"nobody{i}@{DOMAIN}", rng.choice(TABLES)[0]) for i in range(args.lookups)]
+        for label, fn, count in (("role picked", role_picked, args.lookups),
+                                 ("probe tables", probe_tables, args.lookups),
+                                 ("accounts", accounts, args.lookups),
+                                 ("authenticate", full_login, args.logins)):
+            per_sec, p50, p99, outcomes = run(fn, jobs[:count], args.concurrency)
+            found = sum(1 for o in outcomes if o)
+            lookup_rows.append((label, count, found, f"{per_sec:,.0f}", f"{p50:.1f}", f"{p99:.1f}"))
+
+        for label, fn, prefix in (("check+insert", check_then_insert, "old"), ("insert", single_insert, "new")):
+            jobs = []
+            for i in range(args.signups):
+                email = f"{prefix}{i}@{DOMAIN}"
+                # Even pairs race within one table, odd pairs across student and faculty
+                jobs += [("Students", email, hashed), ("Students" if i % 2 == 0 else "Faculty", email, hashed)]
+            per_sec, p50, p99, outcomes = run(fn, jobs, args.concurrency)
+            signup_rows.append((label, len(jobs), outcomes.count(True), outcomes.count(False),
+                                outcomes.count("error"), registered_twice(prefix),
+                                f"{per_sec:,.0f}", f"{p50:.1f}", f"{p99:.1f}"))
+    finally:
+        cleanup()
+
+    print(f"{args.users} accounts, concurrency={args.concurrency}, bcrypt rounds={BCRYPT_ROUNDS}")
+    print("\nlogin")
+    print_table(("lookup", "attempts", "found", "per s", "p50 ms", "p99 ms"), lookup_rows)
+    print("\nsignup (every email submitted twice at once)")
+    print_table(("path", "attempts", "created", "rejected", "errors", "both roles", "per s", "p50 ms", "p99 ms"),
+                signup_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Bulk student import throughput: the Sign Up path row by row vs ``bulk_import``.
+
+Generates a seeded CSV of ``--rows`` students, about 5% of them invalid
+(bad GPA, missing name, repeated email). It imports the CSV once per batch
+size and reports rows/s. For comparison, ``--single`` rows go through the
+Sign Up path one at a time: one hash and one INSERT each. Rows are
+committed and removed again at the end.
+
+    python -m benchmarks.bulk_import --rows 5000 --batches 100 500 2000
+"""
+import argparse
+import csv
+import io
+import random
+import time
+
+import auth
+from benchmarks.common import print_table
+from bulk_import import import_csv
+from config import BCRYPT_ROUNDS, IMPORT_BCRYPT_ROUNDS
+from db import get_connection
+from repos import StudentRepo
+
+DOMAIN = "bench-import.edu"
+MAJORS = ["Computer Science", "Biotechnology", "Mechanical Engineering", "Physics", "Mathematics"]
+
+
+def cohort_csv(rows, run, seed=7):
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["first_name", "last_name", "email", "major", "gpa", "year_level", "research_interests"])
+    for i in range(rows):
+        email = f"s{i}.r{run}@{DOMAIN}"
+        gpa = f"{rng.uniform(2.0, 4.0):.2f}"
+        first = f"First{i}"
+        fault = rng.random()
+        if fault < 0.02:
+            gpa = "4.7"
+        elif fault < 0.035:
+            first = ""
+        elif fault < 0.05 and i:
+            email = f"s{i - 1}.r{run}@{DOMAIN}"
+        writer.writerow([first, f"Last{i}", email, rng.choice(MAJORS), gpa, rng.randint(1, 4), "Synthetic cohort"])
+    out.seek(0)
+    return out
+
+
+def single(rows):
+    repo = StudentRepo()
+    started = time.perf_counter()
+    for i in range(rows):
+        repo.register("Single", f"Row{i}", f"single{i}@{DOMAIN}", auth.hash_password("initial-password"))
+    return time.perf_counter() - started
+
+
+def cleanup():
+    conn = get_connection()
+    try:
+        conn.cursor().execute("DELETE FROM Students WHERE email LIKE %s", (f"%@{DOMAIN}",))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batches", nargs="+", type=int, default=[100, 500, 2000])
+    parser.add_argument("--single", type=int, default=100, help="rows timed through the one-by-one path")
+    args = parser.parse_args()
+
+    table = []
+    try:
+        if args.single:
+            secs = single(args.single)
+            table.append(("one-by-one", "-", args.single, args.single, 0, f"{args.single / secs:,.0f}", BCRYPT_ROUNDS))
+        for run, batch_size in enumerate(args.batches):
+            report = import_csv("students", cohort_csv(args.rows, run), batch_size=batch_size)
+            table.append(("bulk", batch_size, report.rows, report.inserted, len(report.errors),
+                          f"{report.rows_per_second():,.0f}", IMPORT_BCRYPT_ROUNDS))
+    finally:
+        cleanup()
+
+    print_table(("path", "batch", "rows", "inserted", "rejected", "rows/s", "bcrypt_rounds"), table)
+
+
+if __name__ == "__main__":
+    main()
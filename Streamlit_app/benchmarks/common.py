@@ -0,0 +1,58 @@
+"""Shared helpers for the benchmark scripts.
+
+Run benchmarks from ``Streamlit_app/`` as modules, e.g.
+``python -m benchmarks.student_projects``, against a scratch copy of the
+``researchhub`` database configured through the usual ``DB_*`` variables.
+"""
+import time
+
+
+class CountingCursor:
+    """Wraps a cursor and counts statements sent to the server (round-trips) and rows fetched."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.round_trips = 0
+        self.rows = 0
+
+    def execute(self, *args, **kwargs):
+        self.round_trips += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.round_trips += 1
+        return self._cursor.executemany(*args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self.rows += 1
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self.rows += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def timed(fn, *args, **kwargs):
+    """Run ``fn`` once and return ``(result, seconds)``."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(r, widths)))
@@ -0,0 +1,116 @@
+"""End-to-end data cost of one cold load of each dashboard.
+
+Replays the repository calls each page makes on a first visit (empty
+caches, first page of every listing) and reports statements sent, wall
+time, rows transferred and peak Python memory. Load data at the scale you
+want to measure first:
+
+    python -m benchmarks.generate_data --students 100000
+    python -m benchmarks.dashboards --repeat 5
+"""
+import argparse
+import tracemalloc
+
+from benchmarks.common import CountingCursor, print_table, timed
+from db import get_connection
+from matching import rank_students_for_projects
+from repository import (
+    get_applicants_by_project, get_distinct_values, get_faculty, get_faculty_project_counts,
+    get_platform_stats, get_project_skill_ids, get_projects_for_student_by_ids, get_skills,
+    get_student, get_student_application_counts, get_student_applications, get_student_skill_ids,
+    list_faculty, list_faculty_projects, list_projects, list_recruiting_projects, list_students,
+)
+from search import fulltext_search
+from skill_index import get_skill_index
+
+
+def student_dashboard(cursor, student_id):
+    get_student(cursor, student_id)
+    get_skills(cursor)
+    get_student_skill_ids(cursor, student_id)
+    get_student_applications(cursor, student_id)
+    index = get_skill_index()
+    if index is not None:
+        recommended = index.recommend_projects(student_id)
+        get_projects_for_student_by_ids(cursor, student_id, [pid for pid, _ in recommended])
+    get_distinct_values(cursor, "Faculty", "department")
+    list_recruiting_projects(cursor)
+
+
+def student_search(cursor, student_id):
+    fulltext_search(cursor, student_id, "machine learning")
+
+
+def faculty_dashboard(cursor, faculty_id):
+    get_faculty(cursor, faculty_id)
+    projects = list_faculty_projects(cursor, faculty_id).rows
+    project_ids = [p["project_id"] for p in projects]
+    get_applicants_by_project(cursor, faculty_id, project_ids)
+    get_project_skill_ids(cursor, project_ids)
+    get_skills(cursor)
+    rank_students_for_projects(cursor, [p["project_id"] for p in projects if p["status"] == "Recruiting"])
+
+
+def admin_dashboard(cursor, _):
+    get_platform_stats(cursor)
+    get_distinct_values(cursor, "Faculty", "department")
+    faculty = list_faculty(cursor).rows
+    get_faculty_project_counts(cursor, [f["faculty_id"] for f in faculty])
+    get_distinct_values(cursor, "Students", "major")
+    students = list_students(cursor).rows
+    get_student_application_counts(cursor, [s["student_id"] for s in students])
+    list_projects(cursor)
+
+
+def busiest(cursor, sql):
+    """Id of the most active user, so the measured load is the worst case."""
+    cursor.execute(sql)
+    row = cursor.fetchone()
+    return next(iter(row.values())) if row else None
+
+
+def measure(cursor, fn, user_id):
+    counting = CountingCursor(cursor)
+    tracemalloc.start()
+    try:
+        _, secs = timed(fn, counting, user_id)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return counting.round_trips, counting.rows, secs, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page; the median is reported")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor(dictionary=True)
+    student_id = busiest(cursor, "SELECT student_id FROM Applications GROUP BY student_id ORDER BY COUNT(*) DESC LIMIT 1")
+    faculty_id = busiest(cursor, "SELECT faculty_id FROM Research_Projects GROUP BY faculty_id ORDER BY COUNT(*) DESC LIMIT 1")
+    cursor.execute("SELECT COUNT(*) AS n FROM Students")
+    n_students = cursor.fetchone()["n"]
+    get_skill_index()  # built once per process; not part of a page load
+
+    pages = (
+        ("Student Dashboard", student_dashboard, student_id),
+        ("Student search", student_search, student_id),
+        ("Faculty Dashboard", faculty_dashboard, faculty_id),
+        ("Admin Dashboard", admin_dashboard, None),
+    )
+    rows = []
+    try:
+        for label, fn, user_id in pages:
+            runs = sorted((measure(cursor, fn, user_id) for _ in range(args.repeat)), key=lambda r: r[2])
+            queries, fetched, secs, peak = runs[len(runs) // 2]
+            rows.append((label, queries, fetched, f"{secs * 1000:.1f}", f"{peak / 1024:.0f}"))
+    finally:
+        conn.close()
+
+    print(f"{n_students:,} students")
+    print_table(("page", "queries", "rows", "ms", "peak_kib"), rows)
+
+
+if __name__ == "__main__":
+    main()
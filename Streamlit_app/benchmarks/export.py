@@ -0,0 +1,112 @@
+"""Export throughput and memory: buffered fetchall vs the streaming exporter.
+
+Each configuration runs in a fresh child process, so its peak RSS is its own.
+The buffered baseline loads the whole result into Python lists before
+writing any CSV, the way the dashboard expanders read tables. The streaming
+runs go through ``export.export`` at several chunk sizes. Output is discarded;
+time to first byte is when the first block reached the sink. Load volume
+first, e.g. ``python -m benchmarks.generate_data --students 100000``.
+
+    python -m benchmarks.export --dataset applications
+    python -m benchmarks.export --dataset students --formats csv xlsx --chunks 1000 20000
+"""
+import argparse
+import csv
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import export
+from benchmarks.common import print_table
+from db import get_connection
+
+
+class NullSink(io.RawIOBase):
+    """Binary file that discards its input, noting bytes written and when the first byte arrived."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_byte = None
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self.first_byte is None and data:
+            self.first_byte = time.perf_counter() - self.started
+        self.bytes += len(data)
+        return len(data)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)  # bytes on macOS, KiB elsewhere
+
+
+def buffered(sink, dataset):
+    sql, params = export.build_query(dataset)
+    conn = get_connection()
+    try:
+        cursor = conn.cursor(buffered=True)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(export.headers(dataset))
+    writer.writerows(rows)
+    sink.write(text.getvalue().encode())
+    return len(rows)
+
+
+def run_child(mode, dataset, fmt, chunk_size):
+    baseline_mb = peak_rss_mb()
+    sink = NullSink()
+    if mode == "buffered":
+        rows = buffered(sink, dataset)
+    else:
+        rows = export.export(sink, dataset, fmt=fmt, chunk_size=chunk_size)
+    seconds = time.perf_counter() - sink.started
+    print(json.dumps({
+        "rows": rows, "seconds": seconds, "first_byte": sink.first_byte, "bytes": sink.bytes,
+        "peak_rss_mb": peak_rss_mb(), "baseline_rss_mb": baseline_mb,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", choices=sorted(export.DATASETS), default="applications")
+    parser.add_argument("--formats", nargs="+", choices=sorted(export.FORMATS), default=["csv"])
+    parser.add_argument("--chunks", nargs="+", type=int, default=[1000, 5000, 20000])
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "FORMAT", "CHUNK"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, fmt, chunk = args.child
+        return run_child(mode, args.dataset, fmt, int(chunk))
+
+    configs = [("buffered", "csv", 0)] + [("stream", fmt, chunk) for fmt in args.formats for chunk in args.chunks]
+    table = []
+    for mode, fmt, chunk in configs:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.export", "--dataset", args.dataset,
+             "--child", mode, fmt, str(chunk)],
+            capture_output=True, text=True, check=True,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        table.append((
+            mode, fmt, chunk or "-", r["rows"], f"{r['rows'] / r['seconds']:,.0f}",
+            f"{r['first_byte'] * 1000:.0f}" if r["first_byte"] is not None else "-",
+            f"{r['bytes'] / 2**20:.1f}", f"{r['peak_rss_mb']:.0f}", f"{r['peak_rss_mb'] - r['baseline_rss_mb']:.0f}",
+        ))
+    print_table(("mode", "format", "chunk", "rows", "rows/s", "first_byte_ms", "out_MB", "peak_rss_MB", "growth_MB"),
+                table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Cost of one click on a Faculty Dashboard card: full-page rerun vs fragment rerun.
+
+Seeds a faculty account with ``--projects`` recruiting projects, each with
+required skills and ``--applicants`` Pending applications from students who
+share some of those skills. It then replays the reads each kind of click
+triggers on that account:
+
+* before: the click reruns the whole page and ``st.rerun()`` reruns it again,
+  so every card on the page, its applicants, skills and candidates, plus
+  the bulk-review list are loaded twice;
+* after: the card is an ``st.fragment`` and reloads only its own row,
+  applicants, skills and candidates.
+
+The write itself (accept, reject, status change) is the same on both paths
+and is left out. CPU is this process's time (``time.process_time``) spent
+running the queries and decoding rows. Streamlit's own work to render the
+elements is not measured; it also grows with the number of cards redrawn.
+Seed rows are committed and deleted at the end.
+
+    python -m benchmarks.fragments --projects 500 --page-sizes 20 100 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.common import CountingCursor, print_table
+from db import get_connection
+from matching import rank_students_for_projects
+from repository import (
+    get_applicants_by_project, get_faculty_project, get_pending_applicants, get_project_skill_ids,
+    list_faculty_projects,
+)
+
+DOMAIN = "bench-fragments.edu"
+TITLE = "Bench fragment project"
+
+
+def seed(cursor, conn, projects, applicants, seed_value=11):
+    rng = random.Random(seed_value)
+    cursor.execute("SELECT skill_id FROM Skills")
+    skill_ids = [row[0] for row in cursor.fetchall()]
+    if not skill_ids:
+        raise SystemExit("No skills in the database; load Database.sql first.")
+
+    cursor.execute(
+        "INSERT INTO Faculty (first_name, last_name, department, email, password) "
+        "VALUES ('Bench', 'Fragments', 'Benchmarks', %s, 'x')", (f"faculty@{DOMAIN}",),
+    )
+    faculty_id = cursor.lastrowid
+    cursor.execute(
+        "INSERT INTO Research_Projects (title, description, status, max_students, faculty_id) VALUES "
+        + ", ".join(["(%s, 'Fragment benchmark', 'Recruiting', 5, %s)"] * projects),
+        [v for i in range(projects) for v in (f"{TITLE} {i}", faculty_id)],
+    )
+    cursor.execute(
+        "INSERT INTO Students (first_name, last_name, email, password, major, gpa) VALUES "
+        + ", ".join(["('Bench', %s, %s, 'x', 'Computer Science', 3.5)"] * applicants),
+        [v for i in range(applicants) for v in (f"Applicant{i}", f"a{i}@{DOMAIN}")],
+    )
+    cursor.execute("SELECT project_id FROM Research_Projects WHERE faculty_id = %s", (faculty_id,))
+    project_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT student_id FROM Students WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    student_ids = [row[0] for row in cursor.fetchall()]
+
+    pick = min(3, len(skill_ids))
+    cursor.executemany("INSERT INTO Project_Skills (project_id, skill_id) VALUES (%s, %s)",
+                       [(pid, sid) for pid in project_ids for sid in rng.sample(skill_ids, pick)])
+    cursor.executemany("INSERT INTO Student_Skills (student_id, skill_id) VALUES (%s, %s)",
+                       [(sid, skill) for sid in student_ids for skill in rng.sample(skill_ids, pick)])
+    cursor.execute("""
+        INSERT INTO Applications (status, student_id, project_id)
+        SELECT 'Pending', s.student_id, p.project_id
+        FROM Students s CROSS JOIN Research_Projects p
+        WHERE s.email LIKE %s AND p.faculty_id = %s
+    """, (f"%@{DOMAIN}", faculty_id))
+    conn.commit()
+    return faculty_id, project_ids
+
+
+def cleanup(cursor, conn):
+    cursor.execute("""
+        DELETE l FROM Application_Logs l JOIN Research_Projects p ON p.project_id = l.project_id
+        WHERE p.title LIKE %s
+    """, (f"{TITLE} %",))
+    cursor.execute("DELETE FROM Students WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    cursor.execute("DELETE FROM Research_Projects WHERE title LIKE %s", (f"{TITLE} %",))
+    cursor.execute("DELETE FROM Faculty WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    conn.commit()
+
+
+def full_run(cursor, faculty_id, page_size):
+    """Reads of one whole Faculty Dashboard run (profile and skill list come from the caches)."""
+    projects = list_faculty_projects(cursor, faculty_id, limit=page_size).rows
+    project_ids = [p["project_id"] for p in projects]
+    get_applicants_by_project(cursor, faculty_id, project_ids)
+    get_project_skill_ids(cursor, project_ids)
+    rank_students_for_projects(cursor, [p["project_id"] for p in projects if p["status"] == "Recruiting"])
+    get_pending_applicants(cursor, faculty_id)
+
+
+def click_before(cursor, faculty_id, page_size, project_id):
+    full_run(cursor, faculty_id, page_size)  # the run that handles the click
+    full_run(cursor, faculty_id, page_size)  # st.rerun()
+
+
+def click_after(cursor, faculty_id, page_size, project_id):
+    proj = get_faculty_project(cursor, faculty_id, project_id)
+    get_applicants_by_project(cursor, faculty_id, [project_id])
+    get_project_skill_ids(cursor, [project_id])
+    if proj["status"] == "Recruiting":
+        rank_students_for_projects(cursor, [project_id])
+
+
+def measure(cursor, fn, faculty_id, page_size, project_ids, clicks):
+    """Median statements, rows, wall ms and CPU ms per click over ``clicks`` cards."""
+    samples = []
+    for project_id in project_ids[:clicks]:
+        counting = CountingCursor(cursor)
+        cpu, wall = time.process_time(), time.perf_counter()
+        fn(counting, faculty_id, page_size, project_id)
+        samples.append((counting.round_trips, counting.rows,
+                        (time.perf_counter() - wall) * 1000, (time.process_time() - cpu) * 1000))
+    return [statistics.median(column) for column in zip(*samples)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--applicants", type=int, default=10, help="Pending applications per project")
+    parser.add_argument("--page-sizes", nargs="+", type=int, default=[20, 100, 500],
+                        help="projects shown per dashboard page")
+    parser.add_argument("--clicks", type=int, default=20, help="cards clicked per configuration")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor(dictionary=True)
+    table = []
+    try:
+        faculty_id, project_ids = seed(conn.cursor(), conn, args.projects, args.applicants)
+        for page_size in args.page_sizes:
+            for label, fn in (("full rerun", click_before), ("fragment", click_after)):
+                queries, rows, wall, cpu = measure(cursor, fn, faculty_id, page_size, project_ids, args.clicks)
+                table.append((page_size, label, f"{queries:.0f}", f"{rows:.0f}", f"{wall:.1f}", f"{cpu:.1f}"))
+    finally:
+        cleanup(conn.cursor(), conn)
+        conn.close()
+
+    print(f"{args.projects} projects x {args.applicants} applicants")
+    print_table(("page_size", "click", "queries", "rows", "ms", "cpu_ms"), table)
+
+
+if __name__ == "__main__":
+    main()
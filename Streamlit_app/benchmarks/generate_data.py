@@ -0,0 +1,165 @@
+"""Seeded, reproducible synthetic data for the researchhub schema.
+
+Bulk-loads Skills, Faculty, Students, Research_Projects, Project_Skills,
+Student_Skills, Applications and Project_Members using multi-row INSERTs,
+committing every batch. Everything generated uses the ``@synthetic.edu``
+email domain so it can be removed again with ``--clear`` (FK cascades take
+the dependent rows with it, and their Application_Logs entries are deleted
+explicitly).
+
+    python -m benchmarks.generate_data --students 100000
+    python -m benchmarks.generate_data --clear
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import bcrypt
+
+from config import BCRYPT_ROUNDS
+from db import get_connection
+
+DOMAIN = "synthetic.edu"
+PASSWORD = "password123"
+FIRST_NAMES = "Ava Ben Chen Dara Eli Fatima Gabe Hana Ivan Jia Kofi Lena Mateo Nia Omar Priya Quinn Rosa Sami Tara".split()
+LAST_NAMES = "Adams Baker Cruz Diaz Evans Fischer Gupta Huang Ito Jones Khan Lopez Murphy Nguyen Okafor Patel Rossi Singh Tanaka Wang".split()
+DEPARTMENTS = ["Computer Science", "Biotechnology", "Mechanical Engineering", "Physics", "Chemistry",
+               "Mathematics", "Electrical Engineering", "Economics", "Psychology", "Environmental Science"]
+CATEGORIES = ["Programming", "AI", "Analytical", "Engineering", "Biology", "Chemistry", "Design", "Writing"]
+TOPICS = ("machine learning genomics robotics protein climate quantum sensor imaging language vision graph "
+          "microscopy battery polymer drone satellite ecology statistics privacy compiler vaccine enzyme").split()
+APPLICATION_STATUSES = (["Pending"] * 12 + ["Accepted"] * 3 + ["Rejected"] * 4 + ["Withdrawn"])
+
+
+def bulk_insert(cursor, conn, table, columns, rows, batch):
+    """Multi-row INSERT of ``rows`` in chunks of ``batch``, committing each chunk."""
+    prefix = f"INSERT IGNORE INTO {table} ({', '.join(columns)}) VALUES "
+    group = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    for start in range(0, len(rows), batch):
+        chunk = rows[start:start + batch]
+        cursor.execute(prefix + ", ".join([group] * len(chunk)), [v for row in chunk for v in row])
+        conn.commit()
+
+
+def ids_for(cursor, table, id_col):
+    cursor.execute(f"SELECT {id_col} FROM {table} WHERE email LIKE %s ORDER BY {id_col}", (f"%@{DOMAIN}",))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def generate(conn, students, seed=42, batch=2000):
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+    now = datetime.now().replace(microsecond=0)
+
+    def created():
+        return now - timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600))
+
+    n_faculty = max(10, students // 50)
+    n_projects = n_faculty * 3
+    counts = {}
+
+    bulk_insert(cursor, conn, "Skills", ["skill_name", "category"],
+                [(f"Synthetic skill {i:03d}", CATEGORIES[i % len(CATEGORIES)]) for i in range(60)], batch)
+    cursor.execute("SELECT skill_id FROM Skills")
+    skill_ids = [row[0] for row in cursor.fetchall()]
+
+    bulk_insert(cursor, conn, "Faculty",
+                ["first_name", "last_name", "department", "research_areas", "email", "password", "created_at"],
+                [(rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(DEPARTMENTS),
+                  ", ".join(rng.sample(TOPICS, 3)), f"f{i}.s{seed}@{DOMAIN}", hashed, created())
+                 for i in range(n_faculty)], batch)
+    faculty_ids = ids_for(cursor, "Faculty", "faculty_id")
+    counts["Faculty"] = len(faculty_ids)
+
+    bulk_insert(cursor, conn, "Students",
+                ["first_name", "last_name", "major", "gpa", "year_level", "research_interests",
+                 "email", "password", "created_at"],
+                [(rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(DEPARTMENTS),
+                  round(rng.uniform(2.0, 4.0), 2), rng.randint(1, 4), ", ".join(rng.sample(TOPICS, 2)),
+                  f"s{i}.s{seed}@{DOMAIN}", hashed, created())
+                 for i in range(students)], batch)
+    student_ids = ids_for(cursor, "Students", "student_id")
+    counts["Students"] = len(student_ids)
+
+    project_rows = []
+    for i in range(n_projects):
+        topic = rng.sample(TOPICS, 2)
+        project_rows.append((
+            f"{topic[0].title()} {topic[1]} study #{i}",
+            f"Synthetic project on {topic[0]} and {topic[1]}. " + " ".join(rng.choices(TOPICS, k=40)),
+            rng.choices(["Recruiting", "In Progress", "Completed", "Cancelled"], [6, 2, 1, 1])[0],
+            rng.randint(1, 20), rng.choice(faculty_ids), created(),
+        ))
+    bulk_insert(cursor, conn, "Research_Projects",
+                ["title", "description", "status", "max_students", "faculty_id", "created_at"], project_rows, batch)
+    placeholders = ", ".join(["%s"] * len(faculty_ids))
+    cursor.execute(f"SELECT project_id FROM Research_Projects WHERE faculty_id IN ({placeholders})", faculty_ids)
+    project_ids = [row[0] for row in cursor.fetchall()]
+    counts["Research_Projects"] = len(project_ids)
+
+    project_skills = [(pid, sid) for pid in project_ids for sid in rng.sample(skill_ids, rng.randint(2, 5))]
+    bulk_insert(cursor, conn, "Project_Skills", ["project_id", "skill_id"], project_skills, batch)
+    counts["Project_Skills"] = len(project_skills)
+
+    student_skills = [(sid, skill) for sid in student_ids for skill in rng.sample(skill_ids, rng.randint(1, 8))]
+    bulk_insert(cursor, conn, "Student_Skills", ["student_id", "skill_id"], student_skills, batch)
+    counts["Student_Skills"] = len(student_skills)
+
+    applications, members = [], []
+    for sid in student_ids:
+        for pid in rng.sample(project_ids, min(len(project_ids), rng.randint(0, 6))):
+            status = rng.choice(APPLICATION_STATUSES)
+            applications.append((status, "Synthetic cover letter.", sid, pid, created()))
+            if status == "Accepted":
+                members.append((pid, sid))
+    bulk_insert(cursor, conn, "Applications",
+                ["status", "cover_letter", "student_id", "project_id", "applied_at"], applications, batch)
+    bulk_insert(cursor, conn, "Project_Members", ["project_id", "student_id"], members, batch)
+    counts["Applications"] = len(applications)
+    counts["Project_Members"] = len(members)
+    return counts
+
+
+def clear(conn):
+    cursor = conn.cursor()
+    # Application_Logs has no FK (it is partitioned), so its entries go first;
+    # deleting the owners cascades to projects, skills, applications and members
+    cursor.execute("""
+        DELETE l FROM Application_Logs l JOIN Students s ON s.student_id = l.student_id
+        WHERE s.email LIKE %s
+    """, (f"%@{DOMAIN}",))
+    cursor.execute("DELETE FROM Faculty WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    cursor.execute("DELETE FROM Students WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    cursor.execute("DELETE FROM Skills WHERE skill_name LIKE 'Synthetic skill %'")
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=10000, help="e.g. 10000, 100000, 1000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=2000, help="rows per multi-row INSERT")
+    parser.add_argument("--clear", action="store_true", help="remove previously generated data and exit")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.clear:
+            clear(conn)
+            print("Synthetic data removed.")
+            return
+        start = time.perf_counter()
+        counts = generate(conn, args.students, args.seed, args.batch)
+        elapsed = time.perf_counter() - start
+    finally:
+        conn.close()
+
+    for table, count in counts.items():
+        print(f"{table:<18} {count:>10,}")
+    print(f"Loaded in {elapsed:.1f}s (login with any s<N>.s{args.seed}@{DOMAIN} / {PASSWORD})")
+
+
+if __name__ == "__main__":
+    main()
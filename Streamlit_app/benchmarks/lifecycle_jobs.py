@@ -0,0 +1,161 @@
+"""Project completion in the request vs achievements from the background job.
+
+Seeds a faculty account with ``--projects`` In Progress projects, each with
+``--members`` accepted members. It also seeds ``--full`` Recruiting projects
+that are already at capacity and ``--stale`` Pending applications made 90
+days ago. Then:
+
+1. request path: each project is marked Completed in its own request. For
+   half of them the request also awards the achievements, as
+   ``trg_award_on_complete`` used to. For the other half it only updates
+   the status, as now. Latency percentiles are reported per path;
+2. jobs: every job in ``jobs.py`` runs as a dry run, then for real, then a
+   second time, with ``--chunk-size``. The second run should change
+   nothing.
+
+The jobs act on the whole database, so run this against a scratch copy.
+Seed rows are committed and deleted at the end; runs are not recorded in
+Job_Runs.
+
+    python -m benchmarks.lifecycle_jobs --projects 2000 --members 5 --chunk-size 500
+"""
+import argparse
+import time
+
+import jobs
+from benchmarks.common import print_table
+from config import JOB_CHUNK_SIZE
+from db import get_connection
+
+DOMAIN = "bench-jobs.edu"
+TITLE = "Bench jobs project"
+
+
+def seed(conn, projects, members, full, stale):
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO Faculty (first_name, last_name, department, email, password) "
+        "VALUES ('Bench', 'Jobs', 'Benchmarks', %s, 'x')", (f"faculty@{DOMAIN}",),
+    )
+    faculty_id = cursor.lastrowid
+    rows = [(f"{TITLE} {i}", "In Progress", members, faculty_id) for i in range(projects)]
+    rows += [(f"{TITLE} full {i}", "Recruiting", members, faculty_id) for i in range(full)]
+    cursor.executemany(
+        "INSERT INTO Research_Projects (title, description, status, max_students, faculty_id) "
+        "VALUES (%s, 'Lifecycle jobs benchmark', %s, %s, %s)", rows,
+    )
+    cursor.executemany(
+        "INSERT INTO Students (first_name, last_name, email, password) VALUES ('Bench', %s, %s, 'x')",
+        [(f"Member{i}", f"m{i}@{DOMAIN}") for i in range(members)]
+        + [(f"Stale{i}", f"s{i}@{DOMAIN}") for i in range(stale)],
+    )
+    cursor.execute("""
+        INSERT INTO Applications (status, student_id, project_id, reviewed_at)
+        SELECT 'Accepted', s.student_id, p.project_id, NOW()
+        FROM Students s CROSS JOIN Research_Projects p
+        WHERE s.email LIKE %s AND p.faculty_id = %s
+    """, (f"m%@{DOMAIN}", faculty_id))
+    cursor.execute("""
+        INSERT INTO Project_Members (project_id, student_id)
+        SELECT a.project_id, a.student_id
+        FROM Applications a JOIN Research_Projects p ON p.project_id = a.project_id
+        WHERE p.faculty_id = %s
+    """, (faculty_id,))
+    cursor.execute("""
+        INSERT INTO Applications (status, student_id, project_id, applied_at)
+        SELECT 'Pending', s.student_id, p.project_id, NOW() - INTERVAL 90 DAY
+        FROM Students s
+        JOIN Research_Projects p ON p.faculty_id = %s AND p.title = %s
+        WHERE s.email LIKE %s
+    """, (faculty_id, f"{TITLE} 0", f"s%@{DOMAIN}"))
+    conn.commit()
+    cursor.execute("SELECT project_id FROM Research_Projects WHERE faculty_id = %s AND status = 'In Progress' "
+                   "ORDER BY project_id", (faculty_id,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def cleanup(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        DELETE l FROM Application_Logs l JOIN Research_Projects p ON p.project_id = l.project_id
+        WHERE p.title LIKE %s
+    """, (f"{TITLE} %",))
+    cursor.execute("DELETE FROM Students WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    cursor.execute("DELETE FROM Research_Projects WHERE title LIKE %s", (f"{TITLE} %",))
+    cursor.execute("DELETE FROM Faculty WHERE email LIKE %s", (f"%@{DOMAIN}",))
+    conn.commit()
+
+
+def complete_with_awards(cursor, project_id):
+    """What the "Update" request did with the trigger in place."""
+    cursor.execute("UPDATE Research_Projects SET status = 'Completed' WHERE project_id = %s", (project_id,))
+    cursor.execute("""
+        INSERT IGNORE INTO Student_Achievements (student_id, project_id, title, awarded_on)
+        SELECT a.student_id, p.project_id, CONCAT('Completed: ', p.title), NOW()
+        FROM Research_Projects p JOIN Applications a ON a.project_id = p.project_id AND a.status = 'Accepted'
+        WHERE p.project_id = %s
+    """, (project_id,))
+    return cursor.rowcount
+
+
+def complete_only(cursor, project_id):
+    cursor.execute("UPDATE Research_Projects SET status = 'Completed' WHERE project_id = %s", (project_id,))
+    return 0
+
+
+def time_requests(conn, fn, project_ids):
+    cursor = conn.cursor()
+    latencies, awarded = [], 0
+    for project_id in project_ids:
+        started = time.perf_counter()
+        awarded += fn(cursor, project_id)
+        conn.commit()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+    return pct(50), pct(99), awarded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=5, help="accepted members per project")
+    parser.add_argument("--full", type=int, default=200, help="Recruiting projects already at capacity")
+    parser.add_argument("--stale", type=int, default=2000, help="Pending applications made 90 days ago")
+    parser.add_argument("--chunk-size", type=int, default=JOB_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    request_rows, job_rows = [], []
+    try:
+        project_ids = seed(conn, args.projects, args.members, args.full, args.stale)
+        half = len(project_ids) // 2
+        for label, fn, ids in (("status + awards (trigger)", complete_with_awards, project_ids[:half]),
+                               ("status only (now)", complete_only, project_ids[half:])):
+            p50, p99, awarded = time_requests(conn, fn, ids)
+            request_rows.append((label, len(ids), f"{p50:.2f}", f"{p99:.2f}", awarded))
+
+        for name in jobs.JOBS:
+            for mode, dry_run in (("dry run", True), ("run", False), ("rerun", False)):
+                entry = jobs.run_job(name, conn, args.chunk_size, dry_run)
+                if entry["error"]:
+                    raise SystemExit(f"{name} failed: {entry['error']}")
+                rate = entry["rows"] / entry["seconds"] if entry["seconds"] else 0
+                job_rows.append((name, mode, entry["rows"], entry["chunks"], f"{entry['seconds']:.3f}", f"{rate:,.0f}"))
+    finally:
+        cleanup(conn)
+        conn.close()
+
+    print(f"{args.projects} projects x {args.members} members, {args.full} full, {args.stale} stale, "
+          f"chunk size {args.chunk_size}")
+    print("\n1. completing a project, one request each")
+    print_table(("path", "requests", "p50 ms", "p99 ms", "awarded in request"), request_rows)
+    print("\n2. background jobs")
+    print_table(("job", "mode", "rows", "chunks", "seconds", "rows/s"), job_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Login load test: inline bcrypt + fresh connection vs the pooled auth service.
+
+Seeds --users bench students (committed, removed again at the end), then
+fires --attempts logins from --concurrency threads, a quarter of them for
+unknown emails, and reports logins/sec and latency percentiles.
+
+    python -m benchmarks.login --concurrency 32 --attempts 400
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+import mysql.connector
+
+import auth
+from benchmarks.common import print_table
+from config import BCRYPT_ROUNDS, DB_CONFIG
+from db import get_connection
+
+PASSWORD = "bench-password"
+EMAIL = "bench.login.{}@bench.local"
+
+
+def inline_login(email, password):
+    """The original path: new connection per attempt, bcrypt on the caller's thread."""
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM Students WHERE email=%s", (email,))
+        user = cursor.fetchone()
+    finally:
+        conn.close()
+    if user and bcrypt.checkpw(password.encode(), user["password"].encode()):
+        return user
+    return None
+
+
+def service_login(email, password):
+    return auth.authenticate(email, password)
+
+
+def run(login, emails, concurrency):
+    latencies = []
+
+    def attempt(email):
+        start = time.perf_counter()
+        login(email, PASSWORD)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(attempt, emails))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+    return len(emails) / elapsed, pct(50), pct(99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--attempts", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT INTO Students (first_name, last_name, email, password) VALUES (%s, %s, %s, %s)",
+        [("Bench", f"Login{i}", EMAIL.format(i), hashed) for i in range(args.users)],
+    )
+    conn.commit()
+    try:
+        # 3 in 4 attempts hit a real account, the rest an unknown email
+        emails = [EMAIL.format(rng.randrange(args.users)) if rng.random() < 0.75 else f"nobody{i}@bench.local"
+                  for i in range(args.attempts)]
+        rows = []
+        for label, login in (("inline", inline_login), ("auth service", service_login)):
+            per_sec, p50, p99 = run(login, emails, args.concurrency)
+            rows.append((label, f"{per_sec:.1f}", f"{p50:.0f}", f"{p99:.0f}"))
+    finally:
+        cursor.execute("DELETE FROM Students WHERE email LIKE 'bench.login.%%'")
+        conn.commit()
+        conn.close()
+
+    print(f"bcrypt rounds={BCRYPT_ROUNDS}, concurrency={args.concurrency}, attempts={args.attempts}")
+    print_table(("path", "logins/s", "p50 ms", "p99 ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Old correlated-subquery MatchStudentsToProject vs the grouped-join ranking.
+
+Seeds a synthetic student body (default 50k) with random skills inside a
+transaction that is rolled back afterwards, then times:
+  * the original procedure body (two correlated COUNT(*) per student),
+  * the grouped-join ranking for one project (full list and top-K),
+  * batch mode: top-K for every recruiting project in one query.
+
+    python -m benchmarks.matching --students 50000
+"""
+import argparse
+import random
+
+from benchmarks.common import print_table, timed
+from db import get_connection
+from matching import rank_students_for_project, rank_students_for_projects
+
+OLD_MATCH_SQL = """
+    SELECT s.student_id, s.first_name, s.last_name,
+           (
+              SELECT COUNT(*)
+              FROM Student_Skills ss
+              JOIN Project_Skills ps ON ss.skill_id = ps.skill_id
+              WHERE ss.student_id = s.student_id AND ps.project_id = %s
+           ) AS match_score
+    FROM Students s
+    WHERE (
+        SELECT COUNT(*)
+        FROM Student_Skills ss
+        JOIN Project_Skills ps ON ss.skill_id = ps.skill_id
+        WHERE ss.student_id = s.student_id AND ps.project_id = %s
+    ) > 0
+    ORDER BY match_score DESC
+"""
+
+
+def seed_students(cursor, count, rng, batch=5000):
+    cursor.execute("SELECT skill_id FROM Skills")
+    skill_ids = [row["skill_id"] for row in cursor.fetchall()]
+    for start in range(0, count, batch):
+        cursor.executemany(
+            "INSERT INTO Students (first_name, last_name, major, gpa, year_level, email, password) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            [("Bench", f"Student{i}", "Computer Science", round(rng.uniform(2, 4), 2),
+              rng.randint(1, 4), f"bench.match.{i}@bench.local", "x")
+             for i in range(start, min(start + batch, count))],
+        )
+    cursor.execute("SELECT student_id FROM Students WHERE email LIKE 'bench.match.%%'")
+    student_ids = [row["student_id"] for row in cursor.fetchall()]
+    pairs = [(sid, skill) for sid in student_ids
+             for skill in rng.sample(skill_ids, rng.randint(1, min(5, len(skill_ids))))]
+    for start in range(0, len(pairs), batch):
+        cursor.executemany("INSERT INTO Student_Skills (student_id, skill_id) VALUES (%s, %s)",
+                           pairs[start:start + batch])
+
+
+def best_of(repeats, fn, *args):
+    best = None
+    for _ in range(repeats):
+        result, secs = timed(fn, *args)
+        best = secs if best is None else min(best, secs)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        seed_students(cursor, args.students, random.Random(42))
+        cursor.execute("SELECT project_id FROM Research_Projects WHERE status = 'Recruiting'")
+        recruiting = [row["project_id"] for row in cursor.fetchall()]
+        project_id = recruiting[0]
+
+        def old(pid):
+            cursor.execute(OLD_MATCH_SQL, (pid, pid))
+            return cursor.fetchall()
+
+        def old_all():
+            return [old(pid) for pid in recruiting]
+
+        rows = []
+        result, secs = best_of(args.repeats, old, project_id)
+        rows.append(("old procedure, 1 project", len(result), f"{secs * 1000:.1f}"))
+        result, secs = best_of(args.repeats, rank_students_for_project, cursor, project_id, args.students)
+        rows.append(("grouped join, 1 project (all)", len(result), f"{secs * 1000:.1f}"))
+        result, secs = best_of(args.repeats, rank_students_for_project, cursor, project_id, args.top_k)
+        rows.append((f"grouped join, 1 project (top {args.top_k})", len(result), f"{secs * 1000:.1f}"))
+        result, secs = best_of(args.repeats, old_all)
+        rows.append((f"old procedure x {len(recruiting)} recruiting", sum(map(len, result)), f"{secs * 1000:.1f}"))
+        result, secs = best_of(args.repeats, rank_students_for_projects, cursor, recruiting, args.top_k)
+        rows.append((f"batch top {args.top_k}, {len(recruiting)} recruiting", sum(map(len, result.values())),
+                     f"{secs * 1000:.1f}"))
+    finally:
+        conn.rollback()
+        conn.close()
+
+    print(f"students seeded: {args.students}")
+    print_table(("strategy", "rows", "best ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
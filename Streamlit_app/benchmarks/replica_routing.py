@@ -0,0 +1,142 @@
+"""Read/write splitting: where reads land, and read throughput under concurrent writes.
+
+Point it at the primary (the usual ``DB_*`` variables) and one or more
+replicas. Any second MySQL/MariaDB instance with the same schema works as a
+stand-in: a server that is not replicating reports no lag and counts as
+current. Four checks run:
+
+1. routing: ``--reads`` checkouts from the router, counted per server
+   (``@@hostname:@@port``);
+2. read-your-writes: right after a commit, this thread's reads go to the primary;
+3. fallback: an unreachable replica (``127.0.0.1:1``) is added, and every
+   read still succeeds, from the primary or a live replica;
+4. throughput: ``--threads`` readers load the recruiting-projects grid while
+   one writer updates rows on the primary. The run is repeated with every read
+   on the primary and with reads routed.
+
+    python -m benchmarks.replica_routing --replica 127.0.0.1:3307
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import print_table
+from config import DB_CONFIG, REPLICA_CONFIGS, replica_config
+from db import ConnectionPool, ReplicaRouter, note_write
+from repos import ProjectRepo
+
+
+def server(pool):
+    conn = pool.acquire()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT CONCAT(@@hostname, ':', @@port)")
+        return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def routing(router, reads):
+    return Counter(server(router) for _ in range(reads))
+
+
+def read_after_write(router):
+    """Server of a read made right after a commit, on a thread of its own so the
+    stickiness does not carry over to the other checks."""
+    landed = []
+
+    def session():
+        note_write()
+        landed.append(server(router))
+
+    t = threading.Thread(target=session)
+    t.start()
+    t.join()
+    return landed[0]
+
+
+def writer(primary, stop, counter):
+    """Touch a project row in a loop, the way status changes and accepts do."""
+    conn = primary.acquire()
+    try:
+        cursor = conn.cursor()
+        while not stop.is_set():
+            cursor.execute("UPDATE Research_Projects SET updated_at = CURRENT_TIMESTAMP ORDER BY project_id LIMIT 1")
+            conn.commit()
+            counter["writes"] += 1
+    finally:
+        conn.close()
+
+
+def throughput(read_pool, primary, threads, seconds):
+    repo = ProjectRepo(read_pool)
+    stop = threading.Event()
+    counts = Counter()
+    lock = threading.Lock()
+
+    def reader():
+        done = 0
+        while not stop.is_set():
+            repo.list_recruiting()
+            done += 1
+        with lock:
+            counts["reads"] += done
+
+    workers = [threading.Thread(target=reader) for _ in range(threads)]
+    workers.append(threading.Thread(target=writer, args=(primary, stop, counts)))
+    for t in workers:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in workers:
+        t.join()
+    return counts["reads"] / seconds, counts["writes"] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replica", action="append", default=[], metavar="HOST[:PORT]",
+                        help="replica to route to (default: DB_REPLICAS)")
+    parser.add_argument("--reads", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    configs = [replica_config(r) for r in args.replica] or REPLICA_CONFIGS
+    if not configs:
+        parser.error("give --replica HOST[:PORT] or set DB_REPLICAS")
+
+    primary = ConnectionPool(size=args.threads + 2)
+    router = ReplicaRouter(primary, configs, size=args.threads + 1)
+    primary_name = server(primary)
+    print(f"primary {DB_CONFIG['host']}:{DB_CONFIG['port']} is {primary_name}")
+    try:
+        print("\n1. routing")
+        print_table(("server", "reads"), sorted(routing(router, args.reads).items()))
+
+        print("\n2. read-your-writes")
+        print(f"read right after a commit went to {read_after_write(router)} (primary: {primary_name})")
+
+        print("\n3. fallback with an unreachable replica")
+        with_dead = ReplicaRouter(primary, [replica_config("127.0.0.1:1")] + configs, retry_after=60)
+        started = time.perf_counter()
+        landed = routing(with_dead, args.reads)
+        print_table(("server", "reads"), sorted(landed.items()))
+        print(f"{sum(landed.values())}/{args.reads} reads served in {time.perf_counter() - started:.2f}s; "
+              f"metrics: { {k: v for k, v in with_dead.stats().items() if k != 'replicas'} }")
+        with_dead.close_all()
+
+        print(f"\n4. throughput, {args.threads} readers + 1 writer for {args.seconds:.0f}s")
+        rows = []
+        for label, pool in (("primary only", primary), ("routed", router)):
+            reads, writes = throughput(pool, primary, args.threads, args.seconds)
+            rows.append((label, f"{reads:,.0f}", f"{writes:,.0f}"))
+        print_table(("reads from", "reads/s", "writes/s"), rows)
+    finally:
+        router.close_all()
+        primary.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Project search latency at 100k projects: LIKE scan vs FULLTEXT vs in-memory BM25.
+
+Seeds --projects recruiting projects with synthetic titles/descriptions
+(committed, because InnoDB only indexes FULLTEXT on commit; removed again at
+the end), then times a fixed set of queries against each backend.
+
+    python -m benchmarks.search --projects 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.common import print_table
+from db import get_connection
+from search import InvertedIndex, fulltext_search
+
+VOCABULARY = (
+    "neural network genomics robotics protein climate quantum sensor imaging language vision "
+    "graph learning microscopy battery polymer drone satellite ecology statistics privacy "
+    "compiler blockchain vaccine enzyme fluid turbine wireless acoustic materials optimization"
+).split()
+QUERIES = ["neural network", "genomics", "quantum sensor imaging", "climate ecology", "compiler optimization",
+           "protein enzyme", "wireless drone", "privacy statistics"]
+TITLE = "Bench search project"
+
+
+def seed(cursor, conn, count, rng, batch=5000):
+    cursor.execute("SELECT faculty_id FROM Faculty LIMIT 1")
+    faculty_id = cursor.fetchone()[0]
+    for start in range(0, count, batch):
+        cursor.executemany(
+            "INSERT INTO Research_Projects (title, description, status, max_students, faculty_id) "
+            "VALUES (%s, %s, 'Recruiting', 5, %s)",
+            [(f"{TITLE} {' '.join(rng.sample(VOCABULARY, 3))}",
+              " ".join(rng.choices(VOCABULARY, k=60)), faculty_id)
+             for _ in range(start, min(start + batch, count))],
+        )
+        conn.commit()
+
+
+def like_search(cursor, query, limit):
+    clauses = " AND ".join(["(p.title LIKE %s OR p.description LIKE %s)"] * len(query.split()))
+    params = [f"%{word}%" for word in query.split() for _ in range(2)]
+    cursor.execute(f"""
+        SELECT p.project_id, p.title FROM Research_Projects p
+        WHERE p.status = 'Recruiting' AND {clauses}
+        LIMIT %s
+    """, (*params, limit))
+    return cursor.fetchall()
+
+
+def latency(fn):
+    samples = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    dict_cursor = conn.cursor(dictionary=True)
+    try:
+        seed(cursor, conn, args.projects, random.Random(42))
+        build_start = time.perf_counter()
+        index = InvertedIndex.load(cursor)
+        build_s = time.perf_counter() - build_start
+
+        rows = []
+        for label, fn in (
+            ("LIKE scan", lambda q: like_search(cursor, q, args.limit)),
+            ("FULLTEXT (1 query)", lambda q: fulltext_search(dict_cursor, 0, q, limit=args.limit)),
+            ("in-memory BM25", lambda q: index.search(q, limit=args.limit)),
+        ):
+            median_ms, max_ms = latency(fn)
+            rows.append((label, f"{median_ms:.1f}", f"{max_ms:.1f}"))
+    finally:
+        cursor.execute("DELETE FROM Research_Projects WHERE title LIKE %s", (TITLE + "%",))
+        conn.commit()
+        conn.close()
+
+    print(f"{args.projects} projects; in-memory index built in {build_s:.1f}s")
+    print_table(("backend", "median ms", "max ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Memory per signed-in session: the full user row in session state vs ``UserSession`` in a store.
+
+Builds ``--sessions`` logins three ways and measures the Python memory they
+hold (``tracemalloc``):
+
+* row: what ``app.py`` used to keep per session, i.e. the whole ``SELECT *``
+  Students row (bcrypt hash included) plus ``role`` and ``user_id``;
+* memory store: the signed token in session state plus a slotted
+  ``UserSession`` in ``sessions.MemoryStore``;
+* sqlite store: the signed token only; sessions live in a SQLite file, whose
+  size is reported too.
+
+It also times ``sessions.resolve`` (one lookup per page run) for each store.
+No database is needed.
+
+    python -m benchmarks.sessions --sessions 10000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+import sessions
+from benchmarks.common import print_table
+
+
+def student_row(i, rng):
+    """A row shaped like ``SELECT * FROM Students`` returns."""
+    return {
+        "student_id": i,
+        "first_name": f"First{i}",
+        "last_name": f"Last{i}",
+        "email": f"student{i}@university.edu",
+        "password": "$2b$12$" + "".join(rng.choices("abcdefghijklmnopqrstuvwxyz0123456789./", k=53)),
+        "major": rng.choice(["Computer Science", "Biotechnology", "Physics", "Mathematics"]),
+        "gpa": Decimal(f"{rng.uniform(2, 4):.2f}"),
+        "year_level": rng.randint(1, 4),
+        "research_interests": " ".join(rng.choices(["machine", "learning", "robotics", "genomics", "vision",
+                                                    "quantum", "materials", "climate", "data"], k=18)),
+        "admin_id": None,
+        "created_at": datetime(2025, 1, 1, 9, 30),
+        "updated_at": datetime(2025, 6, 1, 12, 0),
+    }
+
+
+def measured(build):
+    """``(result, bytes still allocated by build())``."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def time_lookups(tokens, store, lookups):
+    picks = random.Random(3).choices(tokens, k=lookups)
+    started = time.perf_counter()
+    for token in picks:
+        assert sessions.resolve(token, store) is not None
+    return (time.perf_counter() - started) / lookups * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+    n = args.sessions
+    rng = random.Random(7)
+    rows = [student_row(i, rng) for i in range(1, n + 1)]
+
+    def row_sessions():
+        # Each session held its own copy of the fetched row
+        rng = random.Random(7)
+        return [{"user": student_row(i, rng), "role": "student", "user_id": i} for i in range(1, n + 1)]
+
+    def store_sessions(store):
+        def build():
+            return [{"session_token": sessions.start(row["student_id"], "student",
+                                                     f"{row['first_name']} {row['last_name']}", store)}
+                    for row in rows]
+        return build
+
+    memory_store = sessions.MemoryStore(maxsize=n)
+    tmp = tempfile.mkdtemp()
+    sqlite_store = sessions.SQLiteStore(os.path.join(tmp, "sessions.db"))
+
+    table = []
+    _, row_bytes = measured(row_sessions)
+    table.append(("row in session state", f"{row_bytes / 2**20:.1f}", f"{row_bytes / n:,.0f}", "-", "-"))
+
+    states, mem_bytes = measured(store_sessions(memory_store))
+    mem_us = time_lookups([s["session_token"] for s in states], memory_store, args.lookups)
+    table.append(("memory store", f"{mem_bytes / 2**20:.1f}", f"{mem_bytes / n:,.0f}", "-", f"{mem_us:.1f}"))
+
+    states, sql_bytes = measured(store_sessions(sqlite_store))
+    sql_us = time_lookups([s["session_token"] for s in states], sqlite_store, args.lookups)
+    file_bytes = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+    assert sqlite_store.size() == n
+    table.append(("sqlite store", f"{sql_bytes / 2**20:.1f}", f"{sql_bytes / n:,.0f}",
+                  f"{file_bytes / 2**20:.1f}", f"{sql_us:.1f}"))
+
+    print(f"{n:,} sessions")
+    print_table(("model", "python_MB", "bytes/session", "file_MB", "lookup_us"), table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""In-process skill index at 100k students x 10k projects (no database needed).
+
+Builds a synthetic index from random skill assignments and reports build
+time, memory, per-query latency for both lookup directions, incremental
+update latency and all-pairs scoring throughput.
+
+    python -m benchmarks.skill_index --students 100000 --projects 10000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import print_table
+from skill_index import SkillIndex
+
+
+def random_pairs(rng, count, n_skills, lo, hi):
+    per_entity = rng.integers(lo, hi + 1, size=count)
+    ids = np.repeat(np.arange(1, count + 1), per_entity)
+    skills = rng.integers(1, n_skills + 1, size=len(ids))
+    return np.column_stack([ids, skills])
+
+
+def per_call_us(fn, ids):
+    start = time.perf_counter()
+    for i in ids:
+        fn(int(i))
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--pair-chunks", type=int, default=8, help="student chunks of 1024 to score against all projects")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    student_pairs = random_pairs(rng, args.students, args.skills, 1, 8)
+    project_pairs = random_pairs(rng, args.projects, args.skills, 2, 6)
+
+    start = time.perf_counter()
+    index = SkillIndex.from_pairs(range(1, args.skills + 1), student_pairs, project_pairs)
+    build_s = time.perf_counter() - start
+    bitset_mb = (index.students.bits.nbytes + index.projects.bits.nbytes) / 2**20
+
+    sample_students = rng.integers(1, args.students + 1, size=args.queries)
+    sample_projects = rng.integers(1, args.projects + 1, size=args.queries)
+    rows = [
+        ("build index", f"{build_s * 1000:.0f} ms"),
+        ("bitset memory", f"{bitset_mb:.1f} MiB"),
+        ("recommend_projects (top 10)", f"{per_call_us(lambda s: index.recommend_projects(s, 10), sample_students):.0f} us"),
+        ("best_students (top 10)", f"{per_call_us(lambda p: index.best_students(p, 10), sample_projects):.0f} us"),
+        ("update_student", f"{per_call_us(lambda s: index.update_student(s, [1, 2, 3]), sample_students):.1f} us"),
+    ]
+
+    start = time.perf_counter()
+    scored = 0
+    for chunk_no, (student_ids, scores) in enumerate(index.iter_pair_scores(chunk=1024)):
+        scored += scores.size
+        if chunk_no + 1 >= args.pair_chunks:
+            break
+    pair_s = time.perf_counter() - start
+    rows.append(("all-pairs scoring", f"{scored / pair_s / 1e6:.1f} M pairs/s"))
+    rows.append(("all-pairs projected total", f"{args.students * args.projects / (scored / pair_s):.1f} s"))
+
+    print(f"{args.students} students x {args.projects} projects, {args.skills} skills")
+    print_table(("operation", "result"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Round-trips per Student Dashboard grid load: per-project lookups vs the set-based grid.
+
+Seeds N extra recruiting projects inside a transaction that is rolled back,
+so it can be pointed at a development database without leaving rows behind.
+Strategies, each loading every recruiting project at once:
+
+* ``n+1``: the old grid, one "already applied?" query per project;
+* ``grid``: what the Student Dashboard does on a cold cache, the shared
+  recruiting page (``list_recruiting_projects``) plus the student's
+  applications, merged in Python;
+* ``grid, page cached``: the same with the recruiting page already in
+  ``shared_cache``, as for every student after the first.
+
+The run fails if the grid's round-trips change with the project count.
+
+    python -m benchmarks.student_projects
+"""
+from benchmarks.common import CountingCursor, print_table, timed
+from db import get_connection
+from repository import get_student_applications, list_recruiting_projects
+
+SCALES = (10, 100, 500, 1000)
+
+
+def load_n_plus_one(cursor, student_id, n):
+    cursor.execute("""
+        SELECT p.*, f.first_name, f.last_name, f.department
+        FROM Research_Projects p
+        JOIN Faculty f ON p.faculty_id = f.faculty_id
+        WHERE p.status='Recruiting'
+    """)
+    projects = cursor.fetchall()
+    for proj in projects:
+        cursor.execute("""
+            SELECT application_id FROM Applications
+            WHERE student_id=%s AND project_id=%s
+        """, (student_id, proj["project_id"]))
+        proj["application_id"] = (cursor.fetchone() or {}).get("application_id")
+    return projects
+
+
+def annotate(rows, applications):
+    applied = {a["project_id"]: a["application_id"] for a in applications}
+    return [dict(row, application_id=applied.get(row["project_id"])) for row in rows]
+
+
+def load_grid(cursor, student_id, n):
+    page = list_recruiting_projects(cursor, limit=n)
+    return annotate(page.rows, get_student_applications(cursor, student_id))
+
+
+def grid_with_cached_page(page):
+    def load(cursor, student_id, n):
+        return annotate(page.rows, get_student_applications(cursor, student_id))
+    return load
+
+
+def main():
+    conn = get_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT faculty_id FROM Faculty LIMIT 1")
+    faculty_id = cursor.fetchone()["faculty_id"]
+    cursor.execute("SELECT student_id FROM Students LIMIT 1")
+    student_id = cursor.fetchone()["student_id"]
+
+    rows = []
+    grid_trips = {}
+    seeded = 0
+    try:
+        for n in SCALES:
+            cursor.executemany(
+                "INSERT INTO Research_Projects (title, description, status, max_students, faculty_id) "
+                "VALUES (%s, %s, 'Recruiting', 5, %s)",
+                [(f"Bench project {i}", "Benchmark description " * 10, faculty_id)
+                 for i in range(seeded, n)],
+            )
+            seeded = n
+            # Every recruiting project on one page: the seeded ones plus those already there
+            cursor.execute("SELECT COUNT(*) AS n FROM Research_Projects WHERE status = 'Recruiting'")
+            total = cursor.fetchone()["n"]
+            cached_page = list_recruiting_projects(cursor, limit=total)
+
+            for label, fn in (("n+1", load_n_plus_one), ("grid", load_grid),
+                              ("grid, page cached", grid_with_cached_page(cached_page))):
+                counting = CountingCursor(cursor)
+                result, secs = timed(fn, counting, student_id, total)
+                rows.append((n, label, len(result), counting.round_trips, f"{secs * 1000:.1f}"))
+                if label != "n+1":
+                    grid_trips.setdefault(label, set()).add(counting.round_trips)
+    finally:
+        conn.rollback()
+        conn.close()
+
+    print_table(("seeded", "strategy", "projects", "round_trips", "ms"), rows)
+    grown = [label for label, trips in grid_trips.items() if len(trips) > 1]
+    if grown:
+        raise SystemExit(f"Round-trips per load grew with the project count for: {', '.join(grown)}")
+    print("\nGrid round-trips per load stay constant: "
+          + ", ".join(f"{label} = {trips.pop()}" for label, trips in grid_trips.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Bulk CSV import of Students, Faculty and Skills for admins.
+
+The CSV is read as a stream, ``IMPORT_BATCH_SIZE`` rows at a time. Each
+batch goes through these steps:
+
+1. Every row is validated against the table's constraints (required
+   fields, lengths, GPA 0-4, year level 1-4, email format, duplicates within
+   the file).
+2. One ``IN`` query finds the emails (or skill names) that already exist.
+3. Initial passwords are hashed in parallel on the auth worker pool
+   (``auth.hash_passwords``). A blank password cell gets a generated one,
+   returned in ``ImportReport.credentials`` so it can be handed out.
+4. Valid rows go in with one multi-row INSERT, committed per batch.
+
+Rejected rows never stop the import; each one is reported with its CSV line
+number and reason. A database error other than a duplicate key stops it,
+and batches committed before the error stay.
+
+    python -m bulk_import students cohort.csv --report errors.csv
+"""
+import argparse
+import csv
+import io
+import re
+import secrets
+import sys
+import time
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from mysql.connector import IntegrityError, errorcode
+
+import auth
+from config import IMPORT_BATCH_SIZE, IMPORT_BCRYPT_ROUNDS
+from db import get_pool
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+YEAR_LEVEL_RE = re.compile(r"[1-4]")
+
+# table: target table; key: the unique column checked for duplicates;
+# columns: CSV header -> (max length, required); account tables also take a password
+ImportSpec = namedtuple("ImportSpec", ["table", "key", "columns", "account"])
+
+SPECS = {
+    "students": ImportSpec("Students", "email", {
+        "first_name": (50, True), "last_name": (50, True), "email": (100, True), "major": (100, False),
+        "gpa": (None, False), "year_level": (None, False), "research_interests": (None, False),
+    }, True),
+    "faculty": ImportSpec("Faculty", "email", {
+        "first_name": (50, True), "last_name": (50, True), "email": (100, True),
+        "department": (100, False), "research_areas": (None, False),
+    }, True),
+    "skills": ImportSpec("Skills", "skill_name", {
+        "skill_name": (100, True), "category": (50, True),
+    }, False),
+}
+
+
+class ImportReport:
+    """Outcome of one import: counts, per-row errors and generated initial passwords."""
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.errors = []       # (line, key value, message)
+        self.credentials = []  # (email, generated password)
+        self.seconds = 0.0
+
+    def reject(self, line, key, message):
+        self.errors.append((line, key, message))
+
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def errors_csv(self):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["line", "key", "error"])
+        writer.writerows(self.errors)
+        return out.getvalue()
+
+    def credentials_csv(self):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["email", "initial_password"])
+        writer.writerows(self.credentials)
+        return out.getvalue()
+
+
+def _validate(spec, raw):
+    """``(values, None)`` with cleaned column values, or ``(None, error message)``."""
+    values = {}
+    for column, (max_len, required) in spec.columns.items():
+        value = (raw.get(column) or "").strip()
+        if not value:
+            if required:
+                return None, f"{column} is required"
+            values[column] = None
+            continue
+        if max_len and len(value) > max_len:
+            return None, f"{column} is longer than {max_len} characters"
+        values[column] = value
+
+    if "email" in values and not EMAIL_RE.match(values["email"]):
+        return None, "email is not a valid address"
+    if values.get("gpa") is not None:
+        try:
+            gpa = Decimal(values["gpa"])
+        except InvalidOperation:
+            return None, "gpa is not a number"
+        if not gpa.is_finite():  # NaN and Infinity parse, but cannot be compared or stored
+            return None, "gpa is not a number"
+        if not Decimal("0") <= gpa <= Decimal("4"):
+            return None, "gpa must be between 0.0 and 4.0"
+        values["gpa"] = gpa.quantize(Decimal("0.01"))
+    if values.get("year_level") is not None:
+        # fullmatch, not isdigit(): "²" is a digit to isdigit() but int() rejects it
+        if not YEAR_LEVEL_RE.fullmatch(values["year_level"]):
+            return None, "year_level must be 1, 2, 3 or 4"
+        values["year_level"] = int(values["year_level"])
+    if spec.account:
+        values["password"] = (raw.get("password") or "").strip() or None
+    return values, None
+
+
+def _existing(cursor, spec, keys):
+    """The subset of ``keys`` already present in the table (compared case-insensitively, like MySQL).
+
+    Account emails are checked against ``Accounts``, since an email used by
+    any role cannot be imported again.
+    """
+    if not keys:
+        return set()
+    table = "Accounts" if spec.account else spec.table
+    cursor.execute(
+        f"SELECT {spec.key} FROM {table} WHERE {spec.key} IN ({', '.join(['%s'] * len(keys))})",
+        list(keys),
+    )
+    return {row[0].lower() for row in cursor.fetchall()}
+
+
+def _insert(conn, spec, rows, admin_id):
+    columns = list(spec.columns) + (["password", "admin_id"] if spec.account else [])
+    cursor = conn.cursor()
+    cursor.execute(
+        f"INSERT INTO {spec.table} ({', '.join(columns)}) VALUES "
+        + ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(rows)),
+        [row.get(c, admin_id if c == "admin_id" else None) for row in rows for c in columns],
+    )
+    conn.commit()
+
+
+def _import_batch(conn, spec, batch, seen, report, admin_id):
+    """Validate, de-duplicate, hash and insert one batch of ``(line, raw row)``."""
+    valid = []
+    for line, raw in batch:
+        values, error = _validate(spec, raw)
+        if error:
+            report.reject(line, raw.get(spec.key, ""), error)
+            continue
+        key = values[spec.key].lower()
+        if key in seen:
+            report.reject(line, values[spec.key], f"duplicate {spec.key} earlier in the file")
+            continue
+        seen.add(key)
+        valid.append((line, values))
+
+    existing = _existing(conn.cursor(), spec, [values[spec.key] for _, values in valid])
+    fresh = []
+    for line, values in valid:
+        if values[spec.key].lower() in existing:
+            report.reject(line, values[spec.key], f"{spec.key} is already registered")
+        else:
+            fresh.append((line, values))
+    if not fresh:
+        return
+
+    if spec.account:
+        for _, values in fresh:
+            if values["password"] is None:
+                values["password"] = secrets.token_urlsafe(9)
+                report.credentials.append((values["email"], values["password"]))
+        hashes = auth.hash_passwords([values["password"] for _, values in fresh], IMPORT_BCRYPT_ROUNDS)
+        rows = [dict(values, password=hashed) for (_, values), hashed in zip(fresh, hashes)]
+    else:
+        rows = [values for _, values in fresh]
+
+    try:
+        _insert(conn, spec, rows, admin_id)
+    except IntegrityError as e:
+        conn.rollback()
+        if e.errno != errorcode.ER_DUP_ENTRY:
+            raise
+        # Someone registered one of these keys since the duplicate check; find it and retry once
+        taken = _existing(conn.cursor(), spec, [row[spec.key] for row in rows])
+        lines = []
+        for (line, _), row in zip(fresh, rows):
+            if row[spec.key].lower() in taken:
+                report.reject(line, row[spec.key], f"{spec.key} is already registered")
+            else:
+                lines.append(line)
+        rows = [row for row in rows if row[spec.key].lower() not in taken]
+        report.credentials = [c for c in report.credentials if c[0].lower() not in taken]
+        if rows:
+            try:
+                _insert(conn, spec, rows, admin_id)
+            except IntegrityError as e:
+                conn.rollback()
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                # Still racing another writer: drop this batch instead of failing the whole import
+                for line, row in zip(lines, rows):
+                    report.reject(line, row[spec.key], "conflicted with a concurrent insert; batch not imported")
+                dropped = {row[spec.key].lower() for row in rows}
+                report.credentials = [c for c in report.credentials if c[0].lower() not in dropped]
+                rows = []
+    report.inserted += len(rows)
+
+
+def import_csv(kind, text_stream, admin_id=None, batch_size=IMPORT_BATCH_SIZE, pool=None):
+    """Import CSV rows of ``kind`` ("students", "faculty" or "skills") from a text stream.
+
+    Returns an ``ImportReport``. Columns are matched by header name and
+    unknown columns are ignored; raises ``ValueError`` when a required column
+    is missing from the header.
+    """
+    spec = SPECS[kind]
+    report = ImportReport()
+    started = time.perf_counter()
+    reader = csv.DictReader(text_stream)
+    missing = [c for c, (_, required) in spec.columns.items() if required and c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV header is missing required column(s): {', '.join(missing)}")
+    seen = set()
+    conn = (pool or get_pool()).acquire()
+    try:
+        batch = []
+        for raw in reader:
+            report.rows += 1
+            batch.append((reader.line_num, raw))
+            if len(batch) >= batch_size:
+                _import_batch(conn, spec, batch, seen, report, admin_id)
+                batch = []
+        if batch:
+            _import_batch(conn, spec, batch, seen, report, admin_id)
+    finally:
+        conn.close()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=sorted(SPECS))
+    parser.add_argument("csv_file")
+    parser.add_argument("--report", help="write rejected rows to this CSV file")
+    parser.add_argument("--credentials", help="write generated initial passwords to this CSV file")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with open(args.csv_file, newline="", encoding="utf-8-sig") as f:
+        try:
+            report = import_csv(args.kind, f, batch_size=args.batch_size)
+        except ValueError as e:
+            parser.error(str(e))
+    print(f"✅ {report.inserted} of {report.rows} rows imported in {report.seconds:.1f}s "
+          f"({report.rows_per_second():,.0f} rows/s), {len(report.errors)} rejected")
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8") as out:
+            out.write(report.errors_csv())
+    elif report.errors:
+        sys.stdout.write(report.errors_csv())
+    if args.credentials and report.credentials:
+        with open(args.credentials, "w", newline="", encoding="utf-8") as out:
+            out.write(report.credentials_csv())
+
+
+if __name__ == "__main__":
+    main()
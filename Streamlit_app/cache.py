@@ -0,0 +1,86 @@
+"""Read-through caching for data that changes far less often than pages rerun.
+
+``shared_cache`` is process-wide and holds data every session sees (skills,
+filter values, recruiting projects). ``session_cache()`` is scoped to one
+Streamlit session and holds the signed-in user's own rows. Keys are tuples
+whose first element names the kind of data, so a write can drop every
+cached variant at once with ``invalidate("recruiting")``. The recruiting
+pages include applicant, pending and member counts, so applying,
+withdrawing, accepting and rejecting invalidate them too.
+
+Cached rows are shared between reruns (and, for ``shared_cache``, between
+users): treat them as read-only and copy before modifying.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from config import CACHE_MAXSIZE, CACHE_TTL, SESSION_CACHE_MAXSIZE, SESSION_CACHE_TTL
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key, loader, ttl=None):
+        """Return the cached value for ``key``, calling ``loader()`` on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Load outside the lock; concurrent misses on one key may both load, which is harmless
+        value = loader()
+        with self._lock:
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, *prefix):
+        """Drop every key starting with ``prefix`` (everything when empty)."""
+        with self._lock:
+            stale = [key for key in self._data if key[:len(prefix)] == prefix]
+            for key in stale:
+                del self._data[key]
+            self.invalidations += len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+shared_cache = TTLCache()
+
+
+def session_cache():
+    """The cache belonging to the current Streamlit session (cleared on logout)."""
+    import streamlit as st
+
+    if "_cache" not in st.session_state:
+        st.session_state["_cache"] = TTLCache(SESSION_CACHE_MAXSIZE, SESSION_CACHE_TTL)
+    return st.session_state["_cache"]
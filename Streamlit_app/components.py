@@ -0,0 +1,71 @@
+"""Reusable Streamlit widgets shared by the dashboard pages."""
+import functools
+import os
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import sessions
+from profiling import begin_run
+
+
+def require_login(role):
+    """The signed-in ``UserSession``; stops the page unless someone with ``role`` is signed in."""
+    session = sessions.current()
+    if session is None:
+        st.error("⚠️ Please log in first.")
+        st.stop()
+    if session.role != role:
+        st.error(f"⚠️ Access denied. {role.title()} privileges required.")
+        st.stop()
+    sessions.sync_cookie()  # writes the cookie on the first page after login
+    return session
+
+
+def fragment(func):
+    """``st.fragment`` whose own reruns the query profiler records as a run of ``<page>/<function>``.
+
+    During a full page run the body's statements stay in the page's run.
+    """
+    page = os.path.splitext(os.path.basename(func.__code__.co_filename))[0]
+
+    @functools.wraps(func)
+    def body(*args, **kwargs):
+        ctx = get_script_run_ctx()
+        if ctx is not None and ctx.fragment_ids_this_run:
+            begin_run(f"{page}/{func.__name__}")
+        return func(*args, **kwargs)
+
+    return st.fragment(body)
+
+
+def page_cursor(key, filters=()):
+    """Seek key for the page currently shown in listing ``key``.
+
+    The trail of seek keys lives in session state so "Previous" can step
+    back; it is reset whenever the listing's filters change.
+    """
+    state = st.session_state.setdefault(f"{key}_pager", {"filters": filters, "trail": [None]})
+    if state["filters"] != filters:
+        state.update(filters=filters, trail=[None])
+    return state["trail"][-1]
+
+
+def pager(key, page, scope="app"):
+    """Render Previous/Next controls under a listing fetched with ``page_cursor(key)``.
+
+    Inside an ``st.fragment`` pass ``scope="fragment"`` so paging reruns only that fragment.
+    """
+    state = st.session_state[f"{key}_pager"]
+    trail = state["trail"]
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Previous", key=f"{key}_prev", disabled=len(trail) == 1):
+            trail.pop()
+            st.rerun(scope=scope)
+    with col2:
+        st.caption(f"Page {len(trail)}")
+    with col3:
+        if st.button("Next ➡️", key=f"{key}_next", disabled=page.next_after is None):
+            trail.append(page.next_after)
+            st.rerun(scope=scope)
@@ -0,0 +1,149 @@
+"""Runtime settings, read once from the environment (or a .env file next to app.py)."""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_bool(name, default=False):
+    return os.getenv(name, "1" if default else "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+# --- Database ---
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", "3306")),
+    "user": os.getenv("DB_USER", "root"),
+    "password": os.getenv("DB_PASSWORD", ""),
+    "database": os.getenv("DB_NAME", "researchhub"),
+}
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Idle connections are pinged before reuse only after resting this many seconds
+POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", "30"))
+# Server-side prepared statements kept per pooled connection (0 disables them)
+PREPARED_CACHE_SIZE = int(os.getenv("DB_PREPARED_CACHE_SIZE", "32"))
+
+
+def replica_config(spec):
+    """Connection settings for a ``host[:port]`` replica, other settings as for the primary."""
+    host, _, port = spec.strip().partition(":")
+    return dict(DB_CONFIG, host=host, port=int(port or DB_CONFIG["port"]))
+
+
+# --- Read replicas ---
+# Comma-separated host[:port] list; same user, password and database as the primary
+REPLICA_CONFIGS = [replica_config(s) for s in os.getenv("DB_REPLICAS", "").split(",") if s.strip()]
+# Replicas further behind than this many seconds are skipped until they catch up
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+# Seconds between replication-lag checks per replica
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "2"))
+# Seconds to wait for a replica connection before reading from the primary instead
+REPLICA_TIMEOUT = float(os.getenv("DB_REPLICA_TIMEOUT", "1"))
+# Seconds an unreachable replica is left out before it is tried again
+REPLICA_RETRY_AFTER = float(os.getenv("DB_REPLICA_RETRY_AFTER", "30"))
+# A session reads from the primary for this many seconds after its own last write;
+# keep it above DB_REPLICA_MAX_LAG + DB_REPLICA_CHECK_INTERVAL
+READ_YOUR_WRITES_WINDOW = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "10"))
+
+# --- Admin statistics ---
+# Read headline counts from the trigger-maintained Platform_Stats slots instead of COUNT(*)
+STATS_FROM_SUMMARY = env_bool("STATS_FROM_SUMMARY", True)
+
+# --- Listings ---
+# Rows per page in the keyset-paginated dashboard listings
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "20"))
+
+# --- Matching ---
+# Candidates shown per project card
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", "5"))
+
+# --- Skill index ---
+# Seconds before the in-process skill bitset index is rebuilt from the database
+SKILL_INDEX_TTL = float(os.getenv("SKILL_INDEX_TTL", "300"))
+# Projects listed under "Recommended for you"
+RECOMMEND_K = int(os.getenv("RECOMMEND_K", "4"))
+
+# --- Caching ---
+# Process-wide cache (skills, filter values, recruiting projects)
+CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "2048"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+# Reference data that only changes through admin/SQL maintenance (Skills)
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "600"))
+# Per-session cache (own profile, skills, applications)
+SESSION_CACHE_MAXSIZE = int(os.getenv("SESSION_CACHE_MAXSIZE", "64"))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "120"))
+
+# --- Authentication ---
+# bcrypt cost factor for new hashes; older hashes are upgraded on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Worker threads running bcrypt, and how many hashes may be queued before logins are refused
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", str(os.cpu_count() or 4)))
+AUTH_MAX_PENDING = int(os.getenv("AUTH_MAX_PENDING", "64"))
+AUTH_QUEUE_TIMEOUT = float(os.getenv("AUTH_QUEUE_TIMEOUT", "5"))
+
+# --- Sessions ---
+# "memory" (this process only) or "sqlite" (a file shared by every app process on the host)
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+# Key signing session tokens; required for the sqlite store, same value on every app process
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+# Browser cookie carrying the signed session token across reloads and reconnects
+SESSION_COOKIE = os.getenv("SESSION_COOKIE", "researchhub_session")
+# Seconds a session lives after its last use, and sessions kept by the memory store
+SESSION_TTL = float(os.getenv("SESSION_TTL", "28800"))
+SESSION_MAXSIZE = int(os.getenv("SESSION_MAXSIZE", "100000"))
+
+# --- Project search ---
+# "auto" (FULLTEXT, falling back to the in-process index), "fulltext" or "memory"
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto").lower()
+# Seconds before the in-process search index is rebuilt
+SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL", "300"))
+
+# --- Bulk import ---
+# CSV rows validated, duplicate-checked, hashed and inserted per transaction
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+# bcrypt cost for imported initial passwords; upgraded to BCRYPT_ROUNDS on first login
+IMPORT_BCRYPT_ROUNDS = int(os.getenv("IMPORT_BCRYPT_ROUNDS", "10"))
+
+# --- Exports ---
+# Rows fetched from the server per chunk while streaming an export
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+# Age in seconds after which an export file left behind (e.g. by a killed process) is swept
+EXPORT_FILE_TTL = float(os.getenv("EXPORT_FILE_TTL", "3600"))
+
+# --- Application log retention ---
+# Whole months of Application_Logs kept online; older partitions are archived and dropped
+LOG_RETENTION_MONTHS = int(os.getenv("LOG_RETENTION_MONTHS", "12"))
+# Monthly partitions created ahead of time
+LOG_PARTITIONS_AHEAD = int(os.getenv("LOG_PARTITIONS_AHEAD", "3"))
+# Where archived months are written, as "csv" (gzip) or "parquet" (needs pyarrow)
+LOG_ARCHIVE_DIR = os.getenv("LOG_ARCHIVE_DIR", "log_archive")
+LOG_ARCHIVE_FORMAT = os.getenv("LOG_ARCHIVE_FORMAT", "csv").lower()
+
+# --- Background jobs ---
+# The lifecycle jobs (jobs.py) normally run in a separate `python -m jobs`
+# worker. Set to 1 to run them on a daemon thread of the app process instead
+# (single-process deployments); a database lock keeps it to one at a time.
+JOBS_IN_APP = env_bool("JOBS_IN_APP", False)
+# Seconds between job rounds
+JOB_INTERVAL = float(os.getenv("JOB_INTERVAL", "300"))
+# Rows (or projects) changed per transaction
+JOB_CHUNK_SIZE = int(os.getenv("JOB_CHUNK_SIZE", "500"))
+# Pending applications older than this many days become Expired
+PENDING_EXPIRY_DAYS = int(os.getenv("PENDING_EXPIRY_DAYS", "60"))
+# Job_Runs history kept for the admin panel
+JOB_RUNS_KEEP_DAYS = int(os.getenv("JOB_RUNS_KEEP_DAYS", "30"))
+
+# --- Query profiling ---
+# Record every statement (fingerprint, duration, rows, call site) per page run
+PROFILE_QUERIES = env_bool("PROFILE_QUERIES")
+# Statements slower than this (milliseconds) are flagged
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# One fingerprint run this many times from the same call site in one run is flagged as N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+# Page runs kept in memory for the admin profiler panel
+PROFILE_HISTORY = int(os.getenv("PROFILE_HISTORY", "200"))
+# Optional JSON-lines file receiving one record per statement
+QUERY_LOG_PATH = os.getenv("QUERY_LOG_PATH", "")
@@ -1,18 +1,465 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+from config import (
+    DB_CONFIG, POOL_PING_INTERVAL, POOL_SIZE, POOL_TIMEOUT, PREPARED_CACHE_SIZE, PROFILE_QUERIES,
+    READ_YOUR_WRITES_WINDOW, REPLICA_CHECK_INTERVAL, REPLICA_CONFIGS, REPLICA_MAX_LAG, REPLICA_RETRY_AFTER,
+    REPLICA_TIMEOUT,
+)
+from profiling import ProfilingCursor
+
+
+class PoolTimeout(PoolError):
+    """Raised when no connection becomes free within the pool timeout."""
+
+
+class PooledConnection:
+    """Thin proxy around a MySQL connection; close() hands it back to the pool."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise Error("Connection has already been returned to the pool.")
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, prepared=False, **kwargs):
+        """A cursor on this connection; ``prepared=True`` reuses cached server-side statements."""
+        if self._raw is None:
+            raise Error("Connection has already been returned to the pool.")
+        if prepared and PREPARED_CACHE_SIZE > 0:
+            cursor = PreparedCursor(self._pool, self._raw, kwargs.get("dictionary", False))
+        else:
+            cursor = self._raw.cursor(*args, **kwargs)
+        return ProfilingCursor(cursor) if PROFILE_QUERIES else cursor
+
+    def commit(self):
+        if self._raw is None:
+            raise Error("Connection has already been returned to the pool.")
+        self._raw.commit()
+        note_write()
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+    def __del__(self):
+        # Pages are top-level scripts; st.rerun()/st.stop() skip their final
+        # conn.close(), so the connection is returned when the run is discarded.
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PreparedCursor:
+    """Cursor facade over server-side prepared statements cached per physical connection.
+
+    mysql-connector only re-prepares when a cursor runs a different statement,
+    so keeping one prepared cursor per SQL string lets later checkouts of the
+    same connection skip the prepare round-trip. Variable-length ``IN`` lists
+    produce one statement per length; the per-connection cache is an LRU of
+    ``PREPARED_CACHE_SIZE`` statements.
+    """
+
+    def __init__(self, pool, raw, dictionary=False):
+        self._pool = pool
+        self._raw = raw
+        self._dictionary = dictionary
+        self._active = None
+
+    def execute(self, operation, params=()):
+        self._active = self._pool.prepared(self._raw, operation, self._dictionary)
+        try:
+            return self._active.execute(operation, params)
+        except Error:
+            self._pool.forget_prepared(self._raw, operation, self._dictionary)
+            raise
+
+    def __iter__(self):
+        return iter(self._active)
+
+    def close(self):
+        pass  # the statement stays prepared for the next checkout
+
+    def __getattr__(self, name):
+        return getattr(self._active, name)
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool shared by every Streamlit session in the process.
+
+    Connections are opened lazily up to ``size``. A checkout blocks for at most
+    ``timeout`` seconds when all connections are busy. Connections that sat
+    idle longer than ``POOL_PING_INTERVAL`` are pinged on checkout so stale
+    ones are replaced instead of handed out; recently used ones skip the ping,
+    which keeps short per-call checkouts cheap.
+    """
+
+    def __init__(self, size=POOL_SIZE, timeout=POOL_TIMEOUT, **config):
+        self.size = size
+        self.timeout = timeout
+        self._config = config or DB_CONFIG
+        self._idle = []  # (raw connection, released at)
+        self._open = 0
+        self._statements = {}  # raw -> OrderedDict of its prepared cursors
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._metrics = {
+            "checkouts": 0,
+            "connects": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "wait_total_s": 0.0,
+            "wait_max_s": 0.0,
+            "peak_in_use": 0,
+        }
+
+    def acquire(self):
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        with self._cond:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                self._cond.wait(remaining)
+            raw, released_at = self._idle.pop() if self._idle else (None, None)
+            if raw is None:
+                self._open += 1
+            self._in_use += 1
+            waited = time.perf_counter() - start
+            m = self._metrics
+            m["checkouts"] += 1
+            m["wait_total_s"] += waited
+            m["wait_max_s"] = max(m["wait_max_s"], waited)
+            m["peak_in_use"] = max(m["peak_in_use"], self._in_use)
+
+        # Health check / connect outside the lock so other sessions are not blocked
+        try:
+            if (raw is not None and time.monotonic() - released_at > POOL_PING_INTERVAL
+                    and not self._is_healthy(raw)):
+                self._discard(raw)
+                with self._cond:
+                    self._metrics["discarded"] += 1
+                raw = None
+            if raw is None:
+                raw = mysql.connector.connect(**self._config)
+                with self._cond:
+                    self._metrics["connects"] += 1
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        healthy = True
+        try:
+            # Never hand unread rows or a half-finished transaction to the next session
+            if raw.unread_result:
+                raw.consume_results()
+            if raw.in_transaction:
+                raw.rollback()
+        except Error:
+            healthy = False
+        with self._cond:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((raw, time.monotonic()))
+            else:
+                self._open -= 1
+                self._metrics["discarded"] += 1
+            self._cond.notify()
+        if not healthy:
+            self._discard(raw)
+
+    def stats(self):
+        """Snapshot of pool size, utilization and checkout wait metrics."""
+        with self._cond:
+            m = dict(self._metrics)
+            m.update(
+                size=self.size,
+                open=self._open,
+                in_use=self._in_use,
+                idle=len(self._idle),
+                utilization=self._in_use / self.size if self.size else 0.0,
+                wait_avg_s=m["wait_total_s"] / m["checkouts"] if m["checkouts"] else 0.0,
+            )
+            return m
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for raw, _ in idle:
+            self._discard(raw)
+
+    def prepared(self, raw, sql, dictionary=False):
+        """The cached prepared cursor for ``sql`` on ``raw``, creating it if needed."""
+        with self._cond:
+            statements = self._statements.setdefault(raw, OrderedDict())
+        # Only the session holding ``raw`` touches its statements, so no lock from here
+        key = (sql, dictionary)
+        cursor = statements.get(key)
+        if cursor is None:
+            cursor = raw.cursor(prepared=True, dictionary=dictionary)
+            statements[key] = cursor
+            while len(statements) > PREPARED_CACHE_SIZE:
+                _, evicted = statements.popitem(last=False)
+                self._close_quietly(evicted)  # deallocates the server-side statement
+        statements.move_to_end(key)
+        return cursor
+
+    def forget_prepared(self, raw, sql, dictionary=False):
+        cursor = self._statements.get(raw, {}).pop((sql, dictionary), None)
+        if cursor is not None:
+            self._close_quietly(cursor)
+
+    def _discard(self, raw):
+        with self._cond:
+            self._statements.pop(raw, None)
+        self._close_quietly(raw)
+
+    @staticmethod
+    def _is_healthy(raw):
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Error:
+            pass
+
+
+def _session_key():
+    """The Streamlit session running on this thread, or the thread itself outside Streamlit."""
+    scriptrunner = sys.modules.get("streamlit.runtime.scriptrunner")
+    ctx = scriptrunner.get_script_run_ctx(suppress_warning=True) if scriptrunner else None
+    return ctx.session_id if ctx is not None else threading.get_ident()
+
+
+_last_writes = {}  # session key -> monotonic time of its last commit
+_writes_lock = threading.Lock()
+
+
+def note_write():
+    """Record that the current session just committed, so its reads stick to the primary for a while."""
+    if not REPLICA_CONFIGS:
+        return
+    now = time.monotonic()
+    with _writes_lock:
+        _last_writes[_session_key()] = now
+        if len(_last_writes) > 1024:
+            for key in [k for k, t in _last_writes.items() if now - t >= READ_YOUR_WRITES_WINDOW]:
+                del _last_writes[key]
+
+
+def wrote_recently(window=READ_YOUR_WRITES_WINDOW):
+    """True while the current session's last commit is less than ``window`` seconds old."""
+    with _writes_lock:
+        last = _last_writes.get(_session_key())
+    return last is not None and time.monotonic() - last < window
+
+
+class Replica:
+    """One read replica: its own pool plus the latest lag and health observations."""
+
+    def __init__(self, config, size=POOL_SIZE, timeout=REPLICA_TIMEOUT):
+        self.name = f"{config['host']}:{config['port']}"
+        self.pool = ConnectionPool(size=size, timeout=timeout,
+                                   **dict(config, connection_timeout=max(1, round(timeout))))
+        self.lag = None
+        self.checked_at = None
+        self.down_until = 0.0
+        self.error = None
+        self.reads = 0
+
+    def mark_down(self, error, retry_after):
+        self.down_until = time.monotonic() + retry_after
+        self.error = str(error)
+        self.checked_at = None
+        self.pool.close_all()
+        print(f"⚠️ Replica {self.name} unavailable for {retry_after:.0f}s, reading from the primary: {error}")
+
+
+def replication_lag(conn):
+    """Seconds ``conn``'s server is behind its source.
+
+    0 for a server that is not replicating at all (e.g. a stand-in instance
+    in development), None when replication is configured but stopped.
+    """
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SHOW REPLICA STATUS")
+    except Error:
+        cursor.execute("SHOW SLAVE STATUS")  # MySQL before 8.0.22, MariaDB before 10.5.1
+    lags = [row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master")) for row in cursor.fetchall()]
+    if any(lag is None for lag in lags):
+        return None
+    return max(lags, default=0)
+
+
+class ReplicaRouter:
+    """Read-only checkouts from replicas, falling back to the primary.
+
+    ``acquire()`` matches ``ConnectionPool.acquire()``, so the router can be
+    passed anywhere a pool is read from. Replicas are used round-robin.
+    One is skipped while its lag (checked at most every
+    ``REPLICA_CHECK_INTERVAL`` seconds) exceeds ``max_lag``, and for
+    ``REPLICA_RETRY_AFTER`` seconds after it fails to connect. When no replica
+    qualifies, or the session committed within ``READ_YOUR_WRITES_WINDOW``
+    seconds (read-your-writes), the connection comes from the primary.
+    Writes never come through here: they use the primary pool directly.
+    """
+
+    def __init__(self, primary, replica_configs, max_lag=REPLICA_MAX_LAG,
+                 check_interval=REPLICA_CHECK_INTERVAL, retry_after=REPLICA_RETRY_AFTER,
+                 timeout=REPLICA_TIMEOUT, size=POOL_SIZE):
+        self.primary = primary
+        self.replicas = [Replica(config, size, timeout) for config in replica_configs]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self._next = 0
+        self._lock = threading.Lock()
+        self._metrics = {"replica_reads": 0, "sticky_reads": 0, "fallback_reads": 0}
+
+    def _count(self, metric):
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def acquire(self):
+        if wrote_recently():
+            self._count("sticky_reads")
+            return self.primary.acquire()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.replicas), 1)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            conn = self._checkout(replica)
+            if conn is not None:
+                self._count("replica_reads")
+                return conn
+        self._count("fallback_reads")
+        return self.primary.acquire()
+
+    def _checkout(self, replica):
+        """A connection to ``replica`` if it is up and caught up, else None."""
+        now = time.monotonic()
+        if now < replica.down_until:
+            return None
+        try:
+            conn = replica.pool.acquire()
+        except PoolTimeout:
+            return None  # busy, not broken: this read goes elsewhere
+        except Error as e:
+            replica.mark_down(e, self.retry_after)
+            return None
+        if replica.checked_at is None or now - replica.checked_at >= self.check_interval:
+            try:
+                replica.lag = replication_lag(conn)
+            except Error as e:
+                conn.close()
+                replica.mark_down(e, self.retry_after)
+                return None
+            replica.checked_at = now
+            replica.error = None
+        if replica.lag is None or replica.lag > self.max_lag:
+            conn.close()
+            return None
+        replica.reads += 1
+        return conn
+
+    def stats(self):
+        with self._lock:
+            m = dict(self._metrics)
+        now = time.monotonic()
+        m["replicas"] = [{
+            "replica": r.name,
+            "up": now >= r.down_until,
+            "lag_s": r.lag,
+            "reads": r.reads,
+            "error": r.error,
+            "pool": r.pool.stats(),
+        } for r in self.replicas]
+        return m
+
+    def close_all(self):
+        for replica in self.replicas:
+            replica.pool.close_all()
+
+
+_pool = None
+_router = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_read_pool():
+    """Where read-only work checks connections out: the replica router when
+    ``DB_REPLICAS`` is set, else the primary pool."""
+    global _router
+    primary = get_pool()
+    if not REPLICA_CONFIGS:
+        return primary
+    if _router is None:
+        with _pool_lock:
+            if _router is None:
+                _router = ReplicaRouter(primary, REPLICA_CONFIGS)
+    return _router
+
 
 def get_connection():
+    """Check a connection out of the pool; call close() to give it back."""
     try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="thisbelongstome",
-            database="researchhub"
-        )
-        if conn.is_connected():
-            print("✅ MySQL connection successful!")
-            return conn
+        return get_pool().acquire()
     except Error as e:
         print("❌ Database connection failed:", e)
         return None
-    
\ No newline at end of file
+
+
+def get_read_connection():
+    """Like ``get_connection()``, for read-only work that may be served by a replica."""
+    try:
+        return get_read_pool().acquire()
+    except Error as e:
+        print("❌ Database connection failed:", e)
+        return None
+
+
+def pool_stats():
+    stats = get_pool().stats()
+    if REPLICA_CONFIGS:
+        stats["read_routing"] = get_read_pool().stats()
+    return stats
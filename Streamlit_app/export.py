@@ -0,0 +1,254 @@
+"""Streaming table exports (CSV, gzip CSV, Excel) for the admin dashboard and the command line.
+
+Rows are read through an unbuffered cursor, on a replica when ``DB_REPLICAS``
+is set. MySQL streams the result set and the client holds at most
+``EXPORT_CHUNK_SIZE`` rows at a time. They pass
+through generators straight into the output file. Memory stays flat whatever
+the table size, and CSV output starts before the query has finished.
+
+    python -m export applications --filter status=Pending -o pending.csv
+    python -m export application_logs --format xlsx --filter since=2025-01-01 -o logs.xlsx
+"""
+import argparse
+import csv
+import gzip
+import io
+import os
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+from config import EXPORT_CHUNK_SIZE, EXPORT_FILE_TTL
+from db import get_read_pool
+
+# columns: [(header, SQL expression)]; filters: {name: clause with one placeholder}
+Dataset = namedtuple("Dataset", ["columns", "from_", "filters", "order_by"])
+
+DATASETS = {
+    "students": Dataset(
+        [("student_id", "student_id"), ("first_name", "first_name"), ("last_name", "last_name"),
+         ("email", "email"), ("major", "major"), ("gpa", "gpa"), ("year_level", "year_level"),
+         ("research_interests", "research_interests"), ("created_at", "created_at")],
+        "Students",
+        {"major": "major = %s", "since": "created_at >= %s", "until": "created_at < %s"},
+        "student_id",
+    ),
+    "faculty": Dataset(
+        [("faculty_id", "faculty_id"), ("first_name", "first_name"), ("last_name", "last_name"),
+         ("email", "email"), ("department", "department"), ("research_areas", "research_areas"),
+         ("created_at", "created_at")],
+        "Faculty",
+        {"department": "department = %s", "since": "created_at >= %s", "until": "created_at < %s"},
+        "faculty_id",
+    ),
+    "projects": Dataset(
+        [("project_id", "p.project_id"), ("title", "p.title"), ("status", "p.status"),
+         ("max_students", "p.max_students"), ("faculty_id", "p.faculty_id"),
+         ("faculty_name", "CONCAT(f.first_name, ' ', f.last_name)"), ("department", "f.department"),
+         ("applicants", "ps.applicant_count"), ("pending", "ps.pending_count"),
+         ("members", "ps.member_count"), ("created_at", "p.created_at")],
+        """Research_Projects p
+           JOIN Faculty f ON f.faculty_id = p.faculty_id
+           LEFT JOIN Project_Stats ps ON ps.project_id = p.project_id""",
+        {"status": "p.status = %s", "department": "f.department = %s",
+         "since": "p.created_at >= %s", "until": "p.created_at < %s"},
+        "p.project_id",
+    ),
+    "applications": Dataset(
+        [("application_id", "a.application_id"), ("status", "a.status"), ("student_id", "a.student_id"),
+         ("student_email", "s.email"), ("project_id", "a.project_id"), ("project_title", "p.title"),
+         ("applied_at", "a.applied_at"), ("reviewed_at", "a.reviewed_at")],
+        """Applications a
+           JOIN Students s ON s.student_id = a.student_id
+           JOIN Research_Projects p ON p.project_id = a.project_id""",
+        {"status": "a.status = %s", "student_id": "a.student_id = %s", "project_id": "a.project_id = %s",
+         "since": "a.applied_at >= %s", "until": "a.applied_at < %s"},
+        "a.application_id",
+    ),
+    "application_logs": Dataset(
+        [("id", "id"), ("application_id", "application_id"), ("student_id", "student_id"),
+         ("project_id", "project_id"), ("old_status", "old_status"), ("new_status", "new_status"),
+         ("changed_at", "changed_at")],
+        "Application_Logs",
+        {"student_id": "student_id = %s", "project_id": "project_id = %s",
+         "since": "changed_at >= %s", "until": "changed_at < %s"},
+        "changed_at, id",
+    ),
+}
+
+# format -> (file extension, MIME type)
+FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+EXCEL_MAX_ROWS = 1_048_576  # per worksheet, header included
+
+
+def headers(name):
+    return [header for header, _ in DATASETS[name].columns]
+
+
+def build_query(name, filters=None):
+    """``(sql, params)`` for dataset ``name``; filters that are None or "" are skipped."""
+    dataset = DATASETS[name]
+    clauses, params = [], []
+    for key, value in (filters or {}).items():
+        if key not in dataset.filters:
+            raise ValueError(f"Unknown filter {key!r} for {name}; expected one of {sorted(dataset.filters)}")
+        if value not in (None, ""):
+            clauses.append(dataset.filters[key])
+            params.append(value)
+    sql = f"SELECT {', '.join(expr for _, expr in dataset.columns)} FROM {dataset.from_}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return sql + f" ORDER BY {dataset.order_by}", params
+
+
+def stream_rows(name, filters=None, chunk_size=EXPORT_CHUNK_SIZE, pool=None):
+    """Yield lists of up to ``chunk_size`` row tuples, fetched from an unbuffered cursor.
+
+    The connection stays checked out until the generator is exhausted or closed.
+    """
+    sql, params = build_query(name, filters)
+    conn = (pool or get_read_pool()).acquire()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        conn.close()
+
+
+def csv_blocks(name, chunks):
+    """Encode row chunks of dataset ``name`` as UTF-8 CSV, one ``bytes`` block per chunk (header first)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers(name))
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def iter_csv(name, filters=None, chunk_size=EXPORT_CHUNK_SIZE, pool=None):
+    """The export as a generator of CSV ``bytes`` blocks, e.g. for a streaming HTTP response."""
+    return csv_blocks(name, stream_rows(name, filters, chunk_size, pool))
+
+
+def write_xlsx(out, name, filters=None, chunk_size=EXPORT_CHUNK_SIZE, pool=None):
+    """Write an .xlsx workbook to the binary file ``out``; returns the row count.
+
+    Uses openpyxl's write-only mode, which spills rows to a temporary file
+    instead of building the sheet in memory. Rows beyond Excel's sheet limit
+    continue on further sheets.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Excel export needs openpyxl: pip install openpyxl") from None
+    workbook = Workbook(write_only=True)
+    sheet, sheet_rows, count = None, EXCEL_MAX_ROWS, 0
+    for rows in stream_rows(name, filters, chunk_size, pool):
+        for row in rows:
+            if sheet_rows == EXCEL_MAX_ROWS:
+                sheet = workbook.create_sheet(f"{name}_{len(workbook.worksheets) + 1}"[:31])
+                sheet.append(headers(name))
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+        count += len(rows)
+    if sheet is None:
+        workbook.create_sheet(name[:31]).append(headers(name))
+    workbook.save(out)
+    return count
+
+
+def export(out, name, filters=None, fmt="csv", chunk_size=EXPORT_CHUNK_SIZE, pool=None):
+    """Write dataset ``name`` to the binary file ``out`` in ``fmt``; returns the row count."""
+    if fmt == "xlsx":
+        return write_xlsx(out, name, filters, chunk_size, pool)
+    count = 0
+
+    def counted():
+        nonlocal count
+        for rows in stream_rows(name, filters, chunk_size, pool):
+            count += len(rows)
+            yield rows
+
+    target = gzip.GzipFile(fileobj=out, mode="wb") if fmt == "csv.gz" else out
+    try:
+        for block in csv_blocks(name, counted()):
+            target.write(block)
+    finally:
+        if target is not out:
+            target.close()
+    return count
+
+
+# Files prepared for the admin download button; see export_to_file()
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "researchhub-exports")
+
+
+def sweep_exports(max_age=EXPORT_FILE_TTL):
+    """Delete prepared export files older than ``max_age`` seconds; returns how many.
+
+    The dashboard deletes each file once the download button holds it. This
+    catches files left by a process that died in between.
+    """
+    removed = 0
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR) if os.path.isdir(EXPORT_DIR) else ():
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass  # another process swept it first
+    return removed
+
+
+def export_to_file(name, filters=None, fmt="csv"):
+    """Export into a new file under ``EXPORT_DIR``; returns ``(path, rows)``.
+
+    The file is removed again if the export fails for any reason.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=f".{FORMATS[fmt][0]}", dir=EXPORT_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            return path, export(out, name, filters, fmt)
+    except BaseException:
+        os.remove(path)
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--filter", action="append", default=[], metavar="NAME=VALUE")
+    parser.add_argument("-o", "--output", default="-", help="file to write, - for stdout")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+    filters = dict(f.split("=", 1) for f in args.filter)
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        count = export(out, args.dataset, filters, args.format, args.chunk_size)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"✅ Exported {count} {args.dataset} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
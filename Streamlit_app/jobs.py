@@ -0,0 +1,358 @@
+"""Background lifecycle jobs, kept off the interactive request path.
+
+Three idempotent, set-based jobs move project and application state along
+without anyone clicking "Update":
+
+* ``close_full_projects``: Recruiting projects whose members have reached
+  ``max_students`` move to In Progress. Accepting an application already
+  does this; the job catches capacity lowered by an edit and members added
+  outside the accept flow;
+* ``expire_pending``: Pending applications older than ``PENDING_EXPIRY_DAYS``
+  become Expired;
+* ``award_achievements``: accepted students of Completed projects get their
+  ``Student_Achievements`` row. This used to be a row trigger that ran
+  inside the faculty member's status update;
+* ``ensure_log_partitions``: the ``Application_Logs`` partitions for the
+  coming ``LOG_PARTITIONS_AHEAD`` months exist, so new log rows never land
+  in the catch-all partition when the retention cron is late or missing.
+
+Each job works through its rows ``JOB_CHUNK_SIZE`` at a time, one
+transaction per chunk, and only selects rows that still need the change. A
+rerun, or a run picking up after a crash, therefore does nothing twice. A
+round holds the ``lifecycle_jobs`` database lock, so at most one process
+works at a time. Every run is timed and recorded in ``Job_Runs``; a dry
+run only counts what would change and writes nothing.
+
+    python -m jobs                  # the worker: a round every JOB_INTERVAL seconds
+    python -m jobs --once --dry-run
+    python -m jobs --once --only expire_pending
+
+Run the worker as its own long-lived process next to the app. For a
+single-process deployment, ``JOBS_IN_APP=1`` makes ``app.py`` run the same
+loop on a daemon thread instead (``start_in_app``).
+"""
+import argparse
+import threading
+import time
+from datetime import datetime
+
+from mysql.connector import Error
+
+from config import JOB_CHUNK_SIZE, JOB_INTERVAL, JOB_RUNS_KEEP_DAYS, JOBS_IN_APP, PENDING_EXPIRY_DAYS
+from db import get_connection, get_read_connection
+from log_retention import ensure_partitions, partitions
+
+LOCK_NAME = "lifecycle_jobs"
+
+FULL_PROJECTS = """
+    SELECT p.project_id
+    FROM Research_Projects p
+    JOIN Project_Stats ps ON ps.project_id = p.project_id
+    WHERE p.status = 'Recruiting' AND ps.member_count >= p.max_students AND p.project_id > %s
+    ORDER BY p.project_id
+    LIMIT %s
+"""
+
+STALE_PENDING = "status = 'Pending' AND applied_at < NOW() - INTERVAL %s DAY"
+
+UNAWARDED_PROJECTS = """
+    SELECT p.project_id
+    FROM Research_Projects p
+    WHERE p.status = 'Completed' AND p.project_id > %s
+      AND EXISTS (
+          SELECT 1
+          FROM Applications a
+          LEFT JOIN Student_Achievements sa ON sa.student_id = a.student_id AND sa.project_id = a.project_id
+          WHERE a.project_id = p.project_id AND a.status = 'Accepted' AND sa.id IS NULL
+      )
+    ORDER BY p.project_id
+    LIMIT %s
+"""
+
+
+def _placeholders(ids):
+    return ", ".join(["%s"] * len(ids))
+
+
+def _chunks(n, chunk_size):
+    return -(-n // chunk_size)
+
+
+def _id_chunks(cursor, sql, chunk_size):
+    """Yield lists of ids from ``sql``, which seeks with ``id > %s`` and ends in ``LIMIT %s``."""
+    last = 0
+    while True:
+        cursor.execute(sql, (last, chunk_size))
+        ids = [row[0] for row in cursor.fetchall()]
+        if ids:
+            yield ids
+        if len(ids) < chunk_size:
+            return
+        last = ids[-1]
+
+
+def close_full_projects(conn, chunk_size, dry_run=False, closed=None):
+    """Move full Recruiting projects to In Progress; returns ``(rows, chunks)``.
+
+    The ids of closed projects are appended to ``closed`` when given.
+    """
+    cursor = conn.cursor()
+    changed = chunks = 0
+    for ids in _id_chunks(cursor, FULL_PROJECTS, chunk_size):
+        if dry_run:
+            changed += len(ids)
+            chunks += 1
+            continue
+        # Re-check on update: a withdrawal may have freed a seat since the SELECT
+        cursor.execute(f"""
+            UPDATE Research_Projects p
+            JOIN Project_Stats ps ON ps.project_id = p.project_id
+            SET p.status = 'In Progress'
+            WHERE p.project_id IN ({_placeholders(ids)})
+              AND p.status = 'Recruiting' AND ps.member_count >= p.max_students
+        """, ids)
+        changed += cursor.rowcount
+        if closed is not None and cursor.rowcount:
+            # Only the projects this UPDATE closed; the re-check may have skipped some
+            cursor.execute(f"""
+                SELECT project_id FROM Research_Projects
+                WHERE project_id IN ({_placeholders(ids)}) AND status = 'In Progress'
+            """, ids)
+            closed.extend(row[0] for row in cursor.fetchall())
+        conn.commit()
+        chunks += 1
+    return changed, chunks
+
+
+def expire_pending(conn, chunk_size, dry_run=False, days=PENDING_EXPIRY_DAYS):
+    """Mark Pending applications older than ``days`` as Expired; returns ``(rows, chunks)``.
+
+    Oldest first through ``idx_applications_status_applied``. Each row still
+    fires the status-change log and stats triggers.
+    """
+    cursor = conn.cursor()
+    if dry_run:
+        cursor.execute(f"SELECT COUNT(*) FROM Applications WHERE {STALE_PENDING}", (days,))
+        stale = cursor.fetchone()[0]
+        return stale, _chunks(stale, chunk_size)
+
+    changed = chunks = 0
+    while True:
+        cursor.execute(f"""
+            UPDATE Applications
+            SET status = 'Expired', reviewed_at = CURRENT_TIMESTAMP
+            WHERE {STALE_PENDING}
+            ORDER BY applied_at, application_id
+            LIMIT %s
+        """, (days, chunk_size))
+        conn.commit()
+        if cursor.rowcount:
+            changed += cursor.rowcount
+            chunks += 1
+        if cursor.rowcount < chunk_size:
+            return changed, chunks
+
+
+def award_achievements(conn, chunk_size, dry_run=False):
+    """Award every accepted student of a Completed project once; returns ``(rows, chunks)``.
+
+    Chunks are ``chunk_size`` projects. ``uq_achievement`` makes the
+    ``INSERT IGNORE`` skip students who already have their achievement.
+    """
+    cursor = conn.cursor()
+    changed = chunks = 0
+    for ids in _id_chunks(cursor, UNAWARDED_PROJECTS, chunk_size):
+        if dry_run:
+            cursor.execute(f"""
+                SELECT COUNT(*)
+                FROM Applications a
+                LEFT JOIN Student_Achievements sa ON sa.student_id = a.student_id AND sa.project_id = a.project_id
+                WHERE a.project_id IN ({_placeholders(ids)}) AND a.status = 'Accepted' AND sa.id IS NULL
+            """, ids)
+            changed += cursor.fetchone()[0]
+        else:
+            cursor.execute(f"""
+                INSERT IGNORE INTO Student_Achievements (student_id, project_id, title, awarded_on)
+                SELECT a.student_id, p.project_id, CONCAT('Completed: ', p.title), NOW()
+                FROM Research_Projects p
+                JOIN Applications a ON a.project_id = p.project_id AND a.status = 'Accepted'
+                WHERE p.project_id IN ({_placeholders(ids)}) AND p.status = 'Completed'
+            """, ids)
+            changed += cursor.rowcount
+            conn.commit()
+        chunks += 1
+    return changed, chunks
+
+
+def ensure_log_partitions(conn, chunk_size, dry_run=False):
+    """Create missing monthly ``Application_Logs`` partitions; returns ``(partitions added, 1)``.
+
+    ``chunk_size`` is unused: the procedure adds at most a few partitions.
+    A dry run changes nothing and reports zero.
+    """
+    if dry_run:
+        return 0, 0
+    cursor = conn.cursor()
+    before = len(partitions(cursor))
+    ensure_partitions(conn)
+    return len(partitions(cursor)) - before, 1
+
+
+JOBS = {
+    "close_full_projects": close_full_projects,
+    "expire_pending": expire_pending,
+    "award_achievements": award_achievements,
+    "ensure_log_partitions": ensure_log_partitions,
+}
+
+
+def run_job(name, conn, chunk_size=JOB_CHUNK_SIZE, dry_run=False, **options):
+    """Run one job and return its report: job, started_at, rows, chunks, seconds, dry_run, error.
+
+    A failing chunk is rolled back and ends the job. Chunks committed before
+    it stay, and the next run carries on from there.
+    """
+    entry = {"job": name, "started_at": datetime.now(), "rows": 0, "chunks": 0, "dry_run": dry_run, "error": None}
+    started = time.perf_counter()
+    try:
+        entry["rows"], entry["chunks"] = JOBS[name](conn, chunk_size, dry_run, **options)
+    except Error as e:
+        entry["error"] = str(e)
+    finally:
+        conn.rollback()  # ends the dry run's read snapshot, or a failed chunk
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def _record(conn, report):
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT INTO Job_Runs (job, started_at, seconds, rows_changed, chunks, error) VALUES (%s, %s, %s, %s, %s, %s)",
+        [(e["job"], e["started_at"], e["seconds"], e["rows"], e["chunks"], (e["error"] or "")[:500] or None)
+         for e in report],
+    )
+    cursor.execute("DELETE FROM Job_Runs WHERE started_at < NOW() - INTERVAL %s DAY", (JOB_RUNS_KEEP_DAYS,))
+    conn.commit()
+
+
+def run_round(jobs=None, chunk_size=JOB_CHUNK_SIZE, dry_run=False, closed=None):
+    """Run ``jobs`` (default: all, in order) once under the database lock.
+
+    Returns one report per job, or None when another process holds the lock.
+    Real runs are recorded in ``Job_Runs``.
+    """
+    conn = get_connection()
+    if conn is None:
+        raise RuntimeError("No database connection available.")
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+        if not cursor.fetchone()[0]:
+            return None
+        try:
+            report = []
+            for name in jobs or JOBS:
+                options = {"closed": closed} if name == "close_full_projects" else {}
+                report.append(run_job(name, conn, chunk_size, dry_run, **options))
+            if not dry_run:
+                _record(conn, report)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchone()
+    finally:
+        conn.close()
+    return report
+
+
+def recent_runs(limit=20):
+    """The latest ``Job_Runs`` rows, newest first, for the admin panel."""
+    conn = get_read_connection()
+    if conn is None:
+        return []
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT job, started_at, seconds, rows_changed, chunks, error
+            FROM Job_Runs ORDER BY started_at DESC, id DESC LIMIT %s
+        """, (limit,))
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def _forget_closed(project_ids):
+    """Drop projects the job closed from this app process's caches and indexes."""
+    from cache import shared_cache
+    from search import forget_project
+    from skill_index import get_skill_index
+
+    shared_cache.invalidate("recruiting")
+    index = get_skill_index()
+    for project_id in project_ids:
+        if index is not None:
+            index.set_project_active(project_id, False)
+        forget_project(project_id)
+
+
+def run_forever(interval=JOB_INTERVAL, chunk_size=JOB_CHUNK_SIZE, in_app=False, stop=None):
+    """Run a round every ``interval`` seconds until ``stop`` is set."""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        closed = []
+        try:
+            report = run_round(chunk_size=chunk_size, closed=closed)
+        except Exception as e:  # keep the loop alive through a database outage
+            print(f"❌ Lifecycle jobs failed: {e}")
+        else:
+            for entry in report or []:
+                if entry["error"]:
+                    print(f"❌ Job {entry['job']} failed: {entry['error']}")
+            if in_app and closed:
+                _forget_closed(closed)
+        stop.wait(interval)
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_in_app():
+    """Start the job loop on a daemon thread, once per process, when ``JOBS_IN_APP`` is set."""
+    global _started
+    if not JOBS_IN_APP or _started:
+        return
+    with _start_lock:
+        if not _started:
+            threading.Thread(target=run_forever, kwargs={"in_app": True}, name="lifecycle-jobs", daemon=True).start()
+            _started = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--once", action="store_true", help="run a single round and exit")
+    parser.add_argument("--dry-run", action="store_true", help="count what each job would change (implies --once)")
+    parser.add_argument("--only", action="append", choices=list(JOBS), help="run just this job (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=JOB_CHUNK_SIZE)
+    parser.add_argument("--interval", type=float, default=JOB_INTERVAL)
+    args = parser.parse_args()
+
+    if not (args.once or args.dry_run):
+        print(f"🕒 Running lifecycle jobs every {args.interval:.0f}s (Ctrl+C to stop)")
+        try:
+            run_forever(args.interval, args.chunk_size)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    report = run_round(args.only, args.chunk_size, args.dry_run)
+    if report is None:
+        print("⏳ Another process is running the lifecycle jobs; try again later.")
+        return
+    for entry in report:
+        verb = "would change" if entry["dry_run"] else "changed"
+        print(f"🕒 {entry['job']}: {verb} {entry['rows']} rows in {entry['chunks']} chunk(s), {entry['seconds']:.2f}s"
+              + (f" ❌ {entry['error']}" if entry["error"] else ""))
+
+
+if __name__ == "__main__":
+    main()
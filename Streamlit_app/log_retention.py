@@ -0,0 +1,159 @@
+"""Application_Logs retention: archive whole months to files, then drop them.
+
+Application_Logs is partitioned by ``changed_at`` month (see
+``Database.sql``). This job first makes sure partitions exist for the coming
+``LOG_PARTITIONS_AHEAD`` months. Every month older than
+``LOG_RETENTION_MONTHS`` is then streamed out of its partition in chunks and
+written to ``LOG_ARCHIVE_DIR`` as gzip-compressed CSV or Parquet. The
+partition is dropped only when the file holds every row, which is a metadata
+operation instead of a large DELETE. Run it from cron or by hand:
+
+    python -m log_retention --dry-run
+    python -m log_retention --keep-months 6 --format parquet
+"""
+import argparse
+import gzip
+import os
+import time
+from datetime import date
+
+import pandas as pd
+
+from config import LOG_ARCHIVE_DIR, LOG_ARCHIVE_FORMAT, LOG_PARTITIONS_AHEAD, LOG_RETENTION_MONTHS
+from db import get_connection
+
+COLUMNS = ["id", "application_id", "student_id", "project_id", "old_status", "new_status", "changed_at"]
+CHUNK_SIZE = 50_000
+EXTENSIONS = {"csv": "csv.gz", "parquet": "parquet"}
+
+
+def ensure_partitions(conn, months_ahead=LOG_PARTITIONS_AHEAD):
+    cursor = conn.cursor()
+    cursor.callproc("ensure_log_partitions", (months_ahead,))
+    conn.commit()
+
+
+def partitions(cursor):
+    """``[(name, upper_bound, approx_rows)]`` of the monthly partitions, oldest first."""
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Application_Logs'
+          AND PARTITION_DESCRIPTION <> 'MAXVALUE'
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """)
+    return [(name, date.fromisoformat(bound.strip("'")[:10]), rows) for name, bound, rows in cursor.fetchall()]
+
+
+def retention_cutoff(keep_months, today=None):
+    """First day of the oldest month kept: partitions ending on or before it expire."""
+    today = today or date.today()
+    months = today.year * 12 + today.month - 1 - keep_months
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _frames(cursor, chunk_size):
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield pd.DataFrame(rows, columns=COLUMNS)
+
+
+def archive_partition(conn, name, dest_dir, fmt, chunk_size=CHUNK_SIZE):
+    """Write one partition to ``dest_dir``; returns ``(path, rows written)``.
+
+    Rows are read through an unbuffered cursor ``chunk_size`` at a time and
+    appended to the file chunk by chunk (a row group each for Parquet). The
+    file is written under a temporary name and renamed once complete.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    path = os.path.join(dest_dir, f"application_logs_{name[1:]}.{EXTENSIONS[fmt]}")
+    partial = path + ".part"
+    cursor = conn.cursor()
+    # name comes from INFORMATION_SCHEMA, not from user input
+    cursor.execute(f"SELECT {', '.join(COLUMNS)} FROM Application_Logs PARTITION ({name}) ORDER BY changed_at, id")
+
+    written = 0
+    if fmt == "csv":
+        with gzip.open(partial, "wt", newline="", encoding="utf-8") as out:
+            for frame in _frames(cursor, chunk_size):
+                frame.to_csv(out, header=written == 0, index=False)
+                written += len(frame)
+            if written == 0:
+                pd.DataFrame(columns=COLUMNS).to_csv(out, index=False)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # A fixed schema, since a chunk where a column is all NULL would infer another type
+        schema = pa.schema([(column, pa.int64()) for column in COLUMNS[:4]]
+                           + [("old_status", pa.string()), ("new_status", pa.string()),
+                              ("changed_at", pa.timestamp("us"))])
+        # One row group per chunk, so only chunk_size rows are in memory at a time
+        with pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+            for frame in _frames(cursor, chunk_size):
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+                written += len(frame)
+    os.replace(partial, path)
+    return path, written
+
+
+def run(keep_months=LOG_RETENTION_MONTHS, dest_dir=LOG_ARCHIVE_DIR, fmt=LOG_ARCHIVE_FORMAT,
+        months_ahead=LOG_PARTITIONS_AHEAD, dry_run=False):
+    """Archive and drop every expired month; returns one report dict per partition handled."""
+    conn = get_connection()
+    if conn is None:
+        raise RuntimeError("No database connection available.")
+    report = []
+    try:
+        if not dry_run:
+            ensure_partitions(conn, months_ahead)
+        cursor = conn.cursor()
+        cutoff = retention_cutoff(keep_months)
+        for name, bound, approx_rows in partitions(cursor):
+            if bound > cutoff:
+                break
+            entry = {"partition": name, "before": bound.isoformat(), "rows": approx_rows, "action": "would archive"}
+            if not dry_run:
+                started = time.perf_counter()
+                path, written = archive_partition(conn, name, dest_dir, fmt)
+                cursor.execute(f"SELECT COUNT(*) FROM Application_Logs PARTITION ({name})")
+                in_table = cursor.fetchone()[0]
+                if written != in_table:
+                    entry.update(rows=written, action=f"kept: archived {written} of {in_table} rows", path=path)
+                    report.append(entry)
+                    continue
+                cursor.execute(f"ALTER TABLE Application_Logs DROP PARTITION {name}")
+                entry.update(rows=written, action="archived and dropped", path=path,
+                             seconds=round(time.perf_counter() - started, 2))
+            report.append(entry)
+    finally:
+        conn.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep-months", type=int, default=LOG_RETENTION_MONTHS)
+    parser.add_argument("--dest", default=LOG_ARCHIVE_DIR)
+    parser.add_argument("--format", choices=sorted(EXTENSIONS), default=LOG_ARCHIVE_FORMAT)
+    parser.add_argument("--months-ahead", type=int, default=LOG_PARTITIONS_AHEAD)
+    parser.add_argument("--dry-run", action="store_true", help="list expired partitions without touching them")
+    args = parser.parse_args()
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401  (pandas' Parquet engine; not in requirements.txt)
+        except ImportError:
+            parser.error("--format parquet needs pyarrow: pip install pyarrow")
+
+    report = run(args.keep_months, args.dest, args.format, args.months_ahead, args.dry_run)
+    if not report:
+        print(f"✅ Nothing older than {retention_cutoff(args.keep_months)} to archive.")
+    for entry in report:
+        print(f"📦 {entry['partition']} (before {entry['before']}): {entry['rows']} rows, {entry['action']}"
+              + (f" -> {entry['path']}" if "path" in entry else ""))
+
+
+if __name__ == "__main__":
+    main()
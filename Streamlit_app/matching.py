@@ -0,0 +1,55 @@
+"""Skill-based student ranking for research projects.
+
+Scores are computed with one grouped join over ``Project_Skills`` and
+``Student_Skills`` (driven from the project side via
+``idx_student_skills_skill``), weighted by ``Skill_Category_Weights``.
+The same SQL backs the ``RankStudentsForProject`` /
+``RankStudentsForRecruitingProjects`` procedures in ``Database.sql``.
+"""
+from config import MATCH_TOP_K
+
+
+def rank_students_for_projects(cursor, project_ids, top_k=MATCH_TOP_K):
+    """Top-``top_k`` matching students for each project, in one query.
+
+    Returns ``{project_id: [row, ...]}`` ordered best match first; each row
+    carries ``student_id``, name, ``major``, ``gpa``, ``match_count``
+    (shared skills) and ``match_score`` (category-weighted).
+    """
+    if not project_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    cursor.execute(f"""
+        WITH scores AS (
+            SELECT ps.project_id, ss.student_id,
+                   COUNT(*) AS match_count,
+                   SUM(COALESCE(w.weight, 1.00)) AS match_score
+            FROM Project_Skills ps
+            JOIN Skills sk ON sk.skill_id = ps.skill_id
+            LEFT JOIN Skill_Category_Weights w ON w.category = sk.category
+            JOIN Student_Skills ss ON ss.skill_id = ps.skill_id
+            WHERE ps.project_id IN ({placeholders})
+            GROUP BY ps.project_id, ss.student_id
+        ), ranked AS (
+            SELECT scores.*,
+                   ROW_NUMBER() OVER (PARTITION BY project_id
+                                      ORDER BY match_score DESC, match_count DESC, student_id) AS match_rank
+            FROM scores
+        )
+        SELECT r.project_id, r.student_id, s.first_name, s.last_name, s.major, s.gpa,
+               r.match_count, r.match_score
+        FROM ranked r
+        JOIN Students s ON s.student_id = r.student_id
+        WHERE r.match_rank <= %s
+        ORDER BY r.project_id, r.match_rank
+    """, (*project_ids, top_k))
+
+    ranked = {}
+    for row in cursor.fetchall():
+        ranked.setdefault(row["project_id"], []).append(row)
+    return ranked
+
+
+def rank_students_for_project(cursor, project_id, top_k=MATCH_TOP_K):
+    """Top-``top_k`` matching students for a single project."""
+    return rank_students_for_projects(cursor, [project_id], top_k).get(project_id, [])
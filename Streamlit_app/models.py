@@ -0,0 +1,65 @@
+"""Typed rows returned by the repositories in ``repos.py``.
+
+Rows are namedtuples: attribute access, no per-row ``__dict__`` and
+immutable, which suits rows that are shared through the caches. Columns a
+query does not select default to ``None`` (e.g. ``Project.relevance`` is only
+filled by search); use ``row._replace(...)`` to derive a copy.
+"""
+from collections import namedtuple
+
+
+def _row(name, fields):
+    return namedtuple(name, fields, defaults=[None] * len(fields))
+
+
+Student = _row("Student", [
+    "student_id", "first_name", "last_name", "email", "major", "gpa", "year_level",
+    "research_interests", "created_at",
+])
+
+Faculty = _row("Faculty", [
+    "faculty_id", "first_name", "last_name", "email", "department", "research_areas", "created_at",
+])
+
+Skill = _row("Skill", ["skill_id", "skill_name", "category"])
+
+# Projects come back in several shapes (admin listing, faculty listing, student
+# grid/search); one type covers them all. The counts come from Project_Stats.
+Project = _row("Project", [
+    "project_id", "title", "description", "status", "max_students", "created_at", "faculty_id",
+    "first_name", "last_name", "department", "app_count", "pending_count", "member_count",
+    "application_id", "application_status", "relevance",
+])
+
+# A student's own application, with the project title and supervising faculty
+Application = _row("Application", [
+    "application_id", "status", "applied_at", "title", "project_id", "first_name", "last_name",
+])
+
+# An application as seen by the faculty member reviewing it; the bulk review
+# listing also fills in the student's GPA, project title and shared skill count
+Applicant = _row("Applicant", [
+    "application_id", "project_id", "status", "first_name", "last_name", "major",
+    "student_id", "gpa", "title", "applied_at", "match_count",
+])
+
+# Outcome of reviewing one application (``accept_applications`` / ``review_applications``):
+# accepted | already_accepted | withdrawn | full | rejected | not_pending | not_found
+ReviewResult = _row("ReviewResult", [
+    "application_id", "project_id", "outcome", "member_count", "max_students", "project_status",
+])
+
+# One Application_Logs entry, with the student's name and project title
+# (None once the student or project has been deleted)
+LogEntry = _row("LogEntry", [
+    "id", "application_id", "student_id", "project_id", "old_status", "new_status", "changed_at",
+    "first_name", "last_name", "title",
+])
+
+Candidate = _row("Candidate", [
+    "project_id", "student_id", "first_name", "last_name", "major", "gpa", "match_count", "match_score",
+])
+
+PlatformStats = _row("PlatformStats", [
+    "total_students", "total_faculty", "total_projects", "pending_applications",
+])
@@ -1,25 +1,26 @@
+import io
+import os
+from datetime import timedelta
+
 import streamlit as st
-import mysql.connector
-from db import get_connection
+from mysql.connector import Error
+from cache import shared_cache
+from db import pool_stats
+from components import fragment, page_cursor, pager, require_login
+from repos import FacultyRepo, LogRepo, ProjectRepo, StatsRepo, StudentRepo
+from config import LOG_RETENTION_MONTHS, PROFILE_QUERIES
+from auth import AuthBusy
+from bulk_import import SPECS, import_csv
+from export import DATASETS, FORMATS, export_to_file, sweep_exports
+import jobs
+from profiling import begin_run, export_json, page_summary, recent_runs
+import sessions
 
 st.set_page_config(page_title="Research Connect", layout="wide")
+begin_run("Admin_Dashboard")
 
-# Check if user is logged in
-if "user" not in st.session_state or st.session_state["user"] is None:
-    st.error("⚠️ Please log in first.")
-    st.stop()
-
-# Check if user is admin
-if st.session_state.get("role") != "admin":
-    st.error("⚠️ Access denied. Admin privileges required.")
-    st.stop()
-
-try:
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-except Exception as e:
-    st.error(f"Database connection failed: {e}")
-    st.stop()
+# Only a signed-in admin gets past this line
+session = require_login("admin")
 
 # Add background + card style
 st.markdown("""
@@ -40,8 +41,9 @@ p, label { color: #d1d5db !important; }
 st.title("🛠️ Admin Dashboard")
 
 # Get admin info
-admin_id = st.session_state.get("user_id")
-admin_name = f"{st.session_state['user']['first_name']} {st.session_state['user']['last_name']}"
+admin_id = session.user_id
+faculty_repo, students_repo, projects_repo = FacultyRepo(), StudentRepo(), ProjectRepo()
+admin_name = session.name
 
 st.markdown(f"### Welcome, {admin_name}!")
 
@@ -49,152 +51,360 @@ st.markdown(f"### Welcome, {admin_name}!")
 st.markdown("<div class='card'>", unsafe_allow_html=True)
 st.markdown("### 📊 Platform Statistics")
 
+stats = StatsRepo().platform()
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    cursor.execute("SELECT COUNT(*) as count FROM Students")
-    student_count = cursor.fetchone()['count']
-    st.metric("Total Students", student_count)
+    st.metric("Total Students", stats.total_students)
 
 with col2:
-    cursor.execute("SELECT COUNT(*) as count FROM Faculty")
-    faculty_count = cursor.fetchone()['count']
-    st.metric("Total Faculty", faculty_count)
+    st.metric("Total Faculty", stats.total_faculty)
 
 with col3:
-    cursor.execute("SELECT COUNT(*) as count FROM Research_Projects")
-    project_count = cursor.fetchone()['count']
-    st.metric("Total Projects", project_count)
+    st.metric("Total Projects", stats.total_projects)
 
 with col4:
-    cursor.execute("SELECT COUNT(*) as count FROM Applications WHERE status='Pending'")
-    pending_count = cursor.fetchone()['count']
-    st.metric("Pending Applications", pending_count)
+    st.metric("Pending Applications", stats.pending_applications)
 
 st.markdown("</div>", unsafe_allow_html=True)
 
 st.divider()
 
+# Filter values used by several sections below
+departments = shared_cache.get_or_load(("filter_values", "Faculty", "department"), faculty_repo.departments)
+majors = shared_cache.get_or_load(("filter_values", "Students", "major"), students_repo.majors)
+
 # --- MANAGE FACULTY ---
-st.markdown("### 👩‍🏫 Manage Faculty")
-cursor.execute("SELECT * FROM Faculty ORDER BY created_at DESC")
-faculty_list = cursor.fetchall()
-
-if not faculty_list:
-    st.info("No faculty members registered yet.")
-else:
-    for f in faculty_list:
-        with st.expander(f"👤 {f['first_name']} {f['last_name']} — {f['department']}"):
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.write(f"**Email:** {f['email']}")
-                st.write(f"**Research Areas:** {f.get('research_areas', 'Not specified')}")
-                st.write(f"**Joined:** {f['created_at'].strftime('%Y-%m-%d')}")
-                
-                # Show faculty's projects
-                cursor.execute("SELECT COUNT(*) as count FROM Research_Projects WHERE faculty_id=%s", (f['faculty_id'],))
-                proj_count = cursor.fetchone()['count']
-                st.write(f"**Projects:** {proj_count}")
-            
-            with col2:
-                st.markdown("<div class='delete-btn'>", unsafe_allow_html=True)
-                if st.button("❌ Delete", key=f"del_fac_{f['faculty_id']}"):
-                    try:
-                        cursor2 = conn.cursor()
-                        cursor2.execute("DELETE FROM Faculty WHERE faculty_id=%s", (f["faculty_id"],))
-                        conn.commit()
-                        st.success("Faculty deleted successfully.")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error deleting faculty: {e}")
-                st.markdown("</div>", unsafe_allow_html=True)
+@fragment
+def manage_faculty():
+    """Faculty listing; filters, paging and deletes rerun only this section."""
+    st.markdown("### 👩‍🏫 Manage Faculty")
+    fac_dept = st.selectbox("Department", ["All"] + departments, key="faculty_department")
+    fac_dept = None if fac_dept == "All" else fac_dept
+    faculty_page = faculty_repo.list(department=fac_dept, after=page_cursor("faculty", (fac_dept,)))
+    faculty_list = faculty_page.rows
+    project_counts = faculty_repo.project_counts([f.faculty_id for f in faculty_list])
+
+    if not faculty_list:
+        st.info("No faculty members registered yet.")
+    else:
+        for f in faculty_list:
+            with st.expander(f"👤 {f.first_name} {f.last_name} — {f.department}"):
+                col1, col2 = st.columns([3, 1])
+
+                with col1:
+                    st.write(f"**Email:** {f.email}")
+                    st.write(f"**Research Areas:** {f.research_areas or 'Not specified'}")
+                    st.write(f"**Joined:** {f.created_at.strftime('%Y-%m-%d')}")
+
+                    # Show faculty's projects
+                    st.write(f"**Projects:** {project_counts.get(f.faculty_id, 0)}")
+
+                with col2:
+                    st.markdown("<div class='delete-btn'>", unsafe_allow_html=True)
+                    if st.button("❌ Delete", key=f"del_fac_{f.faculty_id}"):
+                        try:
+                            faculty_repo.delete(f.faculty_id)
+                            shared_cache.invalidate("recruiting")
+                            shared_cache.invalidate("filter_values")
+                            st.success("Faculty deleted successfully.")
+                            st.rerun(scope="fragment")
+                        except Exception as e:
+                            st.error(f"Error deleting faculty: {e}")
+                    st.markdown("</div>", unsafe_allow_html=True)
+        pager("faculty", faculty_page, scope="fragment")
+
+
+manage_faculty()
 
 st.divider()
 
 # --- MANAGE STUDENTS ---
-st.markdown("### 🎓 Manage Students")
-cursor.execute("SELECT * FROM Students ORDER BY created_at DESC")
-student_list = cursor.fetchall()
-
-if not student_list:
-    st.info("No students registered yet.")
-else:
-    for s in student_list:
-        with st.expander(f"👤 {s['first_name']} {s['last_name']} — {s.get('major', 'Major not set')}"):
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.write(f"**Email:** {s['email']}")
-                st.write(f"**GPA:** {s.get('gpa', 'N/A')} | **Year:** {s.get('year_level', 'N/A')}")
-                st.write(f"**Research Interests:** {s.get('research_interests', 'Not specified')}")
-                st.write(f"**Joined:** {s['created_at'].strftime('%Y-%m-%d')}")
-                
-                # Show student's applications
-                cursor.execute("SELECT COUNT(*) as count FROM Applications WHERE student_id=%s", (s['student_id'],))
-                app_count = cursor.fetchone()['count']
-                st.write(f"**Applications:** {app_count}")
-            
-            with col2:
-                st.markdown("<div class='delete-btn'>", unsafe_allow_html=True)
-                if st.button("❌ Delete", key=f"del_stu_{s['student_id']}"):
+@fragment
+def manage_students():
+    """Student listing; filters, paging and deletes rerun only this section."""
+    st.markdown("### 🎓 Manage Students")
+    stu_major = st.selectbox("Major", ["All"] + majors, key="students_major")
+    stu_major = None if stu_major == "All" else stu_major
+    student_page = students_repo.list(major=stu_major, after=page_cursor("students", (stu_major,)))
+    student_list = student_page.rows
+    application_counts = students_repo.application_counts([s.student_id for s in student_list])
+
+    if not student_list:
+        st.info("No students registered yet.")
+    else:
+        for s in student_list:
+            with st.expander(f"👤 {s.first_name} {s.last_name} — {s.major or 'Major not set'}"):
+                col1, col2 = st.columns([3, 1])
+
+                with col1:
+                    st.write(f"**Email:** {s.email}")
+                    st.write(f"**GPA:** {s.gpa if s.gpa is not None else 'N/A'} | **Year:** {s.year_level or 'N/A'}")
+                    st.write(f"**Research Interests:** {s.research_interests or 'Not specified'}")
+                    st.write(f"**Joined:** {s.created_at.strftime('%Y-%m-%d')}")
+
+                    # Show student's applications
+                    st.write(f"**Applications:** {application_counts.get(s.student_id, 0)}")
+
+                with col2:
+                    st.markdown("<div class='delete-btn'>", unsafe_allow_html=True)
+                    if st.button("❌ Delete", key=f"del_stu_{s.student_id}"):
+                        try:
+                            students_repo.delete(s.student_id)
+                            shared_cache.invalidate("filter_values")
+                            st.success("Student deleted successfully.")
+                            st.rerun(scope="fragment")
+                        except Exception as e:
+                            st.error(f"Error deleting student: {e}")
+                    st.markdown("</div>", unsafe_allow_html=True)
+        pager("students", student_page, scope="fragment")
+
+
+manage_students()
+
+st.divider()
+
+# --- ALL PROJECTS ---
+@fragment
+def all_projects():
+    """Project listing; filters, paging and deletes rerun only this section."""
+    st.markdown("### 📚 All Research Projects")
+    col1, col2 = st.columns(2)
+    with col1:
+        proj_status = st.selectbox("Status", ["All", "Recruiting", "In Progress", "Completed", "Cancelled"], key="projects_status")
+        proj_status = None if proj_status == "All" else proj_status
+    with col2:
+        proj_dept = st.selectbox("Faculty department", ["All"] + departments, key="projects_department")
+        proj_dept = None if proj_dept == "All" else proj_dept
+    project_page = projects_repo.list(
+        status=proj_status, department=proj_dept,
+        after=page_cursor("projects", (proj_status, proj_dept)),
+    )
+    project_list = project_page.rows
+
+    if not project_list:
+        st.info("No projects created yet.")
+    else:
+        for p in project_list:
+            status_emoji = {
+                'Recruiting': '📢',
+                'In Progress': '🔄',
+                'Completed': '✅',
+                'Cancelled': '❌'
+            }.get(p.status, '📋')
+
+            with st.expander(f"{status_emoji} {p.title} — {p.status}"):
+                st.write(f"**Faculty:** {p.first_name} {p.last_name} ({p.department})")
+                st.write(f"**Description:** {p.description}")
+                st.write(f"**Max Students:** {p.max_students}")
+                st.write(f"**Applications:** {p.app_count or 0} ({p.pending_count or 0} pending)")
+                st.write(f"**Members:** {p.member_count or 0}/{p.max_students}")
+                st.write(f"**Created:** {p.created_at.strftime('%Y-%m-%d')}")
+
+                # Option to delete project
+                if st.button("🗑️ Delete Project", key=f"del_proj_{p.project_id}"):
                     try:
-                        cursor2 = conn.cursor()
-                        cursor2.execute("DELETE FROM Students WHERE student_id=%s", (s["student_id"],))
-                        conn.commit()
-                        st.success("Student deleted successfully.")
-                        st.rerun()
+                        projects_repo.delete(p.project_id)
+                        shared_cache.invalidate("recruiting")
+                        st.success("Project deleted successfully.")
+                        st.rerun(scope="fragment")
                     except Exception as e:
-                        st.error(f"Error deleting student: {e}")
-                st.markdown("</div>", unsafe_allow_html=True)
+                        st.error(f"Error deleting project: {e}")
+        pager("projects", project_page, scope="fragment")
+
+
+all_projects()
 
 st.divider()
 
-# --- ALL PROJECTS ---
-st.markdown("### 📚 All Research Projects")
-cursor.execute("""
-    SELECT p.*, f.first_name, f.last_name, f.department,
-           (SELECT COUNT(*) FROM Applications WHERE project_id = p.project_id) as app_count
-    FROM Research_Projects p
-    JOIN Faculty f ON p.faculty_id = f.faculty_id
-    ORDER BY p.created_at DESC
-""")
-project_list = cursor.fetchall()
-
-if not project_list:
-    st.info("No projects created yet.")
-else:
-    for p in project_list:
-        status_emoji = {
-            'Recruiting': '📢',
-            'In Progress': '🔄',
-            'Completed': '✅',
-            'Cancelled': '❌'
-        }.get(p['status'], '📋')
-        
-        with st.expander(f"{status_emoji} {p['title']} — {p['status']}"):
-            st.write(f"**Faculty:** {p['first_name']} {p['last_name']} ({p['department']})")
-            st.write(f"**Description:** {p['description']}")
-            st.write(f"**Max Students:** {p['max_students']}")
-            st.write(f"**Applications:** {p['app_count']}")
-            st.write(f"**Created:** {p['created_at'].strftime('%Y-%m-%d')}")
-            
-            # Option to delete project
-            if st.button("🗑️ Delete Project", key=f"del_proj_{p['project_id']}"):
-                try:
-                    cursor2 = conn.cursor()
-                    cursor2.execute("DELETE FROM Research_Projects WHERE project_id=%s", (p["project_id"],))
-                    conn.commit()
-                    st.success("Project deleted successfully.")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error deleting project: {e}")
+# --- APPLICATION HISTORY ---
+@fragment
+def application_history():
+    """Status-change log with its own filters and pager."""
+    st.markdown("### 🧾 Application History")
+    st.caption(f"Status changes from the last {LOG_RETENTION_MONTHS} months; older months are archived by log_retention.py.")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        log_student = st.number_input("Student ID (0 = all)", min_value=0, step=1, key="logs_student") or None
+    with col2:
+        log_project = st.number_input("Project ID (0 = all)", min_value=0, step=1, key="logs_project") or None
+    with col3:
+        log_since = st.date_input("From", value=None, key="logs_since")
+    with col4:
+        log_until = st.date_input("Until (inclusive)", value=None, key="logs_until")
+    log_until_exclusive = log_until + timedelta(days=1) if log_until else None
+    log_page = LogRepo().history(
+        student_id=log_student, project_id=log_project, since=log_since, until=log_until_exclusive,
+        after=page_cursor("logs", (log_student, log_project, log_since, log_until)),
+    )
+
+    if not log_page.rows:
+        st.info("No status changes recorded for these filters.")
+    else:
+        st.dataframe([{
+            "Changed": e.changed_at,
+            "Application": e.application_id,
+            "Student": f"{e.first_name} {e.last_name}" if e.first_name else f"#{e.student_id} (deleted)",
+            "Project": e.title or f"#{e.project_id} (deleted)",
+            "From": e.old_status,
+            "To": e.new_status,
+        } for e in log_page.rows], use_container_width=True, hide_index=True)
+        pager("logs", log_page, scope="fragment")
+
+
+application_history()
+
+st.divider()
+
+# --- BULK IMPORT ---
+@fragment
+def bulk_import():
+    """CSV upload and the last import report."""
+    st.markdown("### 📥 Bulk Import")
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        import_kind = st.selectbox("Import", list(SPECS), format_func=str.title, key="import_kind")
+        spec = SPECS[import_kind]
+        st.caption("Columns: " + ", ".join(spec.columns) + (", password (blank = generated)" if spec.account else ""))
+    with col2:
+        upload = st.file_uploader("CSV file with a header row", type=["csv"], key="import_file")
+
+    if upload is not None and st.button("📥 Import", key="import_run"):
+        try:
+            with st.spinner("Importing..."):
+                report = import_csv(import_kind, io.TextIOWrapper(upload, encoding="utf-8-sig", newline=""),
+                                    admin_id=admin_id)
+        except (ValueError, AuthBusy) as e:
+            st.error(f"⚠️ {e}")
+        except Error as e:
+            shared_cache.invalidate("filter_values")
+            shared_cache.invalidate("skills")
+            st.error(f"⚠️ Import stopped by a database error; batches before it were committed. {e}")
+        else:
+            shared_cache.invalidate("filter_values")
+            shared_cache.invalidate("skills")
+            st.session_state["import_report"] = report
+
+    report = st.session_state.get("import_report")
+    if report:
+        st.success(f"✅ Imported {report.inserted} of {report.rows} rows in {report.seconds:.1f}s "
+                   f"({report.rows_per_second():,.0f} rows/s).")
+        col1, col2 = st.columns(2)
+        with col1:
+            if report.errors:
+                st.download_button(f"⬇️ Error report ({len(report.errors)} rows)", report.errors_csv(),
+                                   file_name="import_errors.csv", mime="text/csv", key="import_errors")
+        with col2:
+            if report.credentials:
+                st.download_button(f"🔑 Initial passwords ({len(report.credentials)})", report.credentials_csv(),
+                                   file_name="initial_passwords.csv", mime="text/csv", key="import_credentials")
+        if report.errors:
+            st.dataframe([{"Line": line, "Key": key, "Error": message} for line, key, message in report.errors[:200]],
+                         use_container_width=True, hide_index=True)
+
+
+bulk_import()
+
+st.divider()
+
+# --- EXPORT ---
+# Rows stream from an unbuffered cursor into a temporary file chunk by chunk,
+# so even a full Applications export never sits in Python lists. The finished
+# file is handed to the download button once, in the run that prepared it:
+# Streamlit keeps that payload in server memory until the next rerun, so
+# keeping the button around would load the file again on every rerun.
+@fragment
+def export_data():
+    """Export builder; preparing a file reruns only this section."""
+    st.markdown("### 📤 Export Data")
+    export_statuses = {
+        "projects": ["Recruiting", "In Progress", "Completed", "Cancelled"],
+        "applications": ["Pending", "Accepted", "Rejected", "Withdrawn", "Expired"],
+    }
+    col1, col2 = st.columns(2)
+    with col1:
+        export_name = st.selectbox("Table", list(DATASETS), key="export_dataset",
+                                   format_func=lambda name: name.replace("_", " ").title())
+    with col2:
+        export_format = st.selectbox("Format", list(FORMATS), key="export_format",
+                                     format_func={"csv": "CSV", "csv.gz": "CSV (gzip)", "xlsx": "Excel (.xlsx)"}.get)
+
+    export_filters = {}
+    filter_names = list(DATASETS[export_name].filters)
+    for col, name in zip(st.columns(len(filter_names)), filter_names):
+        with col:
+            widget_key = f"export_{export_name}_{name}"
+            if name in ("since", "until"):
+                day = st.date_input("From" if name == "since" else "Until (inclusive)", value=None, key=widget_key)
+                export_filters[name] = day + timedelta(days=1) if day and name == "until" else day
+            elif name in ("status", "major", "department"):
+                options = {"status": export_statuses.get(export_name), "major": majors, "department": departments}[name]
+                choice = st.selectbox(name.title(), ["All"] + options, key=widget_key)
+                export_filters[name] = None if choice == "All" else choice
+            else:
+                label = f"{name.replace('_', ' ').title()} (0 = all)"
+                export_filters[name] = st.number_input(label, min_value=0, step=1, key=widget_key) or None
+
+    if st.button("📦 Prepare export", key="export_prepare"):
+        sweep_exports()  # files left behind by a run that failed before handing them over
+        extension, mime = FORMATS[export_format]
+        try:
+            path, rows = export_to_file(export_name, export_filters, export_format)
+        except RuntimeError as e:
+            st.error(f"⚠️ {e}")
+        except Error as e:
+            st.error(f"❌ Export failed: {e}")
+        else:
+            file_name = f"{export_name}.{extension}"
+            try:
+                with open(path, "rb") as exported:
+                    st.download_button(f"⬇️ Download {file_name} ({rows} rows)", exported,
+                                       file_name=file_name, mime=mime, key="export_download")
+            finally:
+                os.remove(path)  # the button now holds its own copy
+            st.caption("The download is offered until the next action on this page; "
+                       "prepare the export again if it disappears.")
+
+
+export_data()
+
+# --- SYSTEM METRICS ---
+with st.expander("⚙️ System Metrics"):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Connection pool**")
+        st.json(pool_stats())
+    with col2:
+        st.markdown("**Shared cache**")
+        st.json(shared_cache.stats())
+    st.markdown("**Background jobs** (latest runs; `python -m jobs --once --dry-run` previews the next one)")
+    job_runs = jobs.recent_runs()
+    if job_runs:
+        st.dataframe(job_runs, use_container_width=True, hide_index=True)
+    else:
+        st.caption("No job runs recorded yet.")
+
+if PROFILE_QUERIES:
+    with st.expander("🔬 Query Profiler"):
+        st.markdown("**Per page** (recent runs)")
+        st.dataframe([{"page": page, **agg} for page, agg in page_summary().items()], use_container_width=True)
+
+        st.markdown("**Recent runs**")
+        for run in recent_runs(20):
+            flags = ("⚠️ N+1 " if run["n_plus_one"] else "") + ("🐢 slow" if run["slow"] else "")
+            st.markdown(f"`{run['page']}` — {run['queries']} queries, {run['total_ms']:.1f} ms, "
+                        f"{run['rows']} rows {flags}")
+            for n1 in run["n_plus_one"]:
+                st.caption(f"{n1['count']}× at {n1['site']}: {n1['fingerprint'][:160]}")
+            for q in run["slow"]:
+                st.caption(f"{q['ms']:.0f} ms at {q['site']}: {q['fingerprint'][:160]}")
+
+        st.download_button("⬇️ Export JSON", export_json(), file_name="query_profile.json",
+                           mime="application/json")
 
 # --- LOGOUT BUTTON ---
 st.divider()
 if st.button("🚪 Logout", type="secondary"):
-    st.session_state.clear()
+    sessions.logout()
     st.success("Logged out successfully!")
-    st.switch_page("app.py")
-
-conn.close()
\ No newline at end of file
+    st.switch_page("app.py")
\ No newline at end of file
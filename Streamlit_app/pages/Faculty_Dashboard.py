@@ -1,25 +1,20 @@
 import streamlit as st
-import mysql.connector
-from db import get_connection
+import pandas as pd
+from collections import Counter
+from components import fragment, page_cursor, pager, require_login
+from cache import session_cache, shared_cache
+from config import REFERENCE_CACHE_TTL
+from repos import ApplicationRepo, FacultyRepo, ProjectRepo, SkillRepo
+from search import forget_project, remember_project
+from skill_index import get_skill_index
+from profiling import begin_run
+import sessions
 
 st.set_page_config(page_title="Research Connect", layout="wide")
+begin_run("Faculty_Dashboard")
 
-# Check if user is logged in
-if "user" not in st.session_state or st.session_state["user"] is None:
-    st.error("⚠️ Please log in first.")
-    st.stop()
-
-# Check if user is faculty
-if st.session_state.get("role") != "faculty":
-    st.error("⚠️ Access denied. Faculty privileges required.")
-    st.stop()
-
-try:
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-except Exception as e:
-    st.error(f"Database connection failed: {e}")
-    st.stop()
+# Only a signed-in faculty gets past this line
+session = require_login("faculty")
 
 # Add background + card style once
 st.markdown("""
@@ -47,39 +42,47 @@ p, label { color: #d1d5db !important; }
 </style>
 """, unsafe_allow_html=True)
 
-# Get faculty_id from session state
-faculty_id = st.session_state.get("user_id")
-
-if not faculty_id:
-    st.warning("⚠️ Please log in again — no faculty session found.")
-    st.stop()
+faculty_id = session.user_id
 
 st.title("👩‍🏫 Faculty Dashboard")
 
+my_cache = session_cache()
+faculty_repo, projects_repo, applications_repo, skills_repo = FacultyRepo(), ProjectRepo(), ApplicationRepo(), SkillRepo()
+
 # --- PROFILE CARD ---
-cursor.execute("SELECT * FROM Faculty WHERE faculty_id=%s", (faculty_id,))
-faculty = cursor.fetchone()
+faculty = my_cache.get_or_load(("profile",), lambda: faculty_repo.get(faculty_id))
 
 if not faculty:
     st.error("Faculty profile not found.")
     st.stop()
 
-st.markdown("<div class='card'><h3>👤 My Profile</h3>", unsafe_allow_html=True)
-col1, col2 = st.columns(2)
-with col1:
-    department = st.text_input("Department", value=faculty.get("department") or "")
-with col2:
-    research_areas = st.text_area("Research Interests", value=faculty.get("research_areas") or "")
-
-if st.button("💾 Update Profile"):
-    cursor.execute(
-        "UPDATE Faculty SET department=%s, research_areas=%s WHERE faculty_id=%s",
-        (department, research_areas, faculty_id)
-    )
-    conn.commit()
-    st.success("Profile updated!")
-    st.rerun()
-st.markdown("</div>", unsafe_allow_html=True)
+
+@fragment
+def profile_card(faculty):
+    """Profile editor; saving reruns only this card."""
+    faculty = my_cache.get_or_load(("profile",), lambda: faculty_repo.get(faculty_id)) or faculty
+    st.markdown("<div class='card'><h3>👤 My Profile</h3>", unsafe_allow_html=True)
+    profile_message = st.session_state.pop("profile_message", None)
+    if profile_message:
+        st.success(profile_message)
+    col1, col2 = st.columns(2)
+    with col1:
+        department = st.text_input("Department", value=faculty.department or "")
+    with col2:
+        research_areas = st.text_area("Research Interests", value=faculty.research_areas or "")
+
+    if st.button("💾 Update Profile"):
+        faculty_repo.update_profile(faculty_id, department, research_areas)
+        my_cache.invalidate("profile")
+        # Department appears in the shared project grid and filter lists
+        shared_cache.invalidate("recruiting")
+        shared_cache.invalidate("filter_values")
+        st.session_state["profile_message"] = "Profile updated!"
+        st.rerun(scope="fragment")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+profile_card(faculty)
 
 # --- CREATE NEW PROJECT CARD ---
 st.markdown("<div class='card'><h3>➕ Create New Project</h3>", unsafe_allow_html=True)
@@ -96,11 +99,8 @@ with st.form("create_project_form", clear_on_submit=True):
             st.warning("⚠️ Please fill in both title and description.")
         else:
             try:
-                cursor.execute("""
-                    INSERT INTO Research_Projects (title, description, status, max_students, faculty_id, admin_id)
-                    VALUES (%s, %s, 'Recruiting', %s, %s, NULL)
-                """, (proj_title, proj_description, proj_max_students, faculty_id))
-                conn.commit()
+                projects_repo.create(faculty_id, proj_title, proj_description, proj_max_students)
+                shared_cache.invalidate("recruiting")
                 st.success(f"✅ Project '{proj_title}' created successfully!")
                 st.rerun()
             except Exception as e:
@@ -108,12 +108,173 @@ with st.form("create_project_form", clear_on_submit=True):
 
 st.markdown("</div>", unsafe_allow_html=True)
 
-# Show faculty's own projects
-cursor.execute("SELECT * FROM Research_Projects WHERE faculty_id = %s", (faculty_id,))
-projects = cursor.fetchall()
+def project_stopped_recruiting(project_id):
+    """Drop a project from the shared grid, recommendations and search once it stops recruiting."""
+    shared_cache.invalidate("recruiting")
+    index = get_skill_index()
+    if index is not None:
+        index.set_project_active(project_id, False)
+    forget_project(project_id)
+
 
 st.subheader("📋 Your Projects")
 
+# Show faculty's own projects, one page at a time
+status_filter = st.selectbox("Filter by status", ["All", "Recruiting", "In Progress", "Completed"], key="my_projects_status")
+status_filter = None if status_filter == "All" else status_filter
+projects_page = projects_repo.list_for_faculty(
+    faculty_id, status=status_filter,
+    after=page_cursor("my_projects", (status_filter,)),
+)
+projects = projects_page.rows
+
+# Applicants for every project on this page, fetched once and grouped by project_id
+applicants_by_project = applications_repo.by_project(faculty_id, [p.project_id for p in projects])
+
+# Required skills for the projects on this page
+project_skill_ids = skills_repo.for_projects([p.project_id for p in projects])
+
+# Skill-matched candidates for the recruiting projects on this page, in one query
+candidates_by_project = projects_repo.top_candidates(
+    [p.project_id for p in projects if p.status == 'Recruiting']
+)
+
+# Cards refreshed by their own actions since the last full run: {project_id: card data}
+st.session_state["fresh_cards"] = {}
+
+
+def load_card(project_id):
+    """Re-read one card's data after an action on it (four queries, independent of page size)."""
+    proj = projects_repo.get_for_faculty(faculty_id, project_id)
+    if proj is None:
+        return None
+    candidates = projects_repo.top_candidates([project_id]) if proj.status == "Recruiting" else {}
+    return (
+        proj,
+        applications_repo.by_project(faculty_id, [project_id]).get(project_id, []),
+        skills_repo.for_projects([project_id]).get(project_id, []),
+        candidates.get(project_id, []),
+    )
+
+
+def refresh_card(project_id, message, level="success"):
+    """Rerun only the card the action came from, with freshly loaded data.
+
+    The rerun starts at once, so ``message`` is shown by the card's next run
+    (``level`` is the ``st`` function: success, warning, ...).
+    """
+    st.session_state["fresh_cards"][project_id] = load_card(project_id)
+    st.session_state[f"card_message_{project_id}"] = (level, message)
+    st.rerun(scope="fragment")
+
+
+@fragment
+def project_card(proj, applicants, skill_ids, candidates):
+    """One project card. Its buttons rerun just this card rather than the whole dashboard.
+
+    The arguments are the batched page data from the last full run; after an
+    action the card reloads its own row, applicants, skills and candidates.
+    """
+    fresh = st.session_state["fresh_cards"]
+    if proj.project_id in fresh:
+        if fresh[proj.project_id] is None:
+            st.info("This project no longer exists.")
+            return
+        proj, applicants, skill_ids, candidates = fresh[proj.project_id]
+    card_message = st.session_state.pop(f"card_message_{proj.project_id}", None)
+    if card_message:
+        level, message = card_message
+        getattr(st, level)(message)
+
+    st.markdown(f"""
+        <div class="card">
+            <h3>{proj.title}</h3>
+            <small>Status: <b>{proj.status}</b> · Pending: <b>{proj.pending_count or 0}</b>
+            · Members: <b>{proj.member_count or 0}/{proj.max_students}</b></small>
+            <p style="margin-top:10px;">{proj.description}...</p>
+        </div>
+    """, unsafe_allow_html=True)
+
+    new_status = st.selectbox(
+        "Change status",
+        ["Recruiting", "In Progress", "Completed"],
+        index=["Recruiting", "In Progress", "Completed"].index(proj.status),
+        key=f"status_{proj.project_id}"
+    )
+
+    if st.button("💾 Update", key=f"update_{proj.project_id}"):
+        projects_repo.set_status(proj.project_id, new_status)
+        if new_status == "Recruiting":
+            shared_cache.invalidate("recruiting")
+            index = get_skill_index()
+            if index is not None:
+                index.set_project_active(proj.project_id, True)
+            remember_project(proj.project_id)
+        else:
+            project_stopped_recruiting(proj.project_id)
+        refresh_card(proj.project_id, "✅ Status updated successfully!")
+
+    # --- Required skills ---
+    skills = shared_cache.get_or_load(("skills",), skills_repo.all, ttl=REFERENCE_CACHE_TTL)
+    skill_map = {s.skill_name: s.skill_id for s in skills}
+    skill_names = {s.skill_id: s.skill_name for s in skills}
+    current_skills = [skill_names[sid] for sid in skill_ids if sid in skill_names]
+    required = st.multiselect(
+        "Required skills", list(skill_map.keys()), default=current_skills,
+        key=f"skills_{proj.project_id}"
+    )
+    if st.button("🧠 Save Skills", key=f"save_skills_{proj.project_id}"):
+        required_ids = [skill_map[skill] for skill in required]
+        skills_repo.set_project_skills(proj.project_id, required_ids)
+        index = get_skill_index()
+        if index is not None:
+            index.update_project(proj.project_id, required_ids, active=proj.status == "Recruiting")
+        refresh_card(proj.project_id, "✅ Project skills updated!")
+
+    # --- Ranked candidates (recruiting projects only) ---
+    if proj.status == 'Recruiting':
+        st.markdown("<b>Top matching students:</b>", unsafe_allow_html=True)
+        if not candidates:
+            st.caption("No students share this project's skills yet.")
+        for c in candidates:
+            st.caption(
+                f"{c.first_name} {c.last_name} — {c.major or 'Major not set'} · "
+                f"{c.match_count} shared skill(s), score {c.match_score}"
+            )
+
+    # --- Applicants section in card ---
+    st.markdown("<b>Applicants:</b>", unsafe_allow_html=True)
+
+    if not applicants:
+        st.caption("No applicants yet.")
+    else:
+        for app in applicants:
+            st.markdown(f"• {app.first_name} {app.last_name} — {app.major} ({app.status})")
+            if app.status != "Pending":
+                continue  # decided already: nothing to approve or reject
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✅ Approve", key=f"approve_{app.application_id}"):
+                    result = applications_repo.accept(app.application_id)
+                    if result.outcome == "accepted":
+                        # Member and pending counts in the shared grid changed
+                        shared_cache.invalidate("recruiting")
+                        if result.project_status != proj.status:
+                            project_stopped_recruiting(proj.project_id)
+                        refresh_card(proj.project_id, "Approved!")
+                    elif result.outcome == "full":
+                        st.error(f"🚫 Project is full ({result.member_count}/{result.max_students} members).")
+                    else:
+                        st.warning(f"Not approved: application is {result.outcome.replace('_', ' ')}.")
+            with col2:
+                if st.button("❌ Reject", key=f"reject_{app.application_id}"):
+                    if applications_repo.reject(faculty_id, app.application_id):
+                        shared_cache.invalidate("recruiting")
+                        refresh_card(proj.project_id, "Rejected.", "warning")
+                    else:
+                        refresh_card(proj.project_id, "Not rejected: the application is no longer pending.", "info")
+
+
 if not projects:
     st.info("You haven't created any projects yet.")
 else:
@@ -121,61 +282,99 @@ else:
 
     for i, proj in enumerate(projects):
         with cols[i % 2]:
-            st.markdown(f"""
-                <div class="card">
-                    <h3>{proj['title']}</h3>
-                    <small>Status: <b>{proj['status']}</b></small>
-                    <p style="margin-top:10px;">{proj['description'][:150]}...</p>
-                </div>
-            """, unsafe_allow_html=True)
-
-            new_status = st.selectbox(
-                "Change status",
-                ["Recruiting", "In Progress", "Completed"],
-                index=["Recruiting", "In Progress", "Completed"].index(proj['status']),
-                key=f"status_{proj['project_id']}"
+            project_card(
+                proj,
+                applicants_by_project.get(proj.project_id, []),
+                project_skill_ids.get(proj.project_id, []),
+                candidates_by_project.get(proj.project_id, []),
             )
+    pager("my_projects", projects_page)
 
-            if st.button("💾 Update", key=f"update_{proj['project_id']}"):
-                cursor.execute("UPDATE Research_Projects SET status=%s WHERE project_id=%s", (new_status, proj['project_id']))
-                conn.commit()
-                st.success("✅ Status updated successfully!")
-                st.rerun()
+# --- BULK REVIEW ---
+# Decisions for many applicants go out as one transaction and cost one rerun;
+# the form keeps checkbox clicks from rerunning the page.
+@fragment
+def bulk_review():
+    """Filter and decide pending applications; the result changes many cards, so it reruns the page."""
+    st.divider()
+    st.subheader("🗂️ Bulk Review")
+    review_summary = st.session_state.pop("bulk_review_summary", None)
+    if review_summary:
+        st.success(review_summary)
 
-            # --- Applicants section in card ---
-            st.markdown("<b>Applicants:</b>", unsafe_allow_html=True)
-            cursor.execute("""
-                SELECT a.application_id, a.status, s.first_name, s.last_name, s.major
-                FROM Applications a
-                JOIN Students s ON a.student_id = s.student_id
-                WHERE a.project_id = %s
-            """, (proj['project_id'],))
-            applicants = cursor.fetchall()
-
-            if not applicants:
-                st.caption("No applicants yet.")
-            else:
-                for app in applicants:
-                    st.markdown(f"• {app['first_name']} {app['last_name']} — {app['major']} ({app['status']})")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("✅ Approve", key=f"approve_{app['application_id']}"):
-                            cursor.execute("CALL accept_application(%s)", (app['application_id'],))
-                            conn.commit()
-                            st.success("Approved!")
-                            st.rerun()
-                    with col2:
-                        if st.button("❌ Reject", key=f"reject_{app['application_id']}"):
-                            cursor.execute("UPDATE Applications SET status='Rejected' WHERE application_id=%s", (app['application_id'],))
-                            conn.commit()
-                            st.warning("Rejected.")
-                            st.rerun()
+    pending = applications_repo.pending_for_review(faculty_id)
+    if not pending:
+        st.caption("No pending applications.")
+    else:
+        titles = {a.project_id: a.title for a in pending}
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            review_project = st.selectbox("Project", ["All"] + list(titles), key="review_project",
+                                          format_func=lambda pid: titles.get(pid, "All"))
+        with col2:
+            review_major = st.selectbox("Major", ["All"] + sorted({a.major for a in pending if a.major}), key="review_major")
+        with col3:
+            review_gpa = st.number_input("Minimum GPA", 0.0, 4.0, 0.0, step=0.1, key="review_gpa")
+        with col4:
+            review_match = st.number_input("Minimum shared skills", 0, 50, 0, key="review_match")
+
+        shown = [
+            a for a in pending
+            if review_project in ("All", a.project_id)
+            and review_major in ("All", a.major)
+            and float(a.gpa or 0) >= review_gpa
+            and a.match_count >= review_match
+        ]
+        if not shown:
+            st.info("No pending applications match these filters.")
+        else:
+            with st.form("bulk_review_form"):
+                edited = st.data_editor(
+                    pd.DataFrame([{
+                        "Select": False,
+                        "Student": f"{a.first_name} {a.last_name}",
+                        "Major": a.major,
+                        "GPA": float(a.gpa) if a.gpa is not None else None,
+                        "Shared skills": a.match_count,
+                        "Project": a.title,
+                        "Applied": a.applied_at,
+                    } for a in shown]),
+                    hide_index=True, use_container_width=True,
+                    disabled=["Student", "Major", "GPA", "Shared skills", "Project", "Applied"],
+                )
+                select_all = st.checkbox(f"Select all {len(shown)} shown")
+                col1, col2 = st.columns(2)
+                with col1:
+                    accept_selected = st.form_submit_button("✅ Accept selected")
+                with col2:
+                    reject_selected = st.form_submit_button("❌ Reject selected")
+
+            if accept_selected or reject_selected:
+                chosen = [a.application_id for a, picked in zip(shown, edited["Select"]) if picked or select_all]
+                if not chosen:
+                    st.warning("⚠️ Select at least one application.")
+                else:
+                    results = applications_repo.review(
+                        faculty_id,
+                        accept_ids=chosen if accept_selected else (),
+                        reject_ids=chosen if reject_selected else (),
+                    )
+                    shared_cache.invalidate("recruiting")
+                    for r in results:
+                        if r.outcome == "accepted" and r.project_status != "Recruiting":
+                            project_stopped_recruiting(r.project_id)
+                    outcomes = Counter(r.outcome for r in results)
+                    st.session_state["bulk_review_summary"] = "✅ Review applied: " + ", ".join(
+                        f"{count} {outcome.replace('_', ' ')}" for outcome, count in outcomes.items()
+                    )
+                    st.rerun()
+
+
+bulk_review()
 
 # --- LOGOUT BUTTON ---
 st.divider()
 if st.button("🚪 Logout", type="secondary"):
-    st.session_state.clear()
+    sessions.logout()
     st.success("Logged out successfully!")
-    st.switch_page("app.py")
-
-conn.close()
\ No newline at end of file
+    st.switch_page("app.py")
\ No newline at end of file
@@ -1,18 +1,18 @@
 import streamlit as st
-import mysql.connector
-from db import get_connection
+from components import fragment, page_cursor, pager, require_login
+from cache import session_cache, shared_cache
+from config import REFERENCE_CACHE_TTL, RECOMMEND_K
+from models import Student
+from repos import ApplicationRepo, FacultyRepo, ProjectRepo, SkillRepo, StudentRepo
+from skill_index import get_skill_index
+from profiling import begin_run
+import sessions
 
 st.set_page_config(page_title="Research Connect", layout="wide")
+begin_run("Student_Dashboard")
 
-# Check if user is logged in FIRST
-if "user" not in st.session_state or st.session_state["user"] is None:
-    st.error("⚠️ Please log in first.")
-    st.stop()
-
-# Check if user is student
-if st.session_state.get("role") != "student":
-    st.error("⚠️ Access denied. Student privileges required.")
-    st.stop()
+# Only a signed-in student gets past this line
+session = require_login("student")
 
 # Add background + card style
 st.markdown("""
@@ -42,163 +42,210 @@ p, label { color: #d1d5db !important; }
 
 st.markdown("<h1 style='text-align:center; color:#60a5fa;'>🎓 Student Dashboard</h1>", unsafe_allow_html=True)
 
-try:
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-except Exception as e:
-    st.error(f"Database connection failed: {e}")
-    st.stop()
-
-# Get student_id from session state
-student_id = st.session_state.get("user_id")
+student_id = session.user_id
 
-if not student_id:
-    st.warning("⚠️ Please log in again — no user session found.")
-    st.stop() 
+my_cache = session_cache()
+students, projects_repo, applications_repo, skills_repo = StudentRepo(), ProjectRepo(), ApplicationRepo(), SkillRepo()
 
 # --- PROFILE CARD ---
-cursor.execute("SELECT * FROM Students WHERE student_id=%s", (student_id,))
-student = cursor.fetchone()
+student = my_cache.get_or_load(("profile",), lambda: students.get(student_id))
 
 if not student:
     st.error("Student profile not found. Please complete your profile.")
-    student = {}
-
-st.markdown("<div class='card'><h3>🧾 My Profile</h3>", unsafe_allow_html=True)
-col1, col2 = st.columns(2)
-with col1:
-    major = st.text_input("Major", value=student.get("major") or "")
-    year = st.number_input("Year Level", 1, 4, value=int(student.get("year_level") or 1))
-with col2:
-    gpa = st.number_input("GPA", 0.0, 4.0, value=float(student.get("gpa") or 0.0), step=0.1)
-    interests = st.text_area("Research Interests", value=student.get("research_interests") or "")
-
-if st.button("💾 Update Profile"):
-    cursor.execute(
-        "UPDATE Students SET major=%s, year_level=%s, gpa=%s, research_interests=%s WHERE student_id=%s",
-        (major, year, gpa, interests, student_id)
-    )
-    conn.commit()
-    st.success("Profile updated!")
-    st.rerun()
-st.markdown("</div>", unsafe_allow_html=True)
+    student = Student(student_id)
+
+
+@fragment
+def profile_card(student):
+    """Profile editor; saving reruns only this card."""
+    student = my_cache.get_or_load(("profile",), lambda: students.get(student_id)) or student
+    st.markdown("<div class='card'><h3>🧾 My Profile</h3>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        major = st.text_input("Major", value=student.major or "")
+        year = st.number_input("Year Level", 1, 4, value=int(student.year_level or 1))
+    with col2:
+        gpa = st.number_input("GPA", 0.0, 4.0, value=float(student.gpa or 0.0), step=0.1)
+        interests = st.text_area("Research Interests", value=student.research_interests or "")
+
+    if st.button("💾 Update Profile"):
+        students.update_profile(student_id, major, year, gpa, interests)
+        my_cache.invalidate("profile")
+        st.success("Profile updated!")
+        st.rerun(scope="fragment")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+profile_card(student)
 
 # --- SKILLS CARD ---
-st.markdown("<div class='card'><h3>🧠 My Skills</h3>", unsafe_allow_html=True)
-cursor.execute("SELECT * FROM Skills")
-skills = cursor.fetchall()
-skill_map = {s["skill_name"]: s["skill_id"] for s in skills}
-
-cursor.execute("""
-    SELECT sk.skill_name FROM Student_Skills ss
-    JOIN Skills sk ON ss.skill_id = sk.skill_id
-    WHERE ss.student_id = %s
-""", (student_id,))
-existing = [s["skill_name"] for s in cursor.fetchall()]
-
-selected = st.multiselect("Select Skills", list(skill_map.keys()), default=existing)
-
-if st.button("Update Skills"):
-    cursor.execute("DELETE FROM Student_Skills WHERE student_id=%s", (student_id,))
-    for skill in selected:
-        cursor.execute("INSERT INTO Student_Skills (student_id, skill_id) VALUES (%s, %s)", (student_id, skill_map[skill]))
-    conn.commit()
-    st.success("Skills updated!")
-    st.rerun()
-st.markdown("</div>", unsafe_allow_html=True)
-
-# --- MY APPLICATIONS ---
-st.markdown("<div class='card'><h3>📝 My Applications</h3>", unsafe_allow_html=True)
-cursor.execute("""
-    SELECT a.application_id, a.status, a.applied_at, p.title, p.project_id,
-           f.first_name, f.last_name
-    FROM Applications a
-    JOIN Research_Projects p ON a.project_id = p.project_id
-    JOIN Faculty f ON p.faculty_id = f.faculty_id
-    WHERE a.student_id = %s
-    ORDER BY a.applied_at DESC
-""", (student_id,))
-applications = cursor.fetchall()
-
-if not applications:
-    st.info("You haven't applied to any projects yet.")
-else:
-    for app in applications:
-        status_color = {
-            'Pending': '🟡',
-            'Accepted': '✅',
-            'Rejected': '❌',
-            'Withdrawn': '⚪'
-        }.get(app['status'], '⚪')
-        
-        st.markdown(f"""
-        **{app['title']}** {status_color} *{app['status']}*  
-        Faculty: {app['first_name']} {app['last_name']}  
-        Applied: {app['applied_at'].strftime('%Y-%m-%d')}
-        """)
-        
-        if app['status'] == 'Pending':
-            st.warning("⚠️ Note: Once you withdraw this application, you cannot reapply to this project.")
-            if st.button("🗑️ Withdraw", key=f"withdraw_{app['application_id']}"):
-                cursor.execute("CALL withdraw_application(%s)", (app['application_id'],))
-                conn.commit()
-                st.success("Application withdrawn. You cannot reapply to this project.")
-                st.rerun()
-        st.divider()
-
-st.markdown("</div>", unsafe_allow_html=True)
-
-# --- AVAILABLE PROJECTS (CARD GRID) ---
-st.markdown("<h2 style='margin-top:30px;'>📚 Available Projects</h2>", unsafe_allow_html=True)
-cursor.execute("""
-    SELECT p.*, f.first_name, f.last_name, f.department
-    FROM Research_Projects p
-    JOIN Faculty f ON p.faculty_id = f.faculty_id
-    WHERE p.status='Recruiting'
-""")
-projects = cursor.fetchall()
-
-if not projects:
-    st.info("No projects currently recruiting.")
-else:
-    cols = st.columns(2)
-    for i, proj in enumerate(projects):
-        with cols[i % 2]:
+@fragment
+def skills_card():
+    """Skill picker; widget changes rerun only this card."""
+    st.markdown("<div class='card'><h3>🧠 My Skills</h3>", unsafe_allow_html=True)
+    skills = shared_cache.get_or_load(("skills",), skills_repo.all, ttl=REFERENCE_CACHE_TTL)
+    skill_map = {s.skill_name: s.skill_id for s in skills}
+    skill_names = {s.skill_id: s.skill_name for s in skills}
+
+    my_skill_ids = my_cache.get_or_load(("skills",), lambda: skills_repo.for_student(student_id))
+    existing = [skill_names[sid] for sid in my_skill_ids if sid in skill_names]
+
+    selected = st.multiselect("Select Skills", list(skill_map.keys()), default=existing)
+
+    if st.button("Update Skills"):
+        selected_ids = [skill_map[skill] for skill in selected]
+        skills_repo.set_student_skills(student_id, selected_ids)
+        my_cache.invalidate("skills")
+        # Patch the in-process skill index so recommendations reflect the change immediately
+        index = get_skill_index()
+        if index is not None:
+            index.update_student(student_id, selected_ids)
+        st.success("Skills updated!")
+        # Recommendations depend on skills, so this one reruns the whole page
+        st.rerun()
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+skills_card()
+
+
+def seats_left(proj):
+    """Open seats and competing applications, from the project's Project_Stats counts."""
+    open_seats = max(proj.max_students - (proj.member_count or 0), 0)
+    return f"{open_seats}/{proj.max_students} seats open · {proj.pending_count or 0} pending"
+
+
+def apply_to_project(project_id):
+    if applications_repo.apply(student_id, project_id):
+        my_cache.invalidate("applications")
+        shared_cache.invalidate("recruiting")  # the grid shows applicant and pending counts
+        st.success("Application submitted!")
+        st.rerun(scope="fragment")
+    else:
+        st.warning("You've already applied to this project.")
+
+
+# Applications and the project lists share the student's application state, so
+# they form one fragment: Apply, Withdraw, search and paging rerun only this part.
+@fragment
+def projects_section():
+    # --- MY APPLICATIONS ---
+    st.markdown("<div class='card'><h3>📝 My Applications</h3>", unsafe_allow_html=True)
+    applications = my_cache.get_or_load(("applications",), lambda: applications_repo.for_student(student_id))
+
+    if not applications:
+        st.info("You haven't applied to any projects yet.")
+    else:
+        for app in applications:
+            status_color = {
+                'Pending': '🟡',
+                'Accepted': '✅',
+                'Rejected': '❌',
+                'Withdrawn': '⚪',
+                'Expired': '⌛'
+            }.get(app.status, '⚪')
+
             st.markdown(f"""
-                <div class='card'>
-                    <h3>{proj['title']}</h3>
-                    <small>Faculty: <b>{proj['first_name']} {proj['last_name']}</b> — {proj['department']}</small>
-                    <p style='margin-top:10px;'>{proj['description'][:160]}...</p>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Check if already applied
-            cursor.execute("""
-                SELECT application_id FROM Applications 
-                WHERE student_id=%s AND project_id=%s
-            """, (student_id, proj["project_id"]))
-            already_applied = cursor.fetchone()
-            
-            if already_applied:
-                st.info("✓ Already applied")
-            else:
-                if st.button("📩 Apply", key=f"apply_{proj['project_id']}"):
-                    try:
-                        cursor.execute("""
-                            INSERT INTO Applications (student_id, project_id, status)
-                            VALUES (%s, %s, 'Pending')
-                        """, (student_id, proj["project_id"]))
-                        conn.commit()
-                        st.success("Application submitted!")
-                        st.rerun()
-                    except mysql.connector.IntegrityError:
-                        st.warning("You've already applied to this project.")
+            **{app.title}** {status_color} *{app.status}*  
+            Faculty: {app.first_name} {app.last_name}  
+            Applied: {app.applied_at.strftime('%Y-%m-%d')}
+            """)
+
+            if app.status == 'Pending':
+                st.warning("⚠️ Note: Once you withdraw this application, you cannot reapply to this project.")
+                if st.button("🗑️ Withdraw", key=f"withdraw_{app.application_id}"):
+                    applications_repo.withdraw(app.application_id)
+                    my_cache.invalidate("applications")
+                    shared_cache.invalidate("recruiting")
+                    st.success("Application withdrawn. You cannot reapply to this project.")
+                    st.rerun(scope="fragment")
+            st.divider()
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # --- RECOMMENDED PROJECTS (skill overlap, served from the in-process index) ---
+    index = get_skill_index()
+    recommended = index.recommend_projects(student_id, k=RECOMMEND_K) if index is not None else []
+    if recommended:
+        st.markdown("<h2 style='margin-top:30px;'>✨ Recommended for You</h2>", unsafe_allow_html=True)
+        shared = dict(recommended)
+        rec_projects = projects_repo.for_student(student_id, [pid for pid, _ in recommended])
+        cols = st.columns(2)
+        for i, proj in enumerate(rec_projects):
+            with cols[i % 2]:
+                st.markdown(f"""
+                    <div class='card'>
+                        <h3>{proj.title}</h3>
+                        <small>Faculty: <b>{proj.first_name} {proj.last_name}</b> — {proj.department}
+                        · {shared[proj.project_id]} matching skill(s)
+                        · {seats_left(proj)}</small>
+                        <p style='margin-top:10px;'>{proj.description}...</p>
+                    </div>
+                """, unsafe_allow_html=True)
+                if proj.application_id:
+                    st.info("✓ Already applied")
+                elif st.button("📩 Apply", key=f"rec_apply_{proj.project_id}"):
+                    apply_to_project(proj.project_id)
+
+    # --- AVAILABLE PROJECTS (CARD GRID) ---
+    st.markdown("<h2 style='margin-top:30px;'>📚 Available Projects</h2>", unsafe_allow_html=True)
+    search_query = st.text_input(
+        "🔍 Search projects", key="project_search",
+        placeholder="Keywords in title, description or faculty research areas"
+    ).strip()
+
+    if search_query:
+        # Ranked results, already annotated with this student's application state
+        pager_key = "search"
+        projects_page = projects_repo.search(
+            student_id, search_query, offset=page_cursor(pager_key, (search_query,)) or 0
+        )
+        projects = projects_page.rows
+    else:
+        departments = shared_cache.get_or_load(("filter_values", "Faculty", "department"), FacultyRepo().departments)
+        dept_filter = st.selectbox("Department", ["All"] + departments, key="projects_department")
+        dept_filter = None if dept_filter == "All" else dept_filter
+
+        # The project page is shared by all students; this student's application
+        # state is joined on from their (already loaded) applications list.
+        pager_key = "projects"
+        after = page_cursor(pager_key, (dept_filter,))
+        projects_page = shared_cache.get_or_load(
+            ("recruiting", dept_filter, after),
+            lambda: projects_repo.list_recruiting(department=dept_filter, after=after),
+        )
+        applied = {a.project_id: a.application_id for a in applications}
+        projects = [proj._replace(application_id=applied.get(proj.project_id)) for proj in projects_page.rows]
+
+    if not projects:
+        st.info("No matching projects found." if search_query else "No projects currently recruiting.")
+    else:
+        cols = st.columns(2)
+        for i, proj in enumerate(projects):
+            with cols[i % 2]:
+                st.markdown(f"""
+                    <div class='card'>
+                        <h3>{proj.title}</h3>
+                        <small>Faculty: <b>{proj.first_name} {proj.last_name}</b> — {proj.department}
+                        · {seats_left(proj)}</small>
+                        <p style='margin-top:10px;'>{proj.description}...</p>
+                    </div>
+                """, unsafe_allow_html=True)
+
+                # Application state was merged in above (or joined on by the search query)
+                if proj.application_id:
+                    st.info("✓ Already applied")
+                else:
+                    if st.button("📩 Apply", key=f"apply_{proj.project_id}"):
+                        apply_to_project(proj.project_id)
+        pager(pager_key, projects_page, scope="fragment")
+
+
+projects_section()
 
 # --- LOGOUT BUTTON ---
 st.divider()
 if st.button("🚪 Logout", type="secondary"):
-    st.session_state.clear()
+    sessions.logout()
     st.success("Logged out successfully!")
-    st.switch_page("app.py")
-
-conn.close()
\ No newline at end of file
+    st.switch_page("app.py")
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""Per-page query profiling, enabled with ``PROFILE_QUERIES=1``.
+
+Every cursor handed out by the pool is wrapped in ``ProfilingCursor``, which
+records each statement's fingerprint (the SQL with literals, placeholders and
+``IN``/``VALUES`` lists collapsed), duration, rows returned and the page line
+that issued it. Pages call ``begin_run(page)`` at the top of every rerun, and
+fragments declared with ``components.fragment`` start a run of
+``<page>/<fragment>`` when they rerun on their own. Statements are thus
+grouped per run and runs are aggregated per page or fragment.
+
+A run is flagged for N+1 when one fingerprint is executed
+``N_PLUS_ONE_THRESHOLD`` times from the same call site, and statements taking
+longer than ``SLOW_QUERY_MS`` are flagged as slow. ``QUERY_LOG_PATH`` also
+appends every statement to a JSON-lines file; ``export_json()`` dumps the
+in-memory history for the admin panel's download button.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from config import N_PLUS_ONE_THRESHOLD, PROFILE_HISTORY, PROFILE_QUERIES, QUERY_LOG_PATH, SLOW_QUERY_MS
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+_PAGES_DIR = os.path.join(_APP_DIR, "pages")
+_ENTRY_POINT = os.path.join(_APP_DIR, "app.py")
+_THIS_FILE = os.path.abspath(__file__)
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_RE = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalized statement text: the same query shape always maps to the same string."""
+    if isinstance(sql, bytes):
+        sql = sql.decode(errors="replace")
+    sql = _STRING_RE.sub("?", sql).replace("%s", "?")
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub(r"\1, ...", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def _call_site():
+    """``(page, "file:line")`` of the page or app.py line that issued the statement."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        path = os.path.abspath(frame.f_code.co_filename)
+        if path == _ENTRY_POINT or os.path.dirname(path) == _PAGES_DIR:
+            name = os.path.splitext(os.path.basename(path))[0]
+            return name, f"{os.path.basename(path)}:{frame.f_lineno}"
+        if fallback is None and path.startswith(_APP_DIR) and path != _THIS_FILE:
+            fallback = f"{os.path.basename(path)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "background", fallback or "?"
+
+
+class RunProfile:
+    """Statements issued by one script run of one page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.queries = []
+
+    def summary(self):
+        queries = list(self.queries)
+        repeats = Counter((q["fingerprint"], q["site"]) for q in queries)
+        return {
+            "page": self.page,
+            "started": self.started,
+            "queries": len(queries),
+            "total_ms": round(sum(q["ms"] for q in queries), 2),
+            "rows": sum(q["rows"] for q in queries),
+            "n_plus_one": [
+                {"fingerprint": fp, "site": site, "count": count}
+                for (fp, site), count in repeats.items() if count >= N_PLUS_ONE_THRESHOLD
+            ],
+            "slow": [q for q in queries if q["ms"] >= SLOW_QUERY_MS],
+        }
+
+
+_runs = deque(maxlen=PROFILE_HISTORY)
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def begin_run(page):
+    """Start grouping this thread's statements under a new run of ``page``."""
+    if not PROFILE_QUERIES:
+        return
+    run = RunProfile(page)
+    _local.run = run
+    _runs.append(run)
+
+
+def _finish(record):
+    if record["ms"] >= SLOW_QUERY_MS:
+        print(f"🐢 Slow query ({record['ms']:.0f} ms, {record['site']}): {record['fingerprint'][:200]}")
+    if QUERY_LOG_PATH:
+        with _log_lock, open(QUERY_LOG_PATH, "a", encoding="utf-8") as log:
+            log.write(json.dumps(record) + "\n")
+
+
+class ProfilingCursor:
+    """Cursor proxy that times statements and counts the rows fetched for each."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._last = None
+
+    def _record(self, statement, started):
+        self._flush()
+        page, site = _call_site()
+        run = getattr(_local, "run", None)
+        record = {
+            "at": time.time(),
+            "page": run.page if run is not None else page,
+            "site": site,
+            "fingerprint": fingerprint(statement),
+            "ms": (time.perf_counter() - started) * 1000,
+            "rows": max(self._cursor.rowcount, 0) if not self._cursor.with_rows else 0,
+        }
+        if run is not None:
+            run.queries.append(record)
+        self._last = record
+
+    def _fetched(self, count, started):
+        if self._last is not None:
+            self._last["rows"] += count
+            self._last["ms"] += (time.perf_counter() - started) * 1000
+
+    def _flush(self):
+        if self._last is not None:
+            record, self._last = self._last, None
+            _finish(record)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._record(operation, started)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._record(operation, started)
+
+    def callproc(self, procname, args=()):
+        started = time.perf_counter()
+        try:
+            return self._cursor.callproc(procname, args)
+        finally:
+            self._record(f"CALL {procname}({', '.join(['?'] * len(args))})", started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(row is not None, started)
+        return row
+
+    def fetchmany(self, size=1):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._fetched(len(rows), started)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(len(rows), started)
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._fetched(1, time.perf_counter())
+            yield row
+
+    def close(self):
+        self._flush()
+        return self._cursor.close()
+
+    def __del__(self):
+        self._flush()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def recent_runs(limit=50):
+    """Summaries of the latest runs, newest first."""
+    return [run.summary() for run in list(_runs)[::-1][:limit]]
+
+
+def page_summary():
+    """Per-page aggregates over the runs still in the history."""
+    pages = {}
+    for summary in (run.summary() for run in list(_runs)):
+        agg = pages.setdefault(summary["page"], {
+            "runs": 0, "queries": 0, "max_queries": 0, "total_ms": 0.0, "max_ms": 0.0,
+            "rows": 0, "n_plus_one_runs": 0, "slow_queries": 0,
+        })
+        agg["runs"] += 1
+        agg["queries"] += summary["queries"]
+        agg["max_queries"] = max(agg["max_queries"], summary["queries"])
+        agg["total_ms"] += summary["total_ms"]
+        agg["max_ms"] = max(agg["max_ms"], summary["total_ms"])
+        agg["rows"] += summary["rows"]
+        agg["n_plus_one_runs"] += bool(summary["n_plus_one"])
+        agg["slow_queries"] += len(summary["slow"])
+    for agg in pages.values():
+        agg["avg_queries"] = round(agg["queries"] / agg["runs"], 1)
+        agg["avg_ms"] = round(agg["total_ms"] / agg["runs"], 2)
+    return pages
+
+
+def export_json():
+    return json.dumps({"pages": page_summary(), "runs": recent_runs(len(_runs))}, indent=2)
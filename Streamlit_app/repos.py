@@ -0,0 +1,323 @@
+"""Typed repositories: how the pages read and write the database.
+
+Every method checks a connection out of the pool for just that call and
+hands it back before returning typed rows (``models.py``), so a page never
+holds a connection while Streamlit renders widgets. Reads run the SQL in
+``repository.py`` on a prepared-statement cursor (see ``db.PreparedCursor``);
+writes commit, or roll back on error, before returning.
+
+Each repository takes an optional ``pool`` (anything whose ``acquire()``
+returns a connection) so it can be pointed at a stand-in database, e.g. a
+scratch MySQL schema in a benchmark. By default reads go through
+``db.get_read_pool()`` (a replica when ``DB_REPLICAS`` is set) and writes to
+the primary pool.
+"""
+import json
+from contextlib import contextmanager
+
+from mysql.connector import IntegrityError, errorcode
+
+import repository
+from db import get_pool, get_read_pool
+from matching import rank_students_for_projects
+from models import (
+    Applicant, Application, Candidate, Faculty, LogEntry, PlatformStats, Project, ReviewResult, Skill,
+    Student,
+)
+from repository import Page
+from search import search_projects
+
+
+def _typed(row_type, rows):
+    return [row_type(**row) for row in rows]
+
+
+def _typed_page(row_type, page):
+    return Page(_typed(row_type, page.rows), page.next_after)
+
+
+def _one(row_type, row):
+    return row_type(**row) if row else None
+
+
+def _json_ids(ids):
+    return json.dumps([int(i) for i in ids])
+
+
+class _Repo:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    @contextmanager
+    def _connection(self, read_only=False):
+        conn = (self._pool or (get_read_pool() if read_only else get_pool())).acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _reading(self):
+        """Prepared dictionary cursor, valid for the ``with`` block only."""
+        with self._connection(read_only=True) as conn:
+            yield conn.cursor(prepared=True, dictionary=True)
+
+    @contextmanager
+    def _writing(self):
+        """Plain cursor inside a transaction committed when the block exits cleanly."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def _register(self, table, first_name, last_name, email, password_hash):
+        # One round-trip: the table's UNIQUE email and the Accounts trigger
+        # reject an email taken by any role, even by a concurrent signup
+        try:
+            with self._writing() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (first_name, last_name, email, password) VALUES (%s, %s, %s, %s)",
+                    (first_name, last_name, email, password_hash),
+                )
+        except IntegrityError as e:
+            if e.errno != errorcode.ER_DUP_ENTRY:
+                raise
+            return False
+        return True
+
+
+class StudentRepo(_Repo):
+    def get(self, student_id):
+        with self._reading() as cursor:
+            return _one(Student, repository.get_student(cursor, student_id))
+
+    def list(self, major=None, after=None):
+        with self._reading() as cursor:
+            return _typed_page(Student, repository.list_students(cursor, major, after))
+
+    def majors(self):
+        with self._reading() as cursor:
+            return repository.get_distinct_values(cursor, "Students", "major")
+
+    def application_counts(self, student_ids):
+        with self._reading() as cursor:
+            return repository.get_student_application_counts(cursor, student_ids)
+
+    def update_profile(self, student_id, major, year_level, gpa, research_interests):
+        with self._writing() as cursor:
+            cursor.execute(
+                "UPDATE Students SET major=%s, year_level=%s, gpa=%s, research_interests=%s WHERE student_id=%s",
+                (major, year_level, gpa, research_interests, student_id),
+            )
+
+    def register(self, first_name, last_name, email, password_hash):
+        """Create an account; False when the email is already registered."""
+        return self._register("Students", first_name, last_name, email, password_hash)
+
+    def delete(self, student_id):
+        with self._writing() as cursor:
+            cursor.execute("DELETE FROM Students WHERE student_id=%s", (student_id,))
+
+
+class FacultyRepo(_Repo):
+    def get(self, faculty_id):
+        with self._reading() as cursor:
+            return _one(Faculty, repository.get_faculty(cursor, faculty_id))
+
+    def list(self, department=None, after=None):
+        with self._reading() as cursor:
+            return _typed_page(Faculty, repository.list_faculty(cursor, department, after))
+
+    def departments(self):
+        with self._reading() as cursor:
+            return repository.get_distinct_values(cursor, "Faculty", "department")
+
+    def project_counts(self, faculty_ids):
+        with self._reading() as cursor:
+            return repository.get_faculty_project_counts(cursor, faculty_ids)
+
+    def update_profile(self, faculty_id, department, research_areas):
+        with self._writing() as cursor:
+            cursor.execute(
+                "UPDATE Faculty SET department=%s, research_areas=%s WHERE faculty_id=%s",
+                (department, research_areas, faculty_id),
+            )
+
+    def register(self, first_name, last_name, email, password_hash):
+        """Create an account; False when the email is already registered."""
+        return self._register("Faculty", first_name, last_name, email, password_hash)
+
+    def delete(self, faculty_id):
+        with self._writing() as cursor:
+            cursor.execute("DELETE FROM Faculty WHERE faculty_id=%s", (faculty_id,))
+
+
+class ProjectRepo(_Repo):
+    def list(self, status=None, department=None, after=None):
+        """Admin listing across all faculty, with application counts."""
+        with self._reading() as cursor:
+            return _typed_page(Project, repository.list_projects(cursor, status, department, after))
+
+    def list_for_faculty(self, faculty_id, status=None, after=None):
+        with self._reading() as cursor:
+            return _typed_page(Project, repository.list_faculty_projects(cursor, faculty_id, status, after))
+
+    def get_for_faculty(self, faculty_id, project_id):
+        """One project card's row, or None once it is gone (or not this faculty member's)."""
+        with self._reading() as cursor:
+            return _one(Project, repository.get_faculty_project(cursor, faculty_id, project_id))
+
+    def list_recruiting(self, department=None, after=None):
+        with self._reading() as cursor:
+            return _typed_page(Project, repository.list_recruiting_projects(cursor, department, after))
+
+    def for_student(self, student_id, project_ids):
+        """Those of ``project_ids`` still recruiting, annotated with the student's application state, in order."""
+        with self._reading() as cursor:
+            return _typed(Project, repository.get_projects_for_student_by_ids(cursor, student_id, project_ids))
+
+    def search(self, student_id, query, offset=0):
+        with self._reading() as cursor:
+            return _typed_page(Project, search_projects(cursor, student_id, query, offset))
+
+    def top_candidates(self, project_ids):
+        """``{project_id: [Candidate, ...]}`` best skill match first."""
+        with self._reading() as cursor:
+            ranked = rank_students_for_projects(cursor, project_ids)
+        return {pid: _typed(Candidate, rows) for pid, rows in ranked.items()}
+
+    def create(self, faculty_id, title, description, max_students):
+        with self._writing() as cursor:
+            cursor.execute("""
+                INSERT INTO Research_Projects (title, description, status, max_students, faculty_id, admin_id)
+                VALUES (%s, %s, 'Recruiting', %s, %s, NULL)
+            """, (title, description, max_students, faculty_id))
+            return cursor.lastrowid
+
+    def set_status(self, project_id, status):
+        with self._writing() as cursor:
+            cursor.execute("UPDATE Research_Projects SET status=%s WHERE project_id=%s", (status, project_id))
+
+    def delete(self, project_id):
+        with self._writing() as cursor:
+            cursor.execute("DELETE FROM Research_Projects WHERE project_id=%s", (project_id,))
+
+
+class ApplicationRepo(_Repo):
+    def for_student(self, student_id):
+        with self._reading() as cursor:
+            return _typed(Application, repository.get_student_applications(cursor, student_id))
+
+    def by_project(self, faculty_id, project_ids):
+        """``{project_id: [Applicant, ...]}``."""
+        with self._reading() as cursor:
+            grouped = repository.get_applicants_by_project(cursor, faculty_id, project_ids)
+        return {pid: _typed(Applicant, rows) for pid, rows in grouped.items()}
+
+    def apply(self, student_id, project_id):
+        """Submit a Pending application; False if the student already applied."""
+        try:
+            with self._writing() as cursor:
+                cursor.execute("""
+                    INSERT INTO Applications (student_id, project_id, status)
+                    VALUES (%s, %s, 'Pending')
+                """, (student_id, project_id))
+        except IntegrityError:
+            return False
+        return True
+
+    def withdraw(self, application_id):
+        with self._writing() as cursor:
+            cursor.execute("CALL withdraw_application(%s)", (application_id,))
+
+    def pending_for_review(self, faculty_id):
+        with self._reading() as cursor:
+            return _typed(Applicant, repository.get_pending_applicants(cursor, faculty_id))
+
+    def accept(self, application_id):
+        """Accept one application unless its project is full; returns a ``ReviewResult``."""
+        return self.accept_many([application_id])[0]
+
+    def accept_many(self, application_ids):
+        """Accept several applications in one round-trip and one transaction.
+
+        Capacity is enforced under a row lock on each project, which is
+        switched to In Progress once it fills. Returns one ``ReviewResult``
+        per id, in processing order (grouped by project).
+        """
+        if not application_ids:
+            return []
+        return self._call_review("accept_applications", _json_ids(application_ids))
+
+    def review(self, faculty_id, accept_ids=(), reject_ids=()):
+        """Apply a faculty member's bulk decisions in one transaction.
+
+        Rejections are a single set-based UPDATE of the Pending applications;
+        acceptances go through the same capacity check as ``accept_many``.
+        Ids outside the faculty member's projects come back as ``not_found``.
+        """
+        if not accept_ids and not reject_ids:
+            return []
+        return self._call_review("review_applications", faculty_id, _json_ids(accept_ids), _json_ids(reject_ids))
+
+    def _call_review(self, procedure, *args):
+        with self._writing() as cursor:
+            cursor.callproc(procedure, args)
+            return [ReviewResult._make(row) for result in cursor.stored_results() for row in result.fetchall()]
+
+    def reject(self, faculty_id, application_id):
+        """Reject one Pending application on the faculty member's own project; False if none matched.
+
+        Same scope as the rejections in ``review``: an accepted, withdrawn or
+        expired application, or another faculty member's, is left untouched.
+        """
+        with self._writing() as cursor:
+            cursor.execute("""
+                UPDATE Applications a
+                JOIN Research_Projects p ON p.project_id = a.project_id AND p.faculty_id = %s
+                SET a.status = 'Rejected', a.reviewed_at = CURRENT_TIMESTAMP
+                WHERE a.application_id = %s AND a.status = 'Pending'
+            """, (faculty_id, application_id))
+            return cursor.rowcount > 0
+
+
+class SkillRepo(_Repo):
+    def all(self):
+        with self._reading() as cursor:
+            return _typed(Skill, repository.get_skills(cursor))
+
+    def for_student(self, student_id):
+        with self._reading() as cursor:
+            return repository.get_student_skill_ids(cursor, student_id)
+
+    def for_projects(self, project_ids):
+        """``{project_id: [skill_id, ...]}``."""
+        with self._reading() as cursor:
+            return repository.get_project_skill_ids(cursor, project_ids)
+
+    def set_student_skills(self, student_id, skill_ids):
+        with self._connection() as conn:
+            return repository.sync_skill_set(conn, "Student_Skills", student_id, skill_ids)
+
+    def set_project_skills(self, project_id, skill_ids):
+        with self._connection() as conn:
+            return repository.sync_skill_set(conn, "Project_Skills", project_id, skill_ids)
+
+
+class StatsRepo(_Repo):
+    def platform(self):
+        with self._reading() as cursor:
+            return _one(PlatformStats, repository.get_platform_stats(cursor))
+
+
+class LogRepo(_Repo):
+    def history(self, student_id=None, project_id=None, since=None, until=None, after=None):
+        """One page of Application_Logs entries, newest first."""
+        with self._reading() as cursor:
+            return _typed_page(LogEntry, repository.list_application_logs(
+                cursor, student_id, project_id, since, until, after,
+            ))
@@ -0,0 +1,377 @@
+"""Data-access helpers behind the repositories in ``repos.py``.
+
+Each helper takes an open ``dictionary=True`` cursor and answers one screen's
+worth of data in a fixed number of set-based queries, so page cost does not
+grow with the number of rows rendered.
+
+Listings are keyset-paginated: rows are ordered newest first on
+``(created_at, primary key)`` and the next page seeks past the last row seen
+instead of using OFFSET, so page N costs the same as page 1.
+"""
+from collections import namedtuple
+
+from config import PAGE_SIZE, STATS_FROM_SUMMARY
+
+# rows: the current page; next_after: seek key for the following page (None on the last page)
+Page = namedtuple("Page", ["rows", "next_after"])
+
+# Per-project counts from the trigger-maintained Project_Stats table: one
+# primary-key lookup per row instead of aggregating Applications/Project_Members.
+# LEFT JOIN so a project whose stats row is missing still lists (with NULL counts).
+PROJECT_COUNTS = "ps.applicant_count AS app_count, ps.pending_count, ps.member_count"
+PROJECT_STATS_JOIN = "LEFT JOIN Project_Stats ps ON ps.project_id = p.project_id"
+
+
+def _column_key(column):
+    """Dictionary key a selected column comes back under ("p.created_at" -> "created_at")."""
+    return column.rsplit(".", 1)[-1]
+
+
+def _equality_filters(filters):
+    """``{column: value}`` -> (SQL clauses, params), skipping unset values."""
+    clauses, params = [], []
+    for column, value in filters.items():
+        if value not in (None, ""):
+            clauses.append(f"{column} = %s")
+            params.append(value)
+    return clauses, params
+
+
+def fetch_page(cursor, select, from_, sort_col, key_col, where=(), params=(),
+               after=None, limit=PAGE_SIZE):
+    """Run one keyset-paginated SELECT, newest first.
+
+    ``select``/``from_`` are SQL fragments (``select`` must include
+    ``sort_col`` and ``key_col``), ``where`` is a list of AND-ed clauses and
+    ``params`` binds the placeholders in ``from_`` and ``where`` in order.
+    ``after`` is the ``next_after`` of the previous page.
+    """
+    clauses = list(where)
+    args = list(params)
+    if after is not None:
+        last_sort, last_key = after
+        clauses.append(f"({sort_col} < %s OR ({sort_col} = %s AND {key_col} < %s))")
+        args += [last_sort, last_sort, last_key]
+
+    query = f"SELECT {select} FROM {from_}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += f" ORDER BY {sort_col} DESC, {key_col} DESC LIMIT %s"
+    args.append(limit + 1)  # one extra row tells us whether another page exists
+
+    cursor.execute(query, args)
+    rows = cursor.fetchall()
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, (last[_column_key(sort_col)], last[_column_key(key_col)]))
+
+
+def get_distinct_values(cursor, table, column):
+    """Sorted non-empty values of ``column``, for filter dropdowns."""
+    cursor.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL AND {column} <> '' ORDER BY {column}")
+    return [row[column] for row in cursor.fetchall()]
+
+
+def list_students(cursor, major=None, after=None, limit=PAGE_SIZE):
+    clauses, params = _equality_filters({"major": major})
+    return fetch_page(
+        cursor,
+        "student_id, first_name, last_name, email, major, gpa, year_level, research_interests, created_at",
+        "Students", "created_at", "student_id", clauses, params, after, limit,
+    )
+
+
+def list_faculty(cursor, department=None, after=None, limit=PAGE_SIZE):
+    clauses, params = _equality_filters({"department": department})
+    return fetch_page(
+        cursor,
+        "faculty_id, first_name, last_name, email, department, research_areas, created_at",
+        "Faculty", "created_at", "faculty_id", clauses, params, after, limit,
+    )
+
+
+def list_projects(cursor, status=None, department=None, after=None, limit=PAGE_SIZE):
+    """Admin project listing; ``description`` is truncated to a preview."""
+    clauses, params = _equality_filters({"p.status": status, "f.department": department})
+    return fetch_page(
+        cursor,
+        """p.project_id, p.title, LEFT(p.description, 500) AS description, p.status,
+           p.max_students, p.created_at, f.first_name, f.last_name, f.department,
+           """ + PROJECT_COUNTS,
+        "Research_Projects p JOIN Faculty f ON p.faculty_id = f.faculty_id " + PROJECT_STATS_JOIN,
+        "p.created_at", "p.project_id", clauses, params, after, limit,
+    )
+
+
+def list_faculty_projects(cursor, faculty_id, status=None, after=None, limit=PAGE_SIZE):
+    clauses, params = _equality_filters({"p.faculty_id": faculty_id, "p.status": status})
+    return fetch_page(
+        cursor,
+        """p.project_id, p.title, LEFT(p.description, 150) AS description, p.status, p.max_students,
+           p.created_at, """ + PROJECT_COUNTS,
+        "Research_Projects p " + PROJECT_STATS_JOIN,
+        "p.created_at", "p.project_id", clauses, params, after, limit,
+    )
+
+
+def get_faculty_project(cursor, faculty_id, project_id):
+    """One of a faculty member's projects, shaped like a ``list_faculty_projects`` row."""
+    cursor.execute(f"""
+        SELECT p.project_id, p.title, LEFT(p.description, 150) AS description, p.status, p.max_students,
+               p.created_at, {PROJECT_COUNTS}
+        FROM Research_Projects p {PROJECT_STATS_JOIN}
+        WHERE p.project_id = %s AND p.faculty_id = %s
+    """, (project_id, faculty_id))
+    return cursor.fetchone()
+
+
+def get_skills(cursor):
+    cursor.execute("SELECT skill_id, skill_name, category FROM Skills ORDER BY skill_name")
+    return cursor.fetchall()
+
+
+def get_student(cursor, student_id):
+    cursor.execute("""
+        SELECT student_id, first_name, last_name, email, major, gpa, year_level, research_interests
+        FROM Students WHERE student_id = %s
+    """, (student_id,))
+    return cursor.fetchone()
+
+
+def get_student_skill_ids(cursor, student_id):
+    cursor.execute("SELECT skill_id FROM Student_Skills WHERE student_id = %s", (student_id,))
+    return [row["skill_id"] for row in cursor.fetchall()]
+
+
+def get_student_applications(cursor, student_id):
+    cursor.execute("""
+        SELECT a.application_id, a.status, a.applied_at, p.title, p.project_id,
+               f.first_name, f.last_name
+        FROM Applications a
+        JOIN Research_Projects p ON a.project_id = p.project_id
+        JOIN Faculty f ON p.faculty_id = f.faculty_id
+        WHERE a.student_id = %s
+        ORDER BY a.applied_at DESC
+    """, (student_id,))
+    return cursor.fetchall()
+
+
+def get_faculty(cursor, faculty_id):
+    cursor.execute("""
+        SELECT faculty_id, first_name, last_name, email, department, research_areas
+        FROM Faculty WHERE faculty_id = %s
+    """, (faculty_id,))
+    return cursor.fetchone()
+
+
+def list_recruiting_projects(cursor, department=None, after=None, limit=PAGE_SIZE):
+    """One page of recruiting projects, identical for every student (cacheable)."""
+    clauses, params = _equality_filters({"p.status": "Recruiting", "f.department": department})
+    return fetch_page(
+        cursor,
+        """p.project_id, p.title, LEFT(p.description, 160) AS description, p.max_students,
+           p.created_at, f.first_name, f.last_name, f.department, """ + PROJECT_COUNTS,
+        "Research_Projects p JOIN Faculty f ON p.faculty_id = f.faculty_id " + PROJECT_STATS_JOIN,
+        "p.created_at", "p.project_id", clauses, params, after, limit,
+    )
+
+
+def get_projects_for_student_by_ids(cursor, student_id, project_ids):
+    """Specific recruiting projects (e.g. recommendations), annotated with this student's application state.
+
+    Rows come back in the order of ``project_ids``; ``application_id`` and
+    ``application_status`` are NULL where the student has not applied. Ids
+    of projects that stopped recruiting are skipped, since the in-memory
+    indexes naming them may be stale.
+    """
+    if not project_ids:
+        return []
+    cursor.execute(f"""
+        SELECT p.project_id, p.title, LEFT(p.description, 160) AS description, p.max_students,
+               f.first_name, f.last_name, f.department,
+               a.application_id, a.status AS application_status, {PROJECT_COUNTS}
+        FROM Research_Projects p
+        JOIN Faculty f ON p.faculty_id = f.faculty_id
+        LEFT JOIN Applications a ON a.project_id = p.project_id AND a.student_id = %s
+        {PROJECT_STATS_JOIN}
+        WHERE p.status = 'Recruiting' AND p.project_id IN ({', '.join(['%s'] * len(project_ids))})
+    """, (student_id, *project_ids))
+    by_id = {row["project_id"]: row for row in cursor.fetchall()}
+    return [by_id[pid] for pid in project_ids if pid in by_id]
+
+
+def get_applicants_by_project(cursor, faculty_id, project_ids=None):
+    """All applicants for one faculty member's projects, grouped by project.
+
+    Returns ``{project_id: [applicant, ...]}`` built from a single query;
+    projects without applicants are absent. ``project_ids`` narrows the
+    lookup to the projects on the current page. Per-project counts come with
+    the project rows (``PROJECT_COUNTS``).
+    """
+    query = """
+        SELECT a.application_id, a.project_id, a.status,
+               s.first_name, s.last_name, s.major
+        FROM Applications a
+        JOIN Research_Projects p ON a.project_id = p.project_id
+        JOIN Students s ON a.student_id = s.student_id
+        WHERE p.faculty_id = %s
+    """
+    params = [faculty_id]
+    if project_ids is not None:
+        if not project_ids:
+            return {}
+        query += f" AND a.project_id IN ({', '.join(['%s'] * len(project_ids))})"
+        params += list(project_ids)
+    cursor.execute(query + " ORDER BY a.project_id, a.applied_at", params)
+
+    grouped = {}
+    for row in cursor.fetchall():
+        grouped.setdefault(row["project_id"], []).append(row)
+    return grouped
+
+
+def get_pending_applicants(cursor, faculty_id):
+    """Every Pending application across a faculty member's projects, for bulk review.
+
+    Each row carries the student's major and GPA and ``match_count``, the
+    number of the project's required skills the student has.
+    """
+    cursor.execute("""
+        SELECT a.application_id, a.project_id, a.status, a.applied_at, p.title,
+               s.student_id, s.first_name, s.last_name, s.major, s.gpa,
+               (SELECT COUNT(*) FROM Project_Skills ps
+                JOIN Student_Skills ss ON ss.skill_id = ps.skill_id AND ss.student_id = a.student_id
+                WHERE ps.project_id = a.project_id) AS match_count
+        FROM Applications a
+        JOIN Research_Projects p ON a.project_id = p.project_id
+        JOIN Students s ON a.student_id = s.student_id
+        WHERE p.faculty_id = %s AND a.status = 'Pending'
+        ORDER BY a.project_id, a.applied_at
+    """, (faculty_id,))
+    return cursor.fetchall()
+
+
+def list_application_logs(cursor, student_id=None, project_id=None, since=None, until=None,
+                          after=None, limit=PAGE_SIZE):
+    """Audit history, newest first; ``since``/``until`` bound ``changed_at`` (``until`` exclusive).
+
+    The date bounds let MySQL prune Application_Logs partitions, and the
+    student/project filters seek the covering ``idx_logs_*`` indexes.
+    """
+    clauses, params = _equality_filters({"l.student_id": student_id, "l.project_id": project_id})
+    if since is not None:
+        clauses.append("l.changed_at >= %s")
+        params.append(since)
+    if until is not None:
+        clauses.append("l.changed_at < %s")
+        params.append(until)
+    return fetch_page(
+        cursor,
+        """l.id, l.application_id, l.student_id, l.project_id, l.old_status, l.new_status, l.changed_at,
+           s.first_name, s.last_name, p.title""",
+        """Application_Logs l
+           LEFT JOIN Students s ON s.student_id = l.student_id
+           LEFT JOIN Research_Projects p ON p.project_id = l.project_id""",
+        "l.changed_at", "l.id", clauses, params, after, limit,
+    )
+
+
+def get_platform_stats(cursor, from_summary=STATS_FROM_SUMMARY):
+    """Headline admin metrics in one round-trip.
+
+    With ``from_summary`` the counts are summed over the 16 trigger-maintained
+    ``Platform_Stats`` slot rows, which stays O(1) as the tables grow.
+    """
+    if from_summary:
+        cursor.execute("""
+            SELECT CAST(SUM(total_students) AS SIGNED) AS total_students,
+                   CAST(SUM(total_faculty) AS SIGNED) AS total_faculty,
+                   CAST(SUM(total_projects) AS SIGNED) AS total_projects,
+                   CAST(SUM(pending_applications) AS SIGNED) AS pending_applications
+            FROM Platform_Stats
+        """)
+    else:
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM Students) AS total_students,
+                   (SELECT COUNT(*) FROM Faculty) AS total_faculty,
+                   (SELECT COUNT(*) FROM Research_Projects) AS total_projects,
+                   (SELECT COUNT(*) FROM Applications WHERE status = 'Pending') AS pending_applications
+        """)
+    return cursor.fetchone()
+
+
+def _grouped_counts(cursor, table, key, ids):
+    query = f"SELECT {key}, COUNT(*) AS count FROM {table}"
+    params = ()
+    if ids is not None:
+        if not ids:
+            return {}
+        query += f" WHERE {key} IN ({', '.join(['%s'] * len(ids))})"
+        params = tuple(ids)
+    cursor.execute(query + f" GROUP BY {key}", params)
+    return {row[key]: row["count"] for row in cursor.fetchall()}
+
+
+def get_faculty_project_counts(cursor, faculty_ids=None):
+    """``{faculty_id: project count}`` for the given faculty (or everyone)."""
+    return _grouped_counts(cursor, "Research_Projects", "faculty_id", faculty_ids)
+
+
+def get_student_application_counts(cursor, student_ids=None):
+    """``{student_id: application count}`` for the given students (or everyone)."""
+    return _grouped_counts(cursor, "Applications", "student_id", student_ids)
+
+
+# Junction tables that hold a skill set, keyed by their owner column
+SKILL_SET_TABLES = {"Student_Skills": "student_id", "Project_Skills": "project_id"}
+
+
+def get_project_skill_ids(cursor, project_ids):
+    """``{project_id: [skill_id, ...]}`` for the given projects, in one query."""
+    if not project_ids:
+        return {}
+    cursor.execute(f"""
+        SELECT project_id, skill_id FROM Project_Skills
+        WHERE project_id IN ({', '.join(['%s'] * len(project_ids))})
+    """, tuple(project_ids))
+    grouped = {}
+    for row in cursor.fetchall():
+        grouped.setdefault(row["project_id"], []).append(row["skill_id"])
+    return grouped
+
+
+def sync_skill_set(conn, table, owner_id, skill_ids):
+    """Make ``owner_id``'s rows in ``table`` equal ``skill_ids``, applying only the diff.
+
+    The owner's current rows are locked, removals go out as one DELETE and
+    additions as one multi-row INSERT, all in a single transaction, so
+    concurrent readers see either the old or the new skill set, never an
+    empty one. Returns ``(added, removed)`` skill id sets.
+    """
+    owner_col = SKILL_SET_TABLES[table]
+    wanted = set(skill_ids)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT skill_id FROM {table} WHERE {owner_col} = %s FOR UPDATE", (owner_id,))
+        current = {row[0] for row in cursor.fetchall()}
+        added, removed = wanted - current, current - wanted
+
+        if removed:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE {owner_col} = %s AND skill_id IN ({', '.join(['%s'] * len(removed))})",
+                (owner_id, *removed),
+            )
+        if added:
+            cursor.execute(
+                f"INSERT INTO {table} ({owner_col}, skill_id) VALUES {', '.join(['(%s, %s)'] * len(added))}",
+                [value for skill_id in added for value in (owner_id, skill_id)],
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return added, removed
@@ -0,0 +1,230 @@
+"""Ranked search over recruiting projects.
+
+The primary backend is MySQL FULLTEXT (``ft_projects_title``,
+``ft_projects_title_description`` and ``ft_faculty_research_areas`` in
+``Database.sql``): one query ranks, filters and pages the results. Titles
+count double.
+
+An in-process BM25 inverted index is the fallback. With
+``SEARCH_BACKEND=auto`` it answers when the FULLTEXT query fails (e.g. the
+indexes are missing) or when every search term is shorter than InnoDB's
+default 3-character ``innodb_ft_min_token_size`` ("AI", "ML", ...).
+``SEARCH_BACKEND=memory`` or ``fulltext`` forces one backend.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+from mysql.connector import Error
+
+from config import PAGE_SIZE, SEARCH_BACKEND, SEARCH_INDEX_TTL
+from db import get_read_connection
+from repository import PROJECT_COUNTS, PROJECT_STATS_JOIN, Page, get_projects_for_student_by_ids
+
+FULLTEXT_MIN_TOKEN = 3
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("a an and are as at be by for from in is it of on or that the to with".split())
+
+
+def tokenize(text):
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def fulltext_search(cursor, student_id, query, offset=0, limit=PAGE_SIZE):
+    """One page of recruiting projects ranked by FULLTEXT relevance.
+
+    Rows are annotated with the student's application state like the
+    browse grid. Paging uses OFFSET: relevance is a float recomputed per
+    query, so it is not a stable seek key, and search depth is shallow.
+    """
+    cursor.execute(f"""
+        SELECT p.project_id, p.title, LEFT(p.description, 160) AS description, p.max_students,
+               f.first_name, f.last_name, f.department,
+               a.application_id, a.status AS application_status, {PROJECT_COUNTS},
+               2 * MATCH(p.title) AGAINST (%s IN NATURAL LANGUAGE MODE)
+                 + MATCH(p.title, p.description) AGAINST (%s IN NATURAL LANGUAGE MODE)
+                 + MATCH(f.research_areas) AGAINST (%s IN NATURAL LANGUAGE MODE) AS relevance
+        FROM Research_Projects p
+        JOIN Faculty f ON p.faculty_id = f.faculty_id
+        LEFT JOIN Applications a ON a.project_id = p.project_id AND a.student_id = %s
+        {PROJECT_STATS_JOIN}
+        WHERE p.status = 'Recruiting'
+          AND (MATCH(p.title, p.description) AGAINST (%s IN NATURAL LANGUAGE MODE)
+               OR MATCH(f.research_areas) AGAINST (%s IN NATURAL LANGUAGE MODE))
+        ORDER BY relevance DESC, p.project_id DESC
+        LIMIT %s OFFSET %s
+    """, (query, query, query, student_id, query, query, limit + 1, offset))
+    rows = cursor.fetchall()
+    return Page(rows[:limit], offset + limit if len(rows) > limit else None)
+
+
+_INDEX_SQL = """
+    SELECT p.project_id, p.title, p.description, f.research_areas
+    FROM Research_Projects p
+    JOIN Faculty f ON p.faculty_id = f.faculty_id
+    WHERE p.status = 'Recruiting'
+"""
+_INDEX_COLUMNS = ("project_id", "title", "description", "research_areas")
+
+
+def _index_rows(cursor):
+    # Rows as tuples from either a plain or a dictionary cursor
+    for row in cursor.fetchall():
+        yield tuple(row[c] for c in _INDEX_COLUMNS) if isinstance(row, dict) else row
+
+
+class InvertedIndex:
+    """BM25 index over recruiting projects' title (x2), description and faculty research areas."""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.postings = {}   # token -> {project_id: weighted term frequency}
+        self.doc_len = {}    # project_id -> weighted token count
+        self.doc_terms = {}  # project_id -> tokens, for cheap removal
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def load(cls, cursor):
+        """Build from the database using a plain or dictionary cursor."""
+        index = cls()
+        cursor.execute(_INDEX_SQL)
+        for project_id, title, description, research_areas in _index_rows(cursor):
+            index.upsert(project_id, title, description, research_areas)
+        return index
+
+    def age(self):
+        return time.monotonic() - self.loaded_at
+
+    def upsert(self, project_id, title, description, research_areas):
+        terms = Counter(tokenize(title))
+        for token in terms:
+            terms[token] *= 2
+        terms.update(tokenize(description))
+        terms.update(tokenize(research_areas))
+        with self._lock:
+            self._remove(project_id)
+            for token, tf in terms.items():
+                self.postings.setdefault(token, {})[project_id] = tf
+            self.doc_len[project_id] = sum(terms.values())
+            self.doc_terms[project_id] = list(terms)
+
+    def remove(self, project_id):
+        with self._lock:
+            self._remove(project_id)
+
+    def _remove(self, project_id):
+        self.doc_len.pop(project_id, None)
+        for token in self.doc_terms.pop(project_id, ()):
+            docs = self.postings[token]
+            del docs[project_id]
+            if not docs:
+                del self.postings[token]
+
+    def search(self, query, offset=0, limit=PAGE_SIZE):
+        """``(project_ids, has_more)`` for one page, best match first."""
+        with self._lock:
+            n_docs = len(self.doc_len)
+            if not n_docs:
+                return [], False
+            avg_len = sum(self.doc_len.values()) / n_docs
+            scores = Counter()
+            for token in set(tokenize(query)):
+                docs = self.postings.get(token)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for project_id, tf in docs.items():
+                    norm = tf + self.K1 * (1 - self.B + self.B * self.doc_len[project_id] / avg_len)
+                    scores[project_id] += idf * tf * (self.K1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        page = ranked[offset:offset + limit + 1]
+        return [project_id for project_id, _ in page[:limit]], len(page) > limit
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(cursor=None):
+    """Process-wide fallback index, (re)loaded when older than ``SEARCH_INDEX_TTL``.
+
+    A search passes its own ``cursor`` so the reload does not check a second
+    connection out of the pool it already holds one from. While one thread
+    reloads a stale index, the others keep searching the old copy instead of
+    queueing on the lock.
+    """
+    global _index
+    index = _index
+    if index is not None and index.age() <= SEARCH_INDEX_TTL:
+        return index
+    if not _index_lock.acquire(blocking=index is None):
+        return index
+    try:
+        if _index is None or _index.age() > SEARCH_INDEX_TTL:
+            if cursor is not None:
+                _index = InvertedIndex.load(cursor)
+            else:
+                conn = get_read_connection()
+                if conn is None:
+                    return _index
+                try:
+                    _index = InvertedIndex.load(conn.cursor())
+                finally:
+                    conn.close()
+        return _index
+    finally:
+        _index_lock.release()
+
+
+def forget_project(project_id):
+    """Drop a project that stopped recruiting from the fallback index, if it is loaded."""
+    if _index is not None:
+        _index.remove(project_id)
+
+
+def remember_project(project_id):
+    """(Re)index a project that started recruiting again, if the fallback index is loaded."""
+    if _index is None:
+        return
+    conn = get_read_connection()
+    if conn is None:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.execute(_INDEX_SQL + " AND p.project_id = %s", (project_id,))
+        rows = list(_index_rows(cursor))
+    finally:
+        conn.close()
+    if rows:
+        _index.upsert(*rows[0])
+    else:
+        _index.remove(project_id)
+
+
+def memory_search(cursor, student_id, query, offset=0, limit=PAGE_SIZE):
+    index = get_search_index(cursor)
+    if index is None:
+        return Page([], None)
+    project_ids, has_more = index.search(query, offset, limit)
+    rows = get_projects_for_student_by_ids(cursor, student_id, project_ids)
+    return Page(rows, offset + limit if has_more else None)
+
+
+def search_projects(cursor, student_id, query, offset=0, limit=PAGE_SIZE, backend=SEARCH_BACKEND):
+    """Ranked page of recruiting projects matching ``query``; see module docstring for backends."""
+    if backend == "memory":
+        return memory_search(cursor, student_id, query, offset, limit)
+    if backend == "auto" and all(len(t) < FULLTEXT_MIN_TOKEN for t in tokenize(query)):
+        return memory_search(cursor, student_id, query, offset, limit)
+    try:
+        return fulltext_search(cursor, student_id, query, offset, limit)
+    except Error as e:
+        if backend != "auto":
+            raise
+        print("⚠️ FULLTEXT search failed, using in-memory index:", e)
+        return memory_search(cursor, student_id, query, offset, limit)
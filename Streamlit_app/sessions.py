@@ -0,0 +1,271 @@
+"""Server-side login sessions, addressed by a signed token.
+
+A login creates a ``UserSession``, a slotted object holding the user's id,
+role and display name. It is saved in a session store under a random
+session id. The browser only gets ``<session id>.<HMAC signature>``, never
+in the URL, where it would end up in browser history, access logs and shared
+links. Pages resolve the token once per run with ``current()``.
+
+The token travels in the ``SESSION_COOKIE`` cookie. Streamlit session state
+lives and dies with one websocket, so a reload or reconnect (possibly to
+another app process) starts empty. Streamlit sends the cookies of the page
+request with every new connection, and ``st.context.cookies`` reads them.
+Streamlit cannot set response headers, so the cookie is written by a small
+script element (``sync_cookie``). That means it cannot be HttpOnly; it is
+SameSite=Strict, Secure over HTTPS, and lasts until the browser closes.
+Expiry is enforced by the store.
+
+Stores (``SESSION_STORE``):
+
+* ``memory``: an LRU dict in this process, bounded by ``SESSION_MAXSIZE``.
+  Fast, but other processes cannot see it.
+* ``sqlite``: a table in ``SESSION_DB_PATH`` that every process on the host
+  can share. It is a local stand-in for a shared store such as Redis, and
+  requires ``SESSION_SECRET`` so every process signs tokens with the same key.
+  Replicas on other hosts cannot see the file. They need a store on shared
+  storage, or a load balancer that keeps each browser on one host.
+
+Sessions expire ``SESSION_TTL`` seconds after their last use.
+"""
+import hashlib
+import hmac
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import SESSION_COOKIE, SESSION_DB_PATH, SESSION_MAXSIZE, SESSION_SECRET, SESSION_STORE, SESSION_TTL
+
+if SESSION_SECRET:
+    _secret = SESSION_SECRET.encode()
+elif SESSION_STORE == "memory":
+    # The memory store is private to this process, so a per-process key is enough
+    _secret = secrets.token_bytes(32)
+else:
+    raise RuntimeError(f"SESSION_SECRET must be set when SESSION_STORE is {SESSION_STORE!r}.")
+
+
+class UserSession:
+    """Who is signed in: all the pages need to authorize and greet them."""
+
+    __slots__ = ("user_id", "role", "name", "expires_at")
+
+    def __init__(self, user_id, role, name, expires_at):
+        self.user_id = user_id
+        self.role = role
+        self.name = name
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f"UserSession({self.user_id!r}, {self.role!r}, {self.name!r})"
+
+
+def _signature(session_id):
+    return hmac.new(_secret, session_id.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def sign(session_id):
+    return f"{session_id}.{_signature(session_id)}"
+
+
+def unsign(token):
+    """The session id inside ``token``, or None if it was not signed by us."""
+    session_id, _, signature = (token or "").partition(".")
+    if session_id and hmac.compare_digest(signature, _signature(session_id)):
+        return session_id
+    return None
+
+
+class MemoryStore:
+    """Sessions in an LRU dict; the least recently used are dropped beyond ``maxsize``."""
+
+    def __init__(self, maxsize=SESSION_MAXSIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._data.get(session_id)
+            if session is None:
+                return None
+            if session.expires_at <= time.time():
+                del self._data[session_id]
+                return None
+            self._data.move_to_end(session_id)
+            return session
+
+    def put(self, session_id, session):
+        with self._lock:
+            self._data[session_id] = session
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def size(self):
+        return len(self._data)
+
+
+class SQLiteStore:
+    """Sessions in a SQLite file shared by every app process on the host (WAL mode)."""
+
+    def __init__(self, path=SESSION_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                name TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn().execute("CREATE INDEX IF NOT EXISTS idx_sessions_expiry ON sessions (expires_at)")
+        self.purge_expired()
+
+    def _conn(self):
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id):
+        row = self._conn().execute(
+            "SELECT user_id, role, name, expires_at FROM sessions WHERE session_id = ? AND expires_at > ?",
+            (session_id, time.time()),
+        ).fetchone()
+        return UserSession(*row) if row else None
+
+    def put(self, session_id, session):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, user_id, role, name, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (session_id, session.user_id, session.role, session.name, session.expires_at),
+        )
+
+    def delete(self, session_id):
+        self._conn().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge_expired(self):
+        return self._conn().execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def size(self):
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide session store selected by ``SESSION_STORE``."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SQLiteStore() if SESSION_STORE == "sqlite" else MemoryStore()
+                if SESSION_STORE not in ("memory", "sqlite"):
+                    print(f"⚠️ Unknown SESSION_STORE {SESSION_STORE!r}; using memory.")
+    return _store
+
+
+def start(user_id, role, name, store=None):
+    """Create a session and return its signed token."""
+    session_id = secrets.token_urlsafe(16)
+    (store or get_store()).put(session_id, UserSession(user_id, role, name, time.time() + SESSION_TTL))
+    return sign(session_id)
+
+
+def resolve(token, store=None):
+    """The live ``UserSession`` for ``token``, or None.
+
+    Expiry slides: once a session is past half its TTL, using it stores a
+    renewed copy. So an active user stays signed in, and most requests are
+    a single read.
+    """
+    session_id = unsign(token)
+    if session_id is None:
+        return None
+    store = store or get_store()
+    session = store.get(session_id)
+    if session is not None and session.expires_at - time.time() < SESSION_TTL / 2:
+        session = UserSession(session.user_id, session.role, session.name, time.time() + SESSION_TTL)
+        store.put(session_id, session)
+    return session
+
+
+def end(token, store=None):
+    session_id = unsign(token)
+    if session_id is not None:
+        (store or get_store()).delete(session_id)
+
+
+def login(user_id, role, name):
+    """Sign the current Streamlit session in; the cookie is written by the next ``sync_cookie``."""
+    import streamlit as st
+
+    token = start(user_id, role, name)
+    st.session_state["session_token"] = token
+    st.session_state["pending_cookie"] = token
+
+
+def current():
+    """The signed-in ``UserSession`` for this browser tab, or None.
+
+    A new websocket (reload, reconnect, another replica) has no token in
+    session state and falls back to the cookie.
+    """
+    import streamlit as st
+
+    token = st.session_state.get("session_token")
+    if token is None and "pending_cookie" not in st.session_state:
+        token = st.context.cookies.get(SESSION_COOKIE)
+    session = resolve(token) if token else None
+    if session is None:
+        st.session_state.pop("session_token", None)
+    else:
+        st.session_state["session_token"] = token
+    return session
+
+
+def sync_cookie():
+    """Write or clear the session cookie after ``login``/``logout``.
+
+    Call it on a page that is being rendered, not one about to rerun or
+    switch page, because the script only runs once its element reaches the browser.
+    """
+    import streamlit as st
+
+    token = st.session_state.pop("pending_cookie", None)
+    if token is None:
+        return
+    cookie = f"{SESSION_COOKIE}={token}; Path=/; SameSite=Strict" + ("" if token else "; Max-Age=0")
+    script = f"""<script>
+        const doc = window.parent.document;
+        doc.cookie = {json.dumps(cookie)} + (window.parent.location.protocol === "https:" ? "; Secure" : "");
+    </script>"""
+    if hasattr(st, "iframe"):
+        st.iframe(script, height="content")
+    else:  # Streamlit before st.iframe
+        import streamlit.components.v1 as components
+
+        components.html(script, height=0)
+
+
+def logout():
+    """End the session; the next ``sync_cookie`` clears the cookie."""
+    import streamlit as st
+
+    end(st.session_state.get("session_token"))
+    st.session_state.clear()
+    st.session_state["pending_cookie"] = ""
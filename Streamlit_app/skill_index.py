@@ -0,0 +1,239 @@
+"""In-process bitset index over ``Student_Skills`` and ``Project_Skills``.
+
+Every student and project is a row of packed ``uint64`` words with one bit per
+skill (bit positions follow ``Skills.skill_id`` order). The overlap between a
+student and a project is ``popcount(student & project)``, so scoring one
+student against every project, or one project against every student, is a
+single vectorized NumPy expression with no database round-trip.
+
+The index is process-wide (see ``get_skill_index``), refreshed from the
+database every ``SKILL_INDEX_TTL`` seconds and patched in place when this
+process writes skills or project status.
+"""
+import threading
+import time
+
+import numpy as np
+
+from config import SKILL_INDEX_TTL
+from db import get_read_connection
+
+_POPCOUNT_8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words):
+    """Per-element popcount of a uint64 array."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(words)
+    per_byte = _POPCOUNT_8[np.ascontiguousarray(words).view(np.uint8)]
+    return per_byte.reshape(*words.shape, 8).sum(axis=-1, dtype=np.uint8)
+
+
+def _top_k(ids, scores, k):
+    """``[(id, score), ...]`` for the ``k`` highest non-zero scores, best first."""
+    if k <= 0 or len(scores) == 0:
+        return []
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(int(ids[i]), int(scores[i])) for i in candidates if scores[i] > 0]
+
+
+class _BitRows:
+    """Growable matrix of skill bitsets, one row per student or project."""
+
+    def __init__(self, words, capacity=0):
+        self.bits = np.zeros((capacity, words), dtype=np.uint64)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.active = np.ones(capacity, dtype=bool)
+        self.row_of = {}
+        self.size = 0
+
+    @classmethod
+    def from_pairs(cls, ids, positions, words):
+        """Bulk build from parallel arrays of entity ids and skill bit positions."""
+        unique_ids, rows = np.unique(ids, return_inverse=True)
+        matrix = cls(words, len(unique_ids))
+        np.bitwise_or.at(
+            matrix.bits,
+            (rows, positions // 64),
+            np.left_shift(np.uint64(1), (positions % 64).astype(np.uint64)),
+        )
+        matrix.ids[:] = unique_ids
+        matrix.size = len(unique_ids)
+        matrix.row_of = dict(zip(unique_ids.tolist(), range(matrix.size)))
+        return matrix
+
+    @property
+    def words(self):
+        return self.bits.shape[1]
+
+    def view(self):
+        return self.bits[:self.size]
+
+    def row(self, entity_id):
+        return self.row_of.get(entity_id)
+
+    def set(self, entity_id, positions):
+        row = self.row_of.get(entity_id)
+        if row is None:
+            if self.size == len(self.bits):
+                self._grow(max(16, 2 * len(self.bits)))
+            row = self.size
+            self.size += 1
+            self.row_of[entity_id] = row
+            self.ids[row] = entity_id
+            self.active[row] = True
+        self.bits[row] = 0
+        for pos in positions:
+            self.bits[row, pos // 64] |= np.uint64(1) << np.uint64(pos % 64)
+        return row
+
+    def widen(self, words):
+        if words > self.words:
+            self.bits = np.pad(self.bits, ((0, 0), (0, words - self.words)))
+
+    def _grow(self, capacity):
+        extra = capacity - len(self.bits)
+        self.bits = np.pad(self.bits, ((0, extra), (0, 0)))
+        self.ids = np.pad(self.ids, (0, extra))
+        self.active = np.pad(self.active, (0, extra), constant_values=True)
+
+
+class SkillIndex:
+    def __init__(self, skill_ids):
+        self._lock = threading.RLock()
+        self.skill_pos = {int(sid): pos for pos, sid in enumerate(skill_ids)}
+        words = max(1, -(-len(self.skill_pos) // 64))
+        self.students = _BitRows(words)
+        self.projects = _BitRows(words)
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def from_pairs(cls, skill_ids, student_pairs, project_pairs, active_project_ids=None):
+        """Build from ``(student_id, skill_id)`` / ``(project_id, skill_id)`` int arrays.
+
+        Only projects in ``active_project_ids`` (e.g. the recruiting ones) are
+        recommended; ``None`` treats every project as active.
+        """
+        index = cls(skill_ids)
+        words = index.students.words
+        lookup = np.full(max(index.skill_pos, default=0) + 1, -1, dtype=np.int64)
+        lookup[list(index.skill_pos)] = list(index.skill_pos.values())
+
+        def build(pairs):
+            pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+            in_range = pairs[:, 1] < len(lookup)
+            positions = np.where(in_range, lookup[np.where(in_range, pairs[:, 1], 0)], -1)
+            known = positions >= 0
+            return _BitRows.from_pairs(pairs[known, 0], positions[known], words)
+
+        index.students = build(student_pairs)
+        index.projects = build(project_pairs)
+        if active_project_ids is not None:
+            index.projects.active[:] = np.isin(index.projects.ids, np.asarray(list(active_project_ids)))
+        return index
+
+    @classmethod
+    def load(cls, cursor):
+        """Build from the database using a plain (tuple) cursor."""
+        cursor.execute("SELECT skill_id FROM Skills ORDER BY skill_id")
+        skill_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT student_id, skill_id FROM Student_Skills")
+        student_pairs = cursor.fetchall()
+        cursor.execute("SELECT project_id, skill_id FROM Project_Skills")
+        project_pairs = cursor.fetchall()
+        cursor.execute("SELECT project_id FROM Research_Projects WHERE status = 'Recruiting'")
+        recruiting = [row[0] for row in cursor.fetchall()]
+        return cls.from_pairs(skill_ids, student_pairs, project_pairs, recruiting)
+
+    def age(self):
+        return time.monotonic() - self.loaded_at
+
+    # --- Incremental updates ---
+
+    def _positions(self, skill_ids):
+        for sid in skill_ids:
+            if sid not in self.skill_pos:
+                self.skill_pos[sid] = len(self.skill_pos)
+        words = -(-len(self.skill_pos) // 64)
+        self.students.widen(words)
+        self.projects.widen(words)
+        return [self.skill_pos[sid] for sid in skill_ids]
+
+    def update_student(self, student_id, skill_ids):
+        """Replace a student's skill set (e.g. after "Update Skills")."""
+        with self._lock:
+            self.students.set(student_id, self._positions(skill_ids))
+
+    def update_project(self, project_id, skill_ids, active=True):
+        with self._lock:
+            row = self.projects.set(project_id, self._positions(skill_ids))
+            self.projects.active[row] = active
+
+    def set_project_active(self, project_id, active):
+        """Include/exclude a project from recommendations (status changes)."""
+        with self._lock:
+            row = self.projects.row(project_id)
+            if row is not None:
+                self.projects.active[row] = active
+
+    # --- Queries ---
+
+    def recommend_projects(self, student_id, k=10):
+        """``[(project_id, shared_skills), ...]`` for the best active projects."""
+        with self._lock:
+            row = self.students.row(student_id)
+            if row is None or self.projects.size == 0:
+                return []
+            scores = _popcount(self.projects.view() & self.students.bits[row]).sum(axis=1, dtype=np.int32)
+            scores[~self.projects.active[:self.projects.size]] = 0
+            return _top_k(self.projects.ids, scores, k)
+
+    def best_students(self, project_id, k=10):
+        """``[(student_id, shared_skills), ...]`` for the best-matching students."""
+        with self._lock:
+            row = self.projects.row(project_id)
+            if row is None or self.students.size == 0:
+                return []
+            scores = _popcount(self.students.view() & self.projects.bits[row]).sum(axis=1, dtype=np.int32)
+            return _top_k(self.students.ids, scores, k)
+
+    def iter_pair_scores(self, chunk=1024):
+        """Yield ``(student_ids, scores)`` blocks covering every student/project pair.
+
+        ``scores`` has shape ``(len(student_ids), n_projects)`` and columns
+        follow ``self.projects.ids``; chunking keeps memory bounded.
+        """
+        with self._lock:
+            students = self.students.view().copy()
+            student_ids = self.students.ids[:self.students.size].copy()
+            projects = self.projects.view().copy()
+        for start in range(0, len(students), chunk):
+            block = students[start:start + chunk, None, :] & projects[None, :, :]
+            yield student_ids[start:start + chunk], _popcount(block).sum(axis=2, dtype=np.int32)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index():
+    """Process-wide index, (re)loaded when older than ``SKILL_INDEX_TTL``.
+
+    Returns the previous (possibly stale) index, or ``None``, if the
+    database is unavailable.
+    """
+    global _index
+    with _index_lock:
+        if _index is None or _index.age() > SKILL_INDEX_TTL:
+            conn = get_read_connection()
+            if conn is None:
+                return _index
+            try:
+                _index = SkillIndex.load(conn.cursor())
+            finally:
+                conn.close()
+        return _index
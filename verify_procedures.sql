@@ -1,13 +1,20 @@
 -- 1) Show definitions for existing procedures and the new one
 SHOW CREATE PROCEDURE MatchStudentsToProject;
+SHOW CREATE PROCEDURE RankStudentsForProject;
+SHOW CREATE PROCEDURE RankStudentsForRecruitingProjects;
 SHOW CREATE PROCEDURE accept_application;
+SHOW CREATE PROCEDURE accept_applications;
+SHOW CREATE PROCEDURE accept_applications_in_tx;
+SHOW CREATE PROCEDURE review_applications;
 SHOW CREATE PROCEDURE withdraw_application;
 
 -- 2) Quick existence check
 SELECT ROUTINE_NAME, ROUTINE_TYPE
 FROM INFORMATION_SCHEMA.ROUTINES
 WHERE ROUTINE_SCHEMA = DATABASE()
-  AND ROUTINE_NAME IN ('MatchStudentsToProject','accept_application','withdraw_application');
+  AND ROUTINE_NAME IN ('MatchStudentsToProject','RankStudentsForProject','RankStudentsForRecruitingProjects',
+                       'accept_application','accept_applications','accept_applications_in_tx',
+                       'reset_review_results','review_applications','withdraw_application');
 
 -- ---------------------------------------------------
 -- SAFE TEST for withdraw_application (use transaction)
@@ -32,9 +39,7 @@ INSERT INTO Applications (status, cover_letter, student_id, project_id)
 VALUES ('Pending', 'Test withdraw', @stu, @proj);
 SET @app = LAST_INSERT_ID();
 
--- Optionally simulate acceptance then membership to see deletion behavior:
--- CALL accept_application(@app);
--- (if you test acceptance, accept_application will insert into Project_Members)
+-- accept_application commits its own transaction, so it is tested separately below
 
 -- Now CALL the new withdraw_application procedure
 CALL withdraw_application(@app);
@@ -52,3 +57,55 @@ SELECT * FROM Application_Logs WHERE application_id = @app;
 ROLLBACK;
 
 -- End of procedure verification additions.
+
+-- ---------------------------------------------------
+-- Matching: top-5 for one project, then top-3 for every recruiting project.
+-- Sample data: project 1 (Python, ML, Data Analysis) should rank Jane Doe first.
+-- ---------------------------------------------------
+CALL RankStudentsForProject(1, 5);
+CALL RankStudentsForRecruitingProjects(3);
+
+-- ---------------------------------------------------
+-- Capacity-aware acceptance. accept_applications commits its own transaction,
+-- so this test creates rows outright and deletes them at the end.
+-- Expected: accepted, accepted, full, not_found; project switched to 'In Progress'.
+-- ---------------------------------------------------
+SET @fac = (SELECT faculty_id FROM Faculty LIMIT 1);
+INSERT INTO Research_Projects (title, description, status, max_students, faculty_id, admin_id)
+VALUES ('TMP Capacity Project', 'Temporary project for capacity test', 'Recruiting', 2, @fac, NULL);
+SET @proj = LAST_INSERT_ID();
+
+INSERT INTO Students (first_name, last_name, email, password)
+VALUES ('TMP_CAP', 'One', 'tmp_cap1@example.com', 'tmp_pass'),
+       ('TMP_CAP', 'Two', 'tmp_cap2@example.com', 'tmp_pass'),
+       ('TMP_CAP', 'Three', 'tmp_cap3@example.com', 'tmp_pass');
+INSERT INTO Applications (status, student_id, project_id)
+SELECT 'Pending', student_id, @proj FROM Students WHERE first_name = 'TMP_CAP' ORDER BY student_id;
+SET @app1 = (SELECT MIN(application_id) FROM Applications WHERE project_id = @proj);
+SET @ids = (SELECT JSON_ARRAYAGG(application_id) FROM Applications WHERE project_id = @proj);
+
+CALL accept_applications(JSON_ARRAY_APPEND(@ids, '$', -1));
+
+SELECT status, (SELECT COUNT(*) FROM Project_Members WHERE project_id = @proj) AS members
+FROM Research_Projects WHERE project_id = @proj;
+
+-- Single-application form on an already accepted id: already_accepted
+CALL accept_application(@app1);
+
+-- Bulk review: the third applicant is rejected (logged by the trigger),
+-- an accepted one is not_pending and an unknown id is not_found
+SET @app3 = (SELECT MAX(application_id) FROM Applications WHERE project_id = @proj);
+CALL review_applications(@fac, JSON_ARRAY(), JSON_ARRAY(@app3, @app1, -1));
+SELECT application_id, old_status, new_status FROM Application_Logs WHERE application_id = @app3;
+
+-- Accepting the now Rejected application is refused as not_pending
+CALL accept_application(@app3);
+SELECT status FROM Applications WHERE application_id = @app3;
+
+-- Another faculty member's applications: not_found, with NULL project_id and counts
+CALL review_applications(-1, JSON_ARRAY(@app1), JSON_ARRAY(@app3));
+
+-- Cleanup (cascades to Applications and Project_Members; Application_Logs has no FK)
+DELETE FROM Application_Logs WHERE project_id = @proj;
+DELETE FROM Students WHERE first_name = 'TMP_CAP';
+DELETE FROM Research_Projects WHERE project_id = @proj;
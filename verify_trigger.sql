@@ -1,9 +1,7 @@
 -- 1) List triggers to confirm they exist
-SHOW TRIGGERS LIKE 'trg_award_on_complete';
 SHOW TRIGGERS LIKE 'trg_log_application_status_change';
 
 -- 2) View trigger creation statements
-SHOW CREATE TRIGGER trg_award_on_complete\G
 SHOW CREATE TRIGGER trg_log_application_status_change\G
 
 -- 3) Find or create an application to test the logging trigger.
@@ -39,24 +37,96 @@ ROLLBACK;
 
 -- End of trigger verification additions.
 
--- 4) Test trigger INSIDE a transaction so you can rollback after verification.
--- Replace <PROJECT_ID> with the id from step 3 (or set the variable below).
-
+-- 4) Achievements are awarded by the award_achievements job (jobs.py), not by a trigger.
+-- Completing a project inside a transaction adds no achievement rows by itself:
 SET @proj_id = <PROJECT_ID>;
 
--- See current achievement rows for the project (before)
+START TRANSACTION;
+UPDATE Research_Projects SET status = 'Completed' WHERE project_id = @proj_id;
 SELECT * FROM Student_Achievements WHERE project_id = @proj_id;
+ROLLBACK;
 
+-- Accepted students of completed projects still waiting for their achievement
+-- (what `python -m jobs --once --dry-run` counts; expect none after a job run):
+SELECT a.project_id, a.student_id
+FROM Research_Projects p
+JOIN Applications a ON a.project_id = p.project_id AND a.status = 'Accepted'
+LEFT JOIN Student_Achievements sa ON sa.student_id = a.student_id AND sa.project_id = p.project_id
+WHERE p.status = 'Completed' AND sa.id IS NULL;
+
+-- 5) Platform_Stats (summed over its slot rows) must match the live counts (all diff columns should be 0).
+SELECT SUM(ps.total_students) - (SELECT COUNT(*) FROM Students) AS students_diff,
+       SUM(ps.total_faculty) - (SELECT COUNT(*) FROM Faculty) AS faculty_diff,
+       SUM(ps.total_projects) - (SELECT COUNT(*) FROM Research_Projects) AS projects_diff,
+       SUM(ps.pending_applications) - (SELECT COUNT(*) FROM Applications WHERE status = 'Pending') AS pending_diff
+FROM Platform_Stats ps;
+
+-- If any diff is non-zero (e.g. after a manual bulk load with triggers disabled):
+-- CALL refresh_platform_stats();
+
+-- 6) Application_Logs partitions: one per month up to LOG_PARTITIONS_AHEAD ahead, plus pmax.
+SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+FROM INFORMATION_SCHEMA.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Application_Logs'
+ORDER BY PARTITION_ORDINAL_POSITION;
+
+-- A date-bounded history query should list only the matching month(s) under "partitions"
+-- and use idx_logs_student as a covering index ("Using index").
+EXPLAIN SELECT id, application_id, project_id, old_status, new_status, changed_at
+FROM Application_Logs
+WHERE student_id = 1 AND changed_at >= DATE_FORMAT(CURDATE(), '%Y-%m-01')
+ORDER BY changed_at DESC, id DESC LIMIT 21;
+
+-- Safe to re-run; adds any missing future months.
+-- CALL ensure_log_partitions(3);
+
+-- 7) Project_Stats must match live recounts: this returns no rows when in sync.
+CALL verify_project_stats();
+
+-- Exercise the triggers inside a transaction, then roll back.
 START TRANSACTION;
+SET @proj = (SELECT project_id FROM Research_Projects LIMIT 1);
+SET @stu = (SELECT student_id FROM Students
+            WHERE student_id NOT IN (SELECT student_id FROM Applications WHERE project_id = @proj) LIMIT 1);
+SELECT * FROM Project_Stats WHERE project_id = @proj;
 
--- Update project to trigger the action
-UPDATE Research_Projects
-SET status = 'Completed'
-WHERE project_id = @proj_id;
+INSERT INTO Applications (status, student_id, project_id) VALUES ('Pending', @stu, @proj);
+SET @app = LAST_INSERT_ID();
+UPDATE Applications SET status = 'Accepted' WHERE application_id = @app;
+INSERT INTO Project_Members (project_id, student_id) VALUES (@proj, @stu);
+-- applicant_count, accepted_count and member_count each up by one; pending unchanged
+SELECT * FROM Project_Stats WHERE project_id = @proj;
+CALL verify_project_stats();
+ROLLBACK;
 
--- Immediately check Student_Achievements (trigger runs within this transaction)
-SELECT * FROM Student_Achievements WHERE project_id = @proj_id;
+-- If verify_project_stats() reports drift (e.g. after a bulk load with triggers disabled):
+-- CALL refresh_project_stats();
+
+-- 8) Accounts must cover every Students/Faculty/Admin email: this returns no rows when in sync.
+CALL verify_accounts();
+
+-- Login is one primary-key lookup on Accounts plus one on the owning table ("const" rows).
+EXPLAIN SELECT a.role, a.user_id, COALESCE(s.password, f.password, ad.password) AS password
+FROM Accounts a
+LEFT JOIN Students s ON a.role = 'student' AND s.student_id = a.user_id
+LEFT JOIN Faculty f ON a.role = 'faculty' AND f.faculty_id = a.user_id
+LEFT JOIN Admin ad ON a.role = 'admin' AND ad.admin_id = a.user_id
+WHERE a.email = 'jane.doe@univ.edu';
+
+-- An email registered under one role cannot sign up under another.
+START TRANSACTION;
+-- Expect ERROR 1062 (Duplicate entry ... for key 'Accounts.PRIMARY')
+INSERT INTO Faculty (first_name, last_name, email, password) VALUES ('Jane', 'Doe', 'jane.doe@univ.edu', 'x');
+ROLLBACK;
+
+-- If verify_accounts() reports rows (e.g. after a bulk load with triggers disabled):
+-- CALL refresh_accounts();
+
+-- 9) Lifecycle jobs: recent runs per job, newest first (dry runs are not recorded).
+SELECT job, started_at, seconds, rows_changed, chunks, error
+FROM Job_Runs ORDER BY started_at DESC LIMIT 20;
 
--- If satisfied with results, COMMIT; otherwise ROLLBACK to undo.
--- ROLLBACK;
--- COMMIT;
+-- Recruiting projects already at capacity (the close_full_projects job moves them to In Progress):
+SELECT p.project_id, p.max_students, ps.member_count
+FROM Research_Projects p JOIN Project_Stats ps ON ps.project_id = p.project_id
+WHERE p.status = 'Recruiting' AND ps.member_count >= p.max_students;